@@ -0,0 +1,418 @@
+"""
+--------------------
+Description
+--------------------
+-> batch (script): Command-line entry point that profiles every CSV, Parquet, Feather or Arrow IPC file of a directory with app.report.build_report(), several files at a time.
+Each file is profiled in its own worker process, which is killed when it runs longer than the timeout and can't allocate more than the memory cap.
+Finished files are appended to a JSONL progress file, so an interrupted batch only profiles the remaining (or modified) files when run again.
+All reports are then gathered in one consolidated JSON report.
+
+--------------------
+Usage
+--------------------
+python -m app.batch extracts/ --output batch_report.json --processes 4 --timeout 600 --max-memory-mb 4096
+python -m app.batch extracts/ --output batch_report.json --sample 1000000 --retry-failed
+
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:
+    # Memory caps are not available on Windows
+    resource = None
+
+# Set Python path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.report import build_report
+from tab_df.formats import COLUMNAR_EXTENSIONS
+
+# Worker processes currently running, killed if the batch is interrupted
+running_workers = set()
+running_workers_lock = threading.Lock()
+
+# Extensions of the files profiled in a directory
+SUPPORTED_EXTENSIONS = (".csv",) + tuple(COLUMNAR_EXTENSIONS)
+
+
+def find_files(directory, recursive=False):
+    """
+    --------------------
+    Description
+    --------------------
+    -> find_files (function): Function that lists the CSV, Parquet, Feather and Arrow IPC files of a directory, sorted by path
+
+    --------------------
+    Parameters
+    --------------------
+    -> directory (str): Path to the directory
+    -> recursive (bool): Flag stating if sub-directories are searched as well
+
+    --------------------
+    Returns
+    --------------------
+    -> (list): Paths of the files as strings
+
+    """
+    paths = Path(directory).rglob("*") if recursive else Path(directory).iterdir()
+    return sorted(str(path) for path in paths if path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS)
+
+
+def get_file_version(file_path):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_file_version (function): Function that identifies the version of a file from its size and modification time, so that modified files are profiled again
+
+    --------------------
+    Parameters
+    --------------------
+    -> file_path (str): Path to the file
+
+    --------------------
+    Returns
+    --------------------
+    -> (list): Size in bytes and modification time in nanoseconds of the file
+
+    """
+    stat = os.stat(file_path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def load_progress(progress_path):
+    """
+    --------------------
+    Description
+    --------------------
+    -> load_progress (function): Function that reads the JSONL progress file of a batch, the last record of each file taking precedence.
+    A truncated last line (batch killed while writing it) is ignored.
+
+    --------------------
+    Parameters
+    --------------------
+    -> progress_path (str): Path to the progress file
+
+    --------------------
+    Returns
+    --------------------
+    -> (dict): Last record of each file keyed by file path (empty if the progress file doesn't exist)
+
+    """
+    records = {}
+    if os.path.exists(progress_path):
+        with open(progress_path) as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                records[record["file"]] = record
+    return records
+
+
+def profile_worker(file_path, results, options, max_memory_mb):
+    """
+    --------------------
+    Description
+    --------------------
+    -> profile_worker (function): Function run in the worker process of a file, which caps its address space to max_memory_mb, builds the report of the file and sends it (or the error raised) through the results queue
+
+    --------------------
+    Parameters
+    --------------------
+    -> file_path (str): Path to the file
+    -> results (multiprocessing.Queue): Queue receiving a tuple with the status ("ok" or "error") and the report or error message
+    -> options (dict): Keyword arguments of app.report.build_report()
+    -> max_memory_mb (int): Maximum address space of the worker process in MB (None for no limit)
+
+    --------------------
+    Returns
+    --------------------
+    -> None
+
+    """
+    # Keep the progress messages of the profiling classes out of the batch output
+    sys.stdout = open(os.devnull, "w")
+    # Lead a new process group so that the processes parsing big CSV files in parallel are killed with the worker
+    if hasattr(os, "setsid"):
+        os.setsid()
+    if max_memory_mb and resource is not None:
+        limit = int(max_memory_mb) * 1024 ** 2
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    try:
+        results.put(("ok", build_report(file_path, **options)))
+    except MemoryError:
+        results.put(("error", f"Memory cap of {max_memory_mb} MB exceeded"))
+    except Exception:
+        results.put(("error", traceback.format_exc(limit=-3)))
+
+
+def stop_worker(process):
+    """
+    --------------------
+    Description
+    --------------------
+    -> stop_worker (function): Function that kills a worker process together with the processes it started, if it is still running
+
+    --------------------
+    Parameters
+    --------------------
+    -> process (multiprocessing.Process): Worker process started by run_file()
+
+    --------------------
+    Returns
+    --------------------
+    -> None
+
+    """
+    if not process.is_alive():
+        return
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, OSError):
+        # Windows, or the worker hasn't led its process group yet
+        process.kill()
+
+
+def run_file(file_path, options, timeout=None, max_memory_mb=None, context=None, poll_interval=0.5):
+    """
+    --------------------
+    Description
+    --------------------
+    -> run_file (function): Function that profiles a file in a new worker process and waits for its result.
+    The worker is killed if it hasn't finished after timeout seconds, and a worker that dies without sending a result (e.g. killed by the system) is reported as failed.
+    The worker isn't daemonic so that it can parse big CSV files with several processes (see --workers), it is killed explicitly when the batch is interrupted.
+
+    --------------------
+    Parameters
+    --------------------
+    -> file_path (str): Path to the file
+    -> options (dict): Keyword arguments of app.report.build_report()
+    -> timeout (float): Maximum duration of the profiling in seconds (default set to None for no limit)
+    -> max_memory_mb (int): Maximum address space of the worker process in MB (default set to None for no limit)
+    -> context (multiprocessing.context.BaseContext): Multiprocessing context used to start the worker (default set to the platform default)
+    -> poll_interval (float): Delay in seconds between two checks of the worker
+
+    --------------------
+    Returns
+    --------------------
+    -> (dict): Progress record with the file, its version, the status ("ok", "error" or "timeout"), the elapsed time and the report or error message
+
+    """
+    context = context or mp.get_context()
+    results = context.Queue()
+    record = {"file": file_path, "version": get_file_version(file_path)}
+    start = time.perf_counter()
+    process = context.Process(target=profile_worker, args=(file_path, results, options, max_memory_mb))
+    with running_workers_lock:
+        process.start()
+        running_workers.add(process)
+
+    try:
+        # The result is read before joining the worker, otherwise a big report would block it while being written to the queue
+        while True:
+            try:
+                status, result = results.get(timeout=poll_interval)
+                break
+            except queue.Empty:
+                if not process.is_alive():
+                    try:
+                        status, result = results.get(timeout=poll_interval)
+                    except queue.Empty:
+                        status, result = "error", f"Worker process exited with code {process.exitcode}"
+                    break
+                if timeout is not None and time.perf_counter() - start > timeout:
+                    stop_worker(process)
+                    status, result = "timeout", f"Timed out after {timeout} seconds"
+                    break
+    finally:
+        stop_worker(process)
+        process.join()
+        results.close()
+        with running_workers_lock:
+            running_workers.discard(process)
+    record["status"] = status
+    record["elapsed"] = round(time.perf_counter() - start, 3)
+    record["report" if status == "ok" else "error"] = result
+    return record
+
+
+def run_batch(file_paths, progress_path, options, n_processes=None, timeout=None, max_memory_mb=None, retry_failed=False, start_method=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> run_batch (function): Function that profiles a list of files with at most n_processes worker processes running at the same time and appends the record of each finished file to the progress file.
+    Files already profiled with the same version are skipped, as well as files that failed or timed out unless retry_failed is set.
+    A new process is started for each file (instead of reusing the workers of a pool) so that a timed out file can be killed without affecting the others and memory is given back after each file.
+
+    --------------------
+    Parameters
+    --------------------
+    -> file_paths (list): Paths to the files
+    -> progress_path (str): Path to the JSONL progress file
+    -> options (dict): Keyword arguments of app.report.build_report()
+    -> n_processes (int): Maximum number of worker processes running at the same time (default set to the number of CPU cores)
+    -> timeout (float): Maximum duration of the profiling of a file in seconds (default set to None for no limit)
+    -> max_memory_mb (int): Maximum address space of each worker process in MB (default set to None for no limit)
+    -> retry_failed (bool): Flag stating if files that failed or timed out in a previous run are profiled again
+    -> start_method (str): Start method of the worker processes ("fork", "spawn" or "forkserver", default set to None for the platform default)
+
+    --------------------
+    Returns
+    --------------------
+    -> (dict): Last record of each file keyed by file path
+
+    """
+    records = load_progress(progress_path)
+    pending = []
+    for file_path in file_paths:
+        record = records.get(file_path)
+        done = record is not None and record["version"] == get_file_version(file_path) and (record["status"] == "ok" or not retry_failed)
+        if not done:
+            pending.append(file_path)
+    print(f"{len(file_paths) - len(pending)} files already profiled, {len(pending)} files to profile.")
+
+    context = mp.get_context(start_method)
+    n_processes = n_processes or os.cpu_count() or 1
+    # Each thread only starts and waits for one worker process at a time
+    with ThreadPoolExecutor(max_workers=n_processes) as executor, open(progress_path, "a") as progress:
+        futures = [executor.submit(run_file, file_path, options, timeout, max_memory_mb, context) for file_path in pending]
+        try:
+            # Records are written as soon as each file is finished so that an interruption only loses the running files
+            for future in as_completed(futures):
+                record = future.result()
+                progress.write(json.dumps(record) + "\n")
+                progress.flush()
+                records[record["file"]] = record
+                print(f"[{record['status']}] {record['file']} ({record['elapsed']:.1f}s)")
+        except BaseException:
+            # Kill the running workers on interruption, the batch would otherwise wait for them before exiting
+            for future in futures:
+                future.cancel()
+            with running_workers_lock:
+                for process in list(running_workers):
+                    stop_worker(process)
+            raise
+    return records
+
+
+def consolidate(records, file_paths):
+    """
+    --------------------
+    Description
+    --------------------
+    -> consolidate (function): Function that gathers the records of a batch into one report with the report of each profiled file and the error of each failed file
+
+    --------------------
+    Parameters
+    --------------------
+    -> records (dict): Last record of each file keyed by file path
+    -> file_paths (list): Paths to the files of the batch
+
+    --------------------
+    Returns
+    --------------------
+    -> (dict): Consolidated report with the number of files per status, the reports and the failures
+
+    """
+    batch_records = [records[file_path] for file_path in file_paths if file_path in records]
+    statuses = [record["status"] for record in batch_records]
+    return {
+        "n_files": len(file_paths),
+        "n_ok": statuses.count("ok"),
+        "n_error": statuses.count("error"),
+        "n_timeout": statuses.count("timeout"),
+        "reports": {record["file"]: record["report"] for record in batch_records if record["status"] == "ok"},
+        "failures": {record["file"]: {"status": record["status"], "error": record["error"]} for record in batch_records if record["status"] != "ok"},
+    }
+
+
+def parse_args(argv=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> parse_args (function): Function that parses the command-line arguments
+
+    --------------------
+    Parameters
+    --------------------
+    -> argv (list): Command-line arguments (default set to None to use sys.argv)
+
+    --------------------
+    Returns
+    --------------------
+    -> (argparse.Namespace): Parsed arguments
+
+    """
+    parser = argparse.ArgumentParser(description="Profile every file of a directory and write one consolidated JSON report.")
+    parser.add_argument("directory", help="Directory containing CSV, Parquet, Feather or Arrow IPC files")
+    parser.add_argument("--output", "-o", required=True, help="Path of the consolidated JSON report")
+    parser.add_argument("--progress", default=None, help="Path of the JSONL progress file (default: <output>.progress.jsonl)")
+    parser.add_argument("--recursive", action="store_true", help="Search the sub-directories as well")
+    parser.add_argument("--processes", type=int, default=None, help="Maximum number of files profiled at the same time (default: all CPU cores)")
+    parser.add_argument("--timeout", type=float, default=None, help="Maximum duration of the profiling of a file in seconds")
+    parser.add_argument("--max-memory-mb", type=int, default=None, help="Maximum address space of each worker process in MB")
+    parser.add_argument("--retry-failed", action="store_true", help="Profile again the files that failed or timed out in a previous run")
+    parser.add_argument("--start-method", choices=["fork", "spawn", "forkserver"], default=None, help="Start method of the worker processes")
+    parser.add_argument("--workers", type=int, default=1, help="Number of CPU cores used to parse each big CSV file")
+    parser.add_argument("--sample", type=int, default=None, help="Maximum number of rows used to compute the column statistics (default: all rows)")
+    parser.add_argument("--chunksize", type=int, default=None, help="Read CSV files chunk by chunk and profile the columns with sketches")
+    parser.add_argument("--top", type=int, default=20, help="Number of most frequent values kept per column")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> main (function): Function that profiles the files of the directory provided on the command line and writes the consolidated report
+
+    --------------------
+    Parameters
+    --------------------
+    -> argv (list): Command-line arguments (default set to None to use sys.argv)
+
+    --------------------
+    Returns
+    --------------------
+    -> (int): Exit code (1 if any file failed or timed out)
+
+    """
+    args = parse_args(argv)
+    if not Path(args.directory).is_dir():
+        print(f"Directory not found: {args.directory}", file=sys.stderr)
+        return 1
+
+    file_paths = find_files(args.directory, recursive=args.recursive)
+    options = {"n_workers": args.workers, "sample_rows": args.sample, "chunksize": args.chunksize, "top": args.top}
+    progress_path = args.progress or f"{args.output}.progress.jsonl"
+    records = run_batch(
+        file_paths, progress_path, options, n_processes=args.processes, timeout=args.timeout,
+        max_memory_mb=args.max_memory_mb, retry_failed=args.retry_failed, start_method=args.start_method
+    )
+
+    report = consolidate(records, file_paths)
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"{report['n_ok']} files profiled, {report['n_error']} failed, {report['n_timeout']} timed out. Report written to {args.output}")
+    return 0 if report["n_ok"] == report["n_files"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+--------------------
+Description
+--------------------
+-> cli (script): Command-line entry point that profiles every column of a local CSV, Parquet, Feather or Arrow IPC file with the classes used by the Streamlit app and writes the results as a JSON report (see app.report.build_report()).
+
+--------------------
+Usage
+--------------------
+python -m app.cli data.csv --output report.json --workers 4 --sample 1000000
+python -m app.cli data.csv --chunksize 500000 > report.json
+
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Set Python path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.report import build_report
+
+
+def parse_args(argv=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> parse_args (function): Function that parses the command-line arguments
+
+    --------------------
+    Parameters
+    --------------------
+    -> argv (list): Command-line arguments (default set to None to use sys.argv)
+
+    --------------------
+    Returns
+    --------------------
+    -> (argparse.Namespace): Parsed arguments
+
+    """
+    parser = argparse.ArgumentParser(description="Profile every column of a local file and write a JSON report.")
+    parser.add_argument("file_path", help="Path to a CSV, Parquet, Feather or Arrow IPC file")
+    parser.add_argument("--output", "-o", default=None, help="Path of the JSON report (default: standard output)")
+    parser.add_argument("--workers", type=int, default=None, help="Number of CPU cores used to parse big CSV files (default: all CPU cores)")
+    parser.add_argument("--sample", type=int, default=None, help="Maximum number of rows used to compute the column statistics (default: all rows)")
+    parser.add_argument("--chunksize", type=int, default=None, help="Read the CSV file chunk by chunk and profile the columns with sketches (default: load the whole file)")
+    parser.add_argument("--top", type=int, default=20, help="Number of most frequent values kept per column")
+    parser.add_argument("--indent", type=int, default=2, help="Indentation of the JSON report")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> main (function): Function that builds the report of the file provided on the command line and writes it as JSON.
+    Progress messages are printed to standard error so that the report can be written to standard output.
+
+    --------------------
+    Parameters
+    --------------------
+    -> argv (list): Command-line arguments (default set to None to use sys.argv)
+
+    --------------------
+    Returns
+    --------------------
+    -> (int): Exit code
+
+    """
+    args = parse_args(argv)
+    if not Path(args.file_path).is_file():
+        print(f"File not found: {args.file_path}", file=sys.stderr)
+        return 1
+
+    stdout = sys.stdout
+    sys.stdout = sys.stderr
+    try:
+        report = build_report(args.file_path, n_workers=args.workers, sample_rows=args.sample, chunksize=args.chunksize, top=args.top)
+    except ValueError as error:
+        print(error)
+        return 1
+    finally:
+        sys.stdout = stdout
+
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=args.indent)
+        sys.stdout.write("\n")
+    else:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=args.indent)
+        print(f"Report written to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
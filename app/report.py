@@ -0,0 +1,211 @@
+import math
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from common.cache import ParseCache
+from tab_df.logics import Dataset
+from tab_num.logics import NumericColumn
+from tab_text.logics import TextColumn
+from tab_date.logics import DateColumn
+from common.schema import get_schema
+
+# Attributes of each column class written to the report
+NUMERIC_ATTRIBUTES = ["n_unique", "approx_unique", "n_missing", "n_zeros", "n_negatives", "col_mean", "col_std", "col_min", "col_max", "col_median", "percentiles", "approx_quantiles"]
+TEXT_ATTRIBUTES = ["n_unique", "approx_unique", "n_missing", "n_empty", "n_mode", "n_space", "n_lower", "n_upper", "n_alpha", "n_digit"]
+DATE_ATTRIBUTES = ["n_unique", "approx_unique", "n_missing", "col_min", "col_max", "n_weekend", "n_weekday", "n_future", "n_empty_1900", "n_empty_1970"]
+
+
+def to_json_value(value):
+    """
+    --------------------
+    Description
+    --------------------
+    -> to_json_value (function): Function that converts a value computed by the profiling classes (NumPy scalars, timestamps, dataframes, dictionaries, ...) into a value that can be written as JSON.
+    Missing and non-finite numbers are converted to None.
+
+    --------------------
+    Parameters
+    --------------------
+    -> value (object): Value to be converted
+
+    --------------------
+    Returns
+    --------------------
+    -> (object): JSON serializable value
+
+    """
+    if isinstance(value, pd.DataFrame):
+        return [to_json_value(record) for record in value.to_dict(orient="records")]
+    if isinstance(value, dict):
+        return {str(key): to_json_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray, pd.Series)):
+        return [to_json_value(item) for item in value]
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return float(value) if math.isfinite(value) else None
+    if value is None or value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, (pd.Timestamp, datetime.date, np.datetime64)):
+        return pd.Timestamp(value).isoformat()
+    if isinstance(value, str):
+        return value
+    return str(value)
+
+
+def get_attributes(column, attributes):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_attributes (function): Function that collects the computed attributes of a column class together with its most frequent values
+
+    --------------------
+    Parameters
+    --------------------
+    -> column (NumericColumn, TextColumn or DateColumn): Column class on which set_data() has been called
+    -> attributes (list): Names of the attributes to be collected
+
+    --------------------
+    Returns
+    --------------------
+    -> (dict): JSON serializable statistics of the column
+
+    """
+    stats = {attr: to_json_value(getattr(column, attr)) for attr in attributes}
+    stats["frequent"] = to_json_value(column.frequent)
+    return stats
+
+
+def profile_chunked(dataset, top=20):
+    """
+    --------------------
+    Description
+    --------------------
+    -> profile_chunked (function): Function that builds the statistics of each column from the sketches fed by Dataset.set_data_chunked(), for files that are not loaded in memory
+
+    --------------------
+    Parameters
+    --------------------
+    -> dataset (Dataset): Dataset on which set_data_chunked() has been called
+    -> top (int): Number of most frequent values kept per column
+
+    --------------------
+    Returns
+    --------------------
+    -> (dict): JSON serializable statistics keyed by column name
+
+    """
+    columns = {}
+    for col in dataset.cols_list:
+        sketches = dataset.column_sketches[col]
+        stats = {
+            "n_unique": int(round(sketches["distinct"].count())),
+            "approx_unique": True,
+            "frequent": to_json_value(dataset.get_frequent(col, end=top)),
+        }
+        quantiles = dataset.get_quantiles(col)
+        if quantiles is not None:
+            stats["quantiles"] = to_json_value({f"p{round(quantile * 100)}": value for quantile, value in quantiles.items()})
+        columns[col] = stats
+    return columns
+
+
+def build_report(file_path, n_workers=None, sample_rows=None, chunksize=None, top=20, random_state=0, cache=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> build_report (function): Function that profiles every column of a local file with the classes used by the Streamlit app, without Streamlit, and returns the results as a JSON serializable dictionary.
+    The dataset-level information is always computed on the whole file. When sample_rows is set, the column statistics are computed on a random sample of rows.
+    When chunksize is set, the CSV file is read chunk by chunk with Dataset.set_data_chunked() and the column statistics come from its sketches instead.
+
+    --------------------
+    Parameters
+    --------------------
+    -> file_path (str): Path to a local CSV, Parquet, Feather or Arrow IPC file
+    -> n_workers (int): Number of CPU cores used to parse big CSV files (default set to None to use all CPU cores)
+    -> sample_rows (int): Maximum number of rows used to compute the column statistics (default set to None to use all rows)
+    -> chunksize (int): Number of rows read at a time (default set to None to load the whole file)
+    -> top (int): Number of most frequent values kept per column
+    -> random_state (int): Seed of the random sample of rows
+    -> cache (common.cache.ParseCache): Cache holding the parsed dataframe and dataset information (default set to None to use a new cache freed with the report).
+    The results computed for the columns are always stored with the dataframe in common.cache.parse_cache (see common.frequency.get_column_result()) and freed with it.
+
+    --------------------
+    Returns
+    --------------------
+    -> (dict): Report with the dataset information, the schema and the statistics of the numeric, text and datetime columns
+
+    """
+    dataset = Dataset(file_path, cache=cache or ParseCache(), n_workers=n_workers)
+    try:
+        if chunksize is not None:
+            dataset.set_data_chunked(chunksize=chunksize)
+        else:
+            dataset.set_df()
+            dataset.set_data()
+    finally:
+        # The statistics below only use the loaded dataframe or the sketches
+        dataset.close_file()
+    if dataset.df is None and not dataset.chunked:
+        raise ValueError(f"Unsupported or empty file: {file_path}")
+
+    report = {
+        "file": str(file_path),
+        "dataset": {
+            "n_rows": dataset.n_rows,
+            "n_cols": dataset.n_cols,
+            "n_duplicates": dataset.n_duplicates,
+            "n_missing": dataset.n_missing,
+            "n_num_cols": dataset.n_num_cols,
+            "n_text_cols": dataset.n_text_cols,
+            "columns": to_json_value(dataset.table),
+        },
+        "sampled_rows": None,
+        "chunked": dataset.chunked,
+    }
+    if dataset.chunked:
+        report["columns"] = profile_chunked(dataset, top=top)
+        return to_json_value(report)
+
+    # Compute the column statistics on a random sample of rows
+    df = dataset.df
+    if sample_rows is not None and len(df) > sample_rows:
+        df = df.sample(sample_rows, random_state=random_state)
+        report["sampled_rows"] = sample_rows
+
+    num_column = NumericColumn(df=df)
+    num_column.find_num_cols()
+    num_column.set_all_stats(end=top)
+    report["numeric"] = {}
+    for col in num_column.cols_list:
+        num_column.set_data(col, charts=False)
+        report["numeric"][col] = get_attributes(num_column, NUMERIC_ATTRIBUTES)
+        print(f"Numeric column profiled: {col}")
+
+    text_column = TextColumn(df=df)
+    text_column.find_text_cols()
+    report["text"] = {}
+    for col in text_column.cols_list:
+        text_column.set_data(col, charts=False)
+        text_column.set_frequent(end=top)
+        report["text"][col] = get_attributes(text_column, TEXT_ATTRIBUTES)
+        print(f"Text column profiled: {col}")
+
+    date_column = DateColumn(df=df)
+    date_column.find_date_cols()
+    report["datetime"] = {}
+    for col in date_column.cols_list:
+        date_column.set_data(col, charts=False)
+        date_column.set_frequent(end=top)
+        report["datetime"][col] = get_attributes(date_column, DATE_ATTRIBUTES)
+        print(f"Datetime column profiled: {col}")
+
+    # Kind, confidence and parse statistics of each column, as classified once for all tabs
+    report["schema"] = get_schema(df).columns
+    return to_json_value(report)
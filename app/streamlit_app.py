@@ -11,10 +11,7 @@ parent_dir = str(Path(current_dir).resolve().parents[0])
 sys.path.append(parent_dir)
 
 # Import custom functions
-from tab_df.display import display_tab_df_content
-from tab_num.display import display_tab_num_content
-from tab_text.display import display_tab_text_content
-from tab_date.display import display_tab_date_content
+from common.cache import parse_cache
 
 # Set Streamlit Page Configuration
 st.set_page_config(
@@ -24,32 +21,53 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
-# Set objects in Streamlit session state
-st.session_state["file_path"] = None
-st.session_state["df"] = None
-st.session_state["dataset"] = None
-st.session_state["selected_num_col"] = None
-st.session_state["num_column"] = None
-st.session_state["selected_text_col"] = None
-st.session_state["text_column"] = None
-st.session_state["selected_date_col"] = None
-st.session_state["date_column"] = None
+# Set objects in Streamlit session state, computed profiles are kept between reruns
+for key in ["file_path", "dataset", "selected_num_col", "num_column", "selected_text_col", "text_column", "selected_date_col", "date_column"]:
+    if key not in st.session_state:
+        st.session_state[key] = None
+
+# Sections of the app, only the active one is computed and displayed at each rerun
+TAB_NAMES = ["DataFrame", "Numeric Serie", "Text Serie", "Datetime Serie"]
 
 # Display Title
 st.title("CSV Explorer")
 
 # Add Window to upload CSV file
 with st.expander("ℹ️ - Streamlit application for performing data exploration on a CSV", expanded=True):
-    st.session_state.file_path = st.file_uploader("Choose a CSV file")
+    st.session_state.file_path = st.file_uploader("Choose a CSV, Parquet, Feather or Arrow IPC file")
+    # Checkbox to reduce memory usage by compacting data types after loading
+    compact = st.checkbox(label="Compact data types to reduce memory usage", value=False)
 
-# If a CSV file is uploaded, display the different tabs
+# If a file is uploaded, display the active tab only (st.tabs would compute all of them at every rerun)
 if st.session_state.file_path is not None:
-    tab_df, tab_num, tab_text, tab_date = st.tabs(["DataFrame", "Numeric Serie", "Text Serie", "Datetime Serie"])
-    with tab_df:
-        display_tab_df_content(file_path=st.session_state.file_path)
-    with tab_num:
-        display_tab_num_content(df=st.session_state.dataset.df)
-    with tab_text:
-        display_tab_text_content(df=st.session_state.dataset.df)
-    with tab_date:
-        display_tab_date_content(df=st.session_state.dataset.df)
\ No newline at end of file
+    # Tab modules are imported once a file is uploaded, so that the upload page renders without waiting for them
+    from tab_df.display import load_dataset, schedule_tab_df_content, display_tab_df_content
+    from tab_num.display import schedule_tab_num_content, display_tab_num_content
+    from tab_text.display import schedule_tab_text_content, display_tab_text_content
+    from tab_date.display import schedule_tab_date_content, display_tab_date_content
+
+    dataset = load_dataset(file_path=st.session_state.file_path, compact=compact)
+
+    # Compute the profiles of all tabs at the same time on worker threads, the displayed tab waits for its own profile only
+    if dataset.df is not None:
+        schedule_tab_df_content(dataset)
+        schedule_tab_num_content(df=dataset.df)
+        schedule_tab_text_content(df=dataset.df)
+        schedule_tab_date_content(df=dataset.df)
+
+    active_tab = st.radio(label="Section", options=TAB_NAMES, horizontal=True, label_visibility="collapsed")
+    if active_tab == "DataFrame":
+        display_tab_df_content(dataset=dataset)
+    elif active_tab == "Numeric Serie":
+        display_tab_num_content(df=dataset.df)
+    elif active_tab == "Text Serie":
+        display_tab_text_content(df=dataset.df)
+    elif active_tab == "Datetime Serie":
+        display_tab_date_content(df=dataset.df)
+
+# Display the usage of the cache shared by all sessions of the server
+with st.sidebar:
+    cache_stats = parse_cache.get_stats()
+    st.caption("Shared Cache")
+    st.write(f"{cache_stats['n_bytes'] / 1024 ** 2:,.1f} MB used of {cache_stats['max_bytes'] / 1024 ** 2:,.0f} MB, {cache_stats['n_entries']} files cached")
+    st.write(f"{cache_stats['hits']} hits, {cache_stats['misses']} misses (hit ratio {cache_stats['hit_ratio']:.0%})")
@@ -0,0 +1,147 @@
+"""
+--------------------
+Description
+--------------------
+-> bench_import_time (script): Benchmark of the import time of the Streamlit app at startup, measured with python -X importtime in fresh interpreters.
+The modules imported at the top level of app/streamlit_app.py are imported (the script itself isn't run as it needs a Streamlit server), the heaviest packages are listed
+and the script fails if a module that is expected to be imported lazily (dateparser by default) is imported at startup or if the import time exceeds --max-ms.
+
+--------------------
+Usage
+--------------------
+python benchmarks/bench_import_time.py --repeat 5
+python benchmarks/bench_import_time.py --modules tab_text.display tab_date.display --max-ms 2000
+
+"""
+import argparse
+import ast
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+APP_PATH = ROOT_DIR / "app" / "streamlit_app.py"
+
+
+def get_startup_imports(script_path):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_startup_imports (function): Function that lists the modules imported at the top level of a script, imports nested in blocks or functions being lazy
+
+    --------------------
+    Parameters
+    --------------------
+    -> script_path (Path): Path to the script
+
+    --------------------
+    Returns
+    --------------------
+    -> (list): Names of the imported modules, in order
+
+    """
+    tree = ast.parse(Path(script_path).read_text())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            modules.append(node.module)
+    return modules
+
+
+def parse_importtime(output):
+    """
+    --------------------
+    Description
+    --------------------
+    -> parse_importtime (function): Function that parses the output of python -X importtime
+
+    --------------------
+    Parameters
+    --------------------
+    -> output (str): Standard error of the interpreter
+
+    --------------------
+    Returns
+    --------------------
+    -> (list): Tuples with the self time (us), cumulative time (us), nesting depth and name of each imported module
+
+    """
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        records.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return records
+
+
+def measure_imports(modules):
+    """
+    --------------------
+    Description
+    --------------------
+    -> measure_imports (function): Function that imports a list of modules in a fresh interpreter started with -X importtime from the root of the repository
+
+    --------------------
+    Parameters
+    --------------------
+    -> modules (list): Names of the modules to be imported
+
+    --------------------
+    Returns
+    --------------------
+    -> (list): Records of parse_importtime()
+
+    """
+    code = "; ".join(["import sys", f"sys.path.insert(0, {str(ROOT_DIR)!r})"] + [f"import {module}" for module in modules])
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Number of fresh interpreters, the run with the median total is reported")
+    parser.add_argument("--modules", nargs="*", default=[], help="Modules imported in addition to the startup imports of the app")
+    parser.add_argument("--top", type=int, default=10, help="Number of heaviest top-level packages listed")
+    parser.add_argument("--forbid", nargs="*", default=["dateparser"], help="Modules that must not be imported at startup")
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if the total import time (median) is above this value")
+    args = parser.parse_args()
+
+    modules = get_startup_imports(APP_PATH) + args.modules
+    print(f"Modules imported at startup: {', '.join(modules)}")
+
+    runs = []
+    for _ in range(args.repeat):
+        records = measure_imports(modules)
+        total_ms = sum(cumulative for _, cumulative, depth, _ in records if depth == 0) / 1000
+        runs.append((total_ms, records))
+    runs.sort(key=lambda run: run[0])
+    total_ms, records = runs[len(runs) // 2]
+    print(f"Total import time: median {total_ms:.1f} ms, min {runs[0][0]:.1f} ms, max {runs[-1][0]:.1f} ms over {args.repeat} runs")
+
+    # Heaviest packages imported directly by the startup modules
+    print(f"\n{'cumulative (ms)':>16} {'self (ms)':>10}  package")
+    top_level = sorted((record for record in records if record[2] == 0), key=lambda record: -record[1])[:args.top]
+    for self_us, cumulative_us, _, name in top_level:
+        print(f"{cumulative_us / 1000:16.1f} {self_us / 1000:10.1f}  {name}")
+
+    failed = False
+    imported = {name for _, _, _, name in records}
+    forbidden = [module for module in args.forbid if module in imported]
+    if forbidden:
+        print(f"\nFAILED: modules expected to be imported lazily are imported at startup: {', '.join(forbidden)}")
+        failed = True
+    if args.max_ms is not None and total_ms > args.max_ms:
+        print(f"\nFAILED: total import time {total_ms:.1f} ms is above {args.max_ms:.1f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+--------------------
+Description
+--------------------
+-> bench_numeric_stats (script): Micro-benchmark comparing the chain of tab_num.logics.NumericColumn.set_* methods with the fused tab_num.logics.NumericColumn.set_stats() kernel.
+
+--------------------
+Usage
+--------------------
+python benchmarks/bench_numeric_stats.py --rows 10000000 --repeat 3
+
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Set Python path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tab_num.logics import NumericColumn
+
+# Methods called by NumericColumn.set_data() before the fused kernel
+METHOD_CHAIN = [
+    "set_unique", "set_missing", "set_zeros", "set_negatives", "set_mean",
+    "set_std", "set_min", "set_max", "set_median", "set_frequent",
+]
+
+
+def make_series(n_rows, seed=0):
+    """
+    --------------------
+    Description
+    --------------------
+    -> make_series (function): Function that generates numeric series with different distributions
+
+    --------------------
+    Parameters
+    --------------------
+    -> n_rows (int): Number of rows of each serie
+    -> seed (int): Seed of the random generator
+
+    --------------------
+    Returns
+    --------------------
+    -> (dict): Generated series keyed by name
+
+    """
+    rng = np.random.default_rng(seed)
+    return {
+        "continuous float": pd.Series(rng.normal(0, 1, n_rows)),
+        "low cardinality int": pd.Series(rng.integers(-5, 100, n_rows)),
+        "float with 10% missing": pd.Series(np.where(rng.random(n_rows) < 0.1, np.nan, rng.integers(0, 1000, n_rows) / 4)),
+    }
+
+
+def best_time(function, repeat):
+    """
+    --------------------
+    Description
+    --------------------
+    -> best_time (function): Function that runs the provided function several times and returns its best wall time
+
+    --------------------
+    Parameters
+    --------------------
+    -> function (callable): Function to be timed
+    -> repeat (int): Number of runs
+
+    --------------------
+    Returns
+    --------------------
+    -> (float): Best wall time in seconds
+
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the numeric statistics method chain vs the fused kernel")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'serie':<24} {'method chain (s)':>17} {'fused kernel (s)':>17} {'speedup':>8}")
+    for name, serie in make_series(args.rows).items():
+        column = NumericColumn()
+        column.serie = serie
+
+        chain_time = best_time(lambda: [getattr(column, method)() for method in METHOD_CHAIN], args.repeat)
+        fused_time = best_time(column.set_stats, args.repeat)
+        print(f"{name:<24} {chain_time:>17.3f} {fused_time:>17.3f} {chain_time / fused_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
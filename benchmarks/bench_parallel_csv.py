@@ -0,0 +1,104 @@
+"""
+--------------------
+Description
+--------------------
+-> bench_parallel_csv (script): Benchmark comparing the single-threaded pd.read_csv path of tab_df.logics.Dataset.set_df() with tab_df.parallel.read_csv_parallel() on synthetic CSV files.
+The script fails if both paths don't give the same dataframe.
+
+--------------------
+Usage
+--------------------
+python benchmarks/bench_parallel_csv.py --rows 1000000 10000000 50000000 --workers 8
+
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Set Python path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tab_df.parallel import read_csv_parallel
+
+
+def make_csv(n_rows, seed=0):
+    """
+    --------------------
+    Description
+    --------------------
+    -> make_csv (function): Function that generates the content of a CSV file with numeric, text and quoted multi-line columns
+
+    --------------------
+    Parameters
+    --------------------
+    -> n_rows (int): Number of rows to be generated
+    -> seed (int): Seed of the random generator
+
+    --------------------
+    Returns
+    --------------------
+    -> (bytes): Content of the CSV file
+
+    """
+    rng = np.random.default_rng(seed)
+    buffer = io.BytesIO()
+    # Generate the file by blocks to keep memory usage reasonable for big sizes
+    block = 1_000_000
+    for start in range(0, n_rows, block):
+        size = min(block, n_rows - start)
+        df = pd.DataFrame({
+            "id": np.arange(start, start + size),
+            "amount": rng.normal(100, 20, size).round(2),
+            "category": rng.choice(["alpha", "beta", "gamma", "delta"], size),
+            "comment": rng.choice(["ok", "needs, review", "line\nbreak", 'said "hi"'], size),
+        })
+        df.to_csv(buffer, index=False, header=(start == 0))
+    return buffer.getvalue()
+
+
+def time_it(function):
+    """
+    --------------------
+    Description
+    --------------------
+    -> time_it (function): Function that runs the provided function and measures its wall time
+
+    --------------------
+    Parameters
+    --------------------
+    -> function (callable): Function to be timed
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Wall time in seconds and result of the function
+
+    """
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark single-threaded vs parallel CSV parsing")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000, 50_000_000])
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'size (MB)':>10} {'read_csv (s)':>13} {'parallel (s)':>13} {'speedup':>8}")
+    for n_rows in args.rows:
+        data = make_csv(n_rows)
+        single_time, single_df = time_it(lambda: pd.read_csv(io.BytesIO(data), sep=","))
+        parallel_time, parallel_df = time_it(lambda: read_csv_parallel(io.BytesIO(data), sep=",", n_workers=args.workers))
+        pd.testing.assert_frame_equal(parallel_df, single_df)
+        print(f"{n_rows:>12} {len(data) / 1024 ** 2:>10.1f} {single_time:>13.2f} {parallel_time:>13.2f} {single_time / parallel_time:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
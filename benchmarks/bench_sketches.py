@@ -0,0 +1,120 @@
+"""
+--------------------
+Description
+--------------------
+-> bench_sketches (script): Accuracy check of the distinct count sketch (common.sketches.HyperLogLog) against exact counts, on in-memory columns and on columns read chunk by chunk
+by tab_df.logics.Dataset.set_data_chunked(), where a numeric column is read as int in the chunks without missing values and as float in the others.
+The script fails if a relative error is above --max-error.
+
+--------------------
+Usage
+--------------------
+python benchmarks/bench_sketches.py --rows 1000000 --max-error 0.05
+
+"""
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Set Python path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from common.cache import ParseCache
+from common.sketches import HyperLogLog
+from tab_df.logics import Dataset
+
+
+def make_series(n_rows, seed=0):
+    """
+    --------------------
+    Description
+    --------------------
+    -> make_series (function): Function that generates columns with different numbers of distinct values
+
+    --------------------
+    Parameters
+    --------------------
+    -> n_rows (int): Number of rows to be generated
+    -> seed (int): Seed of the random generator
+
+    --------------------
+    Returns
+    --------------------
+    -> (dict): Series keyed by name
+
+    """
+    rng = np.random.default_rng(seed)
+    return {
+        "int, 50 distinct": pd.Series(rng.integers(0, 50, n_rows)),
+        "int, n_rows / 10 distinct": pd.Series(rng.integers(0, max(n_rows // 10, 1), n_rows)),
+        "float, all distinct": pd.Series(rng.random(n_rows)),
+        "text, 1000 distinct": pd.Series(rng.integers(0, 1000, n_rows)).map("value_{}".format),
+    }
+
+
+def make_chunked_csv(n_rows, chunksize, n_distinct=50):
+    """
+    --------------------
+    Description
+    --------------------
+    -> make_chunked_csv (function): Function that generates a CSV file with a column of n_distinct integers and a single missing value in the last chunk, so that this column is read as int in all chunks but the last one
+
+    --------------------
+    Parameters
+    --------------------
+    -> n_rows (int): Number of rows to be generated
+    -> chunksize (int): Number of rows read at a time by Dataset.set_data_chunked()
+    -> n_distinct (int): Number of distinct values of the column
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Content of the CSV file and exact number of distinct values
+
+    """
+    values = pd.Series(np.arange(n_rows) % n_distinct, dtype="float64")
+    values.iloc[-chunksize // 2] = np.nan
+    df = pd.DataFrame({"code": values.astype("Int64")})
+    return df.to_csv(index=False).encode(), n_distinct
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the accuracy of the distinct count sketch")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--max-error", type=float, default=0.05, help="Fail if a relative error is above this value")
+    args = parser.parse_args()
+
+    errors = {}
+    for name, serie in make_series(args.rows).items():
+        sketch = HyperLogLog()
+        sketch.update(serie)
+        errors[name] = (serie.nunique(), sketch.count())
+
+    # Column read as int in some chunks and as float in the others
+    data, n_distinct = make_chunked_csv(args.rows, args.chunksize)
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = Path(directory) / "chunked.csv"
+        file_path.write_bytes(data)
+        dataset = Dataset(file_path, cache=ParseCache())
+        dataset.set_data_chunked(chunksize=args.chunksize)
+        dataset.close_file()
+    errors["chunked int/float, 50 distinct"] = (n_distinct, dataset.column_sketches["code"]["distinct"].count())
+
+    failed = False
+    print(f"{'column':<32} {'exact':>10} {'estimate':>12} {'error':>8}")
+    for name, (exact, estimate) in errors.items():
+        error = abs(estimate - exact) / exact
+        failed = failed or error > args.max_error
+        print(f"{name:<32} {exact:>10} {estimate:>12.1f} {error:>7.2%}")
+    if failed:
+        print(f"\nFAILED: relative error above {args.max_error:.0%}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
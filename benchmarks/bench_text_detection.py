@@ -0,0 +1,112 @@
+"""
+--------------------
+Description
+--------------------
+-> bench_text_detection (script): Benchmark comparing the full dateparser scan previously run by tab_text.logics.TextColumn.find_text_cols() with the sample-based early-exit detection on wide text-heavy dataframes.
+
+--------------------
+Usage
+--------------------
+python benchmarks/bench_text_detection.py --rows 2000 --text-cols 16 --date-cols 4
+
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Set Python path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tab_date.parsing import safe_parse
+from tab_text.logics import TextColumn
+
+
+def make_df(n_rows, n_text_cols, n_date_cols, seed=0):
+    """
+    --------------------
+    Description
+    --------------------
+    -> make_df (function): Function that generates a dataframe with text columns and date-like text columns
+
+    --------------------
+    Parameters
+    --------------------
+    -> n_rows (int): Number of rows to be generated
+    -> n_text_cols (int): Number of text columns to be generated
+    -> n_date_cols (int): Number of date-like text columns to be generated
+    -> seed (int): Seed of the random generator
+
+    --------------------
+    Returns
+    --------------------
+    -> (pd.DataFrame): Generated dataframe
+
+    """
+    rng = np.random.default_rng(seed)
+    words = np.array(["apple", "banana", "cherry", "delta", "echo", "fox", "golf", "hotel", "india", "juliet"])
+    dates = pd.date_range("2015-01-01", periods=3000, freq="D").strftime("%d/%m/%Y").to_numpy()
+    data = {}
+    for i in range(n_text_cols):
+        data[f"text_{i}"] = pd.Series(rng.choice(words, n_rows)) + "_" + pd.Series(rng.integers(0, 1000, n_rows)).astype(str)
+    for i in range(n_date_cols):
+        data[f"date_{i}"] = rng.choice(dates, n_rows)
+    return pd.DataFrame(data)
+
+
+def find_text_cols_full(df):
+    """
+    --------------------
+    Description
+    --------------------
+    -> find_text_cols_full (function): Function reproducing the previous detection that parses every value of every text column
+
+    --------------------
+    Parameters
+    --------------------
+    -> df (pd.DataFrame): Dataframe to be scanned
+
+    --------------------
+    Returns
+    --------------------
+    -> (list): Text columns that are not date-like
+
+    """
+    cols = []
+    for col in df.select_dtypes(include=['object', 'string']).columns:
+        if df[col].apply(safe_parse).notna().mean() < 0.8:
+            cols.append(col)
+    return cols
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full vs sampled date detection of text columns")
+    parser.add_argument("--rows", type=int, default=2_000)
+    parser.add_argument("--text-cols", type=int, default=16)
+    parser.add_argument("--date-cols", type=int, default=4)
+    parser.add_argument("--skip-full", action="store_true", help="Only time the sampled detection")
+    args = parser.parse_args()
+
+    df = make_df(args.rows, args.text_cols, args.date_cols)
+    print(f"Dataframe: {args.rows} rows, {args.text_cols} text columns, {args.date_cols} date columns")
+
+    start = time.perf_counter()
+    text_column = TextColumn(df=df)
+    text_column.find_text_cols()
+    sampled_time = time.perf_counter() - start
+    print(f"Sampled detection: {sampled_time:.2f}s")
+
+    if not args.skip_full:
+        start = time.perf_counter()
+        full_cols = find_text_cols_full(df)
+        full_time = time.perf_counter() - start
+        print(f"Full detection:    {full_time:.2f}s")
+        print(f"Speedup:           {full_time / sampled_time:.1f}x")
+        print(f"Same columns:      {full_cols == text_column.cols_list}")
+
+
+if __name__ == "__main__":
+    main()
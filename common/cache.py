@@ -0,0 +1,459 @@
+import os
+import sys
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Default memory budget of the parse cache (in megabytes), can be overridden with an environment variable
+DEFAULT_CACHE_MB = int(os.environ.get("CSV_EXPLORER_CACHE_MB", 2048))
+
+
+def hash_content(file, block_size=8 * 1024 ** 2):
+    """
+    --------------------
+    Description
+    --------------------
+    -> hash_content (function): Function that computes the content hash of a binary file-like object by reading it block by block, so that the whole file never needs to be held in memory.
+    The file pointer is restored to its initial position afterwards.
+
+    --------------------
+    Parameters
+    --------------------
+    -> file (file-like): Binary file-like object to be hashed
+    -> block_size (int): Number of bytes read at a time
+
+    --------------------
+    Returns
+    --------------------
+    -> (str): Hexadecimal digest of the content
+
+    """
+    hasher = hashlib.blake2b(digest_size=20)
+    position = file.tell()
+    file.seek(0)
+    for block in iter(lambda: file.read(block_size), b""):
+        hasher.update(block)
+    file.seek(position)
+    return hasher.hexdigest()
+
+
+def make_key(content_hash, dialect):
+    """
+    --------------------
+    Description
+    --------------------
+    -> make_key (function): Function that builds the cache key of a parsed file from its content hash and the dialect detected by csv.Sniffer
+
+    --------------------
+    Parameters
+    --------------------
+    -> content_hash (str): Content hash of the uploaded file
+    -> dialect (tuple): Parsing options detected for the file (delimiter, quote character, ...)
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Key to be used with ParseCache
+
+    """
+    return (content_hash, tuple(dialect))
+
+
+def get_memory_usage(value):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_memory_usage (function): Function that estimates the memory usage of a value stored in the cache (dataframes, series, arrays, containers and objects such as common.frequency.FrequencyIndex or the sketches, through their attributes)
+
+    --------------------
+    Parameters
+    --------------------
+    -> value (object): Value to be measured
+
+    --------------------
+    Returns
+    --------------------
+    -> (int): Estimated memory usage in bytes
+
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sum(get_memory_usage(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(get_memory_usage(item) for item in value)
+    if hasattr(value, "__dict__"):
+        return sum(get_memory_usage(item) for item in vars(value).values())
+    return sys.getsizeof(value)
+
+
+def make_read_only(df):
+    """
+    --------------------
+    Description
+    --------------------
+    -> make_read_only (function): Function that marks the NumPy arrays holding the data of a dataframe as read-only, so that a dataframe shared between sessions can't be modified in place by one of them (it raises ValueError instead).
+    Operations returning new dataframes or series are not affected.
+
+    --------------------
+    Parameters
+    --------------------
+    -> df (pd.DataFrame): Dataframe to be protected
+
+    --------------------
+    Returns
+    --------------------
+    -> (pd.DataFrame): Same dataframe
+
+    """
+    for block in df._mgr.blocks:
+        if isinstance(block.values, np.ndarray):
+            block.values.flags.writeable = False
+    return df
+
+
+class ParseCache:
+    """
+    --------------------
+    Description
+    --------------------
+    -> ParseCache (class): Class that keeps parsed dataframes and their computed information in memory so that Streamlit reruns on an unchanged file only cost a dictionary lookup.
+    Entries are evicted in least recently used order once the memory budget is exceeded.
+    The cache is shared by all sessions and threads of the process: its methods are protected by a lock, cached dataframes are made read-only and the results computed for their columns (see get_result()) are stored with them,
+    so that several users exploring the same file share a single copy of the dataframe and of its column results, all counted in the same memory budget.
+    Results of dataframes that aren't held by an entry (files bigger than the budget, samples, ...) are kept as long as the dataframe is alive but aren't counted, as evicting entries wouldn't free them.
+
+    --------------------
+    Attributes
+    --------------------
+    -> max_bytes (int): Memory budget of the cache in bytes
+    -> entries (OrderedDict): Cached entries ordered from least to most recently used
+    -> sizes (dict): Memory usage in bytes of each cached entry
+    -> n_bytes (int): Total memory usage in bytes of the cached entries and of the results of their dataframes (default set to 0)
+    -> file_hashes (dict): Content hashes already computed for uploaded files, keyed by upload id, name and size
+    -> results (dict): Results computed for the columns of each dataframe, keyed by id of the dataframe and then by name of the result (default set to empty dict)
+    -> result_sizes (dict): Memory usage in bytes of the results of each dataframe (default set to empty dict)
+    -> df_keys (dict): Key of the entry holding each cached dataframe, keyed by id of the dataframe (default set to empty dict)
+    -> compute_locks (dict): Lock of each result being computed by get_result(), keyed by id of the dataframe and name of the result (default set to empty dict)
+    -> hits (int): Number of lookups of entries and column results found in the cache (default set to 0)
+    -> misses (int): Number of lookups of entries and column results not found in the cache (default set to 0)
+    -> lock (threading.RLock): Lock protecting the attributes, reentrant so that a garbage collected dataframe can drop its results while the lock is held
+
+    """
+    def __init__(self, max_bytes=DEFAULT_CACHE_MB * 1024 ** 2):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.sizes = {}
+        self.n_bytes = 0
+        self.file_hashes = {}
+        self.results = {}
+        self.result_sizes = {}
+        self.df_keys = {}
+        self.compute_locks = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.RLock()
+
+    def get_file_hash(self, file):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_file_hash (method): Class method that returns the content hash of an uploaded file.
+        The hash is only computed once per upload (identified by its id, name and size) so that reruns don't hash the whole file again.
+
+        --------------------
+        Parameters
+        --------------------
+        -> file (UploadedFile): Uploaded file (or any binary file-like object)
+
+        --------------------
+        Returns
+        --------------------
+        -> (str): Content hash of the file
+
+        """
+        upload_id = getattr(file, "id", None)
+        file_key = (upload_id, getattr(file, "name", None), getattr(file, "size", None))
+        with self.lock:
+            if upload_id is not None and file_key in self.file_hashes:
+                return self.file_hashes[file_key]
+
+        # Hash the file without holding the lock
+        content_hash = hash_content(file)
+        if upload_id is not None:
+            with self.lock:
+                self.file_hashes[file_key] = content_hash
+        return content_hash
+
+    def get(self, key):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get (method): Class method that returns the cached entry for the provided key and marks it as most recently used
+
+        --------------------
+        Parameters
+        --------------------
+        -> key (tuple): Cache key built with make_key()
+
+        --------------------
+        Returns
+        --------------------
+        -> (dict): Cached entry or None if the key is not in the cache
+
+        """
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def put(self, key, entry, n_bytes):
+        """
+        --------------------
+        Description
+        --------------------
+        -> put (method): Class method that stores an entry in the cache and evicts the least recently used entries until the memory budget is respected.
+        Entries bigger than the whole budget are not cached. The dataframe of the entry is made read-only with make_read_only() as it is shared between sessions.
+
+        --------------------
+        Parameters
+        --------------------
+        -> key (tuple): Cache key built with make_key()
+        -> entry (dict): Entry to be cached
+        -> n_bytes (int): Memory usage of the entry in bytes
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        with self.lock:
+            self.pop(key)
+            if n_bytes > self.max_bytes:
+                return
+
+            if entry.get("df") is not None:
+                make_read_only(entry["df"])
+                self.df_keys[id(entry["df"])] = key
+                # Results computed before the dataframe was cached now count in the budget
+                self.n_bytes += self.result_sizes.get(id(entry["df"]), 0)
+            self.entries[key] = entry
+            self.sizes[key] = n_bytes
+            self.n_bytes += n_bytes
+            self.evict()
+
+    def pop(self, key):
+        """
+        --------------------
+        Description
+        --------------------
+        -> pop (method): Class method that removes an entry from the cache if present, together with the column results of its dataframe
+
+        --------------------
+        Parameters
+        --------------------
+        -> key (tuple): Cache key built with make_key()
+
+        --------------------
+        Returns
+        --------------------
+        -> (dict): Removed entry or None if the key is not in the cache
+
+        """
+        with self.lock:
+            if key not in self.entries:
+                return None
+            self.n_bytes -= self.sizes.pop(key)
+            entry = self.entries.pop(key)
+            if entry.get("df") is not None:
+                self.drop_results(id(entry["df"]))
+                self.df_keys.pop(id(entry["df"]), None)
+            return entry
+
+    def evict(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> evict (method): Class method that removes the least recently used entries until the total memory usage fits in the memory budget
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        with self.lock:
+            while self.entries and self.n_bytes > self.max_bytes:
+                key = next(iter(self.entries))
+                self.pop(key)
+
+    def clear(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> clear (method): Class method that removes all entries from the cache
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        with self.lock:
+            self.entries.clear()
+            self.sizes.clear()
+            self.n_bytes = 0
+            self.file_hashes.clear()
+            self.results.clear()
+            self.result_sizes.clear()
+            self.df_keys.clear()
+            self.compute_locks.clear()
+            self.hits = self.misses = 0
+
+    def get_result(self, df, name, compute):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_result (method): Class method that returns a result computed for the columns of a dataframe, computing it only the first time it is requested.
+        Results are kept as long as the dataframe object is alive, and are also removed when the entry holding the dataframe is evicted. Their memory usage only counts in the memory budget if the dataframe is held by an entry.
+        The result is computed without holding the lock of the cache, but under a lock specific to the result, so threads requesting a result being computed wait for it instead of computing it again.
+
+        --------------------
+        Parameters
+        --------------------
+        -> df (pd.DataFrame): Dataframe the columns belong to
+        -> name (tuple): Name of the result (e.g. name of the column and kind of result)
+        -> compute (callable): Function without parameters computing the result
+
+        --------------------
+        Returns
+        --------------------
+        -> (object): Cached or computed result
+
+        """
+        df_id = id(df)
+        with self.lock:
+            results = self.results.get(df_id)
+            if results is not None and name in results:
+                self.hits += 1
+                return results[name]
+            compute_lock = self.compute_locks.setdefault((df_id, name), threading.Lock())
+
+        with compute_lock:
+            # Another thread may have computed the result while waiting for the lock
+            with self.lock:
+                results = self.results.get(df_id)
+                if results is not None and name in results:
+                    self.hits += 1
+                    return results[name]
+                self.misses += 1
+
+            try:
+                result = compute()
+                n_bytes = get_memory_usage(result)
+            except BaseException:
+                with self.lock:
+                    self.compute_locks.pop((df_id, name), None)
+                raise
+
+            # Store the result before releasing the lock of the result, so that waiting threads find it
+            with self.lock:
+                self.compute_locks.pop((df_id, name), None)
+                if df_id not in self.results:
+                    self.results[df_id] = {}
+                    self.result_sizes[df_id] = 0
+                    weakref.finalize(df, self.drop_results, df_id)
+                self.results[df_id][name] = result
+                self.result_sizes[df_id] += n_bytes
+                if df_id in self.df_keys:
+                    # Make room by evicting other entries (the entry holding this dataframe is marked as most recently used first)
+                    self.n_bytes += n_bytes
+                    self.entries.move_to_end(self.df_keys[df_id])
+                    self.evict()
+                return result
+
+    def drop_results(self, df_id):
+        """
+        --------------------
+        Description
+        --------------------
+        -> drop_results (method): Class method that removes the column results of a dataframe, and their memory usage from the total if the dataframe is held by an entry
+
+        --------------------
+        Parameters
+        --------------------
+        -> df_id (int): Id of the dataframe
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        with self.lock:
+            if self.results.pop(df_id, None) is not None:
+                n_bytes = self.result_sizes.pop(df_id)
+                if df_id in self.df_keys:
+                    self.n_bytes -= n_bytes
+
+    def get_stats(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_stats (method): Class method that returns the usage counters of the cache
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (dict): Number of hits and misses, hit ratio, number of cached entries, number of dataframes with column results, memory usage and memory budget in bytes
+
+        """
+        with self.lock:
+            n_lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / n_lookups if n_lookups else 0.0,
+                "n_entries": len(self.entries),
+                "n_results": len(self.results),
+                "n_bytes": self.n_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+# Process-wide cache shared by all Streamlit sessions, reruns and worker threads
+parse_cache = ParseCache()
@@ -0,0 +1,73 @@
+import io
+import os
+import mimetypes
+
+
+class LocalFile(io.BufferedReader):
+    """
+    --------------------
+    Description
+    --------------------
+    -> LocalFile (class): Class that opens a file of the local file system as a binary file-like object exposing the same attributes as a Streamlit UploadedFile (name, type, size and id),
+    so that the profiling classes can be used on local paths without the Streamlit app
+
+    --------------------
+    Attributes
+    --------------------
+    -> path (str): Path to the local file
+    -> type (str): MIME type guessed from the file extension (None if unknown)
+    -> size (int): Size of the file in bytes
+    -> id (None): Upload identifier, always None for local files so that their content hash is never reused for another file
+
+    """
+    def __init__(self, path):
+        super().__init__(io.FileIO(os.fspath(path), "rb"))
+        self.path = os.fspath(path)
+        self.type = mimetypes.guess_type(self.path)[0]
+        self.size = os.path.getsize(self.path)
+        self.id = None
+
+
+def open_file(file_path):
+    """
+    --------------------
+    Description
+    --------------------
+    -> open_file (function): Function that opens local paths as LocalFile and returns uploaded files (or any other file-like object) unchanged
+
+    --------------------
+    Parameters
+    --------------------
+    -> file_path (str, os.PathLike or file-like): Local path or uploaded file
+
+    --------------------
+    Returns
+    --------------------
+    -> (file-like): File-like object to be read by the profiling classes (None if file_path is None)
+
+    """
+    if isinstance(file_path, (str, os.PathLike)):
+        return LocalFile(file_path)
+    return file_path
+
+
+def close_file(file):
+    """
+    --------------------
+    Description
+    --------------------
+    -> close_file (function): Function that closes a file opened by open_file() from a local path. Uploaded files (or any other file-like object) are left open as they belong to the caller.
+
+    --------------------
+    Parameters
+    --------------------
+    -> file (file-like): File returned by open_file()
+
+    --------------------
+    Returns
+    --------------------
+    -> None
+
+    """
+    if isinstance(file, LocalFile):
+        file.close()
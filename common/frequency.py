@@ -0,0 +1,188 @@
+import numpy as np
+import pandas as pd
+
+from common.cache import parse_cache
+
+
+def get_column_result(df, col_name, kind, compute):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_column_result (function): Function that returns a result computed for a column of a dataframe, computing it only the first time it is requested.
+    Results are stored in the process-wide common.cache.parse_cache (see common.cache.ParseCache.get_result()), so they are shared by all sessions exploring the same dataframe and count in its memory budget.
+    They are kept as long as the dataframe object is alive and its cache entry isn't evicted. Dataframes are expected not to be modified in place.
+
+    --------------------
+    Parameters
+    --------------------
+    -> df (pd.DataFrame): Dataframe the column belongs to (if None, the result is computed without being cached)
+    -> col_name (str): Name of the column
+    -> kind (str): Name of the result (e.g. "text_frequency")
+    -> compute (callable): Function without parameters computing the result
+
+    --------------------
+    Returns
+    --------------------
+    -> (object): Cached or computed result
+
+    """
+    if df is None:
+        return compute()
+    return parse_cache.get_result(df, (col_name, kind), compute)
+
+
+class FrequencyIndex:
+    """
+    --------------------
+    Description
+    --------------------
+    -> FrequencyIndex (class): Class that holds the unique values of a serie with their number of occurrences, sorted by decreasing count (ties sorted by increasing value).
+    It is computed once per column and the number of unique values, the mode, the most frequent values and the barchart data are all derived from it.
+
+    --------------------
+    Attributes
+    --------------------
+    -> values (pd.Index): Unique non-missing values sorted by decreasing count
+    -> counts (np.ndarray): Number of occurrences of each unique value
+    -> n_missing (int): Number of missing values
+    -> n_valid (int): Number of non-missing values
+    -> n_unique (int): Number of unique non-missing values
+
+    """
+    def __init__(self, values, counts, n_missing=0):
+        self.values = pd.Index(values)
+        self.counts = np.asarray(counts, dtype="int64")
+        self.n_missing = int(n_missing)
+        self.n_valid = int(self.counts.sum())
+        self.n_unique = len(self.counts)
+
+    @classmethod
+    def from_serie(cls, serie):
+        """
+        --------------------
+        Description
+        --------------------
+        -> from_serie (method): Class method that builds the frequency index of a serie with a single value_counts()
+
+        --------------------
+        Parameters
+        --------------------
+        -> serie (pd.Series): Serie to be indexed
+
+        --------------------
+        Returns
+        --------------------
+        -> (FrequencyIndex): Frequency index of the serie
+
+        """
+        value_counts = serie.value_counts(dropna=True, sort=False)
+        try:
+            # Sort by value first so that ties keep a deterministic order
+            value_counts = value_counts.sort_index(kind="stable")
+        except TypeError:
+            pass
+        order = np.argsort(-value_counts.to_numpy(), kind="stable")
+        return cls(
+            values=value_counts.index[order],
+            counts=value_counts.to_numpy()[order],
+            n_missing=len(serie) - int(value_counts.sum())
+        )
+
+    @classmethod
+    def from_sorted(cls, sorted_values, n_missing=0):
+        """
+        --------------------
+        Description
+        --------------------
+        -> from_sorted (method): Class method that builds the frequency index from already sorted non-missing values, using the boundaries between runs of equal values
+
+        --------------------
+        Parameters
+        --------------------
+        -> sorted_values (np.ndarray): Sorted non-missing values
+        -> n_missing (int): Number of missing values
+
+        --------------------
+        Returns
+        --------------------
+        -> (FrequencyIndex): Frequency index of the values
+
+        """
+        if len(sorted_values) == 0:
+            return cls(values=sorted_values, counts=[], n_missing=n_missing)
+        starts = np.concatenate(([0], np.flatnonzero(sorted_values[1:] != sorted_values[:-1]) + 1))
+        counts = np.diff(np.append(starts, len(sorted_values)))
+        order = np.argsort(-counts, kind="stable")
+        return cls(values=sorted_values[starts[order]], counts=counts[order], n_missing=n_missing)
+
+    def get_mode(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_mode (method): Class method that returns the most frequent value (the smallest one in case of ties, as pd.Series.mode())
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (object): Mode value or None if there are no non-missing values
+
+        """
+        return self.values[0] if self.n_unique else None
+
+    def get_top(self, end=20):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_top (method): Class method that computes the Dataframe containing the most frequent values with their number of occurrences and percentage of non-missing values
+
+        --------------------
+        Parameters
+        --------------------
+        -> end (int): Maximum number of values to be returned
+
+        --------------------
+        Returns
+        --------------------
+        -> (pd.DataFrame): Dataframe with the columns value, occurrence and percentage
+
+        """
+        counts = self.counts[:end]
+        percentage = (counts / self.n_valid * 100).round(2) if self.n_valid else counts.astype("float64")
+        return pd.DataFrame({
+            'value': self.values[:end],
+            'occurrence': counts,
+            'percentage': percentage
+        })
+
+    def count_matching(self, predicate):
+        """
+        --------------------
+        Description
+        --------------------
+        -> count_matching (method): Class method that counts the non-missing values of the serie matching a predicate.
+        The predicate is evaluated once per distinct value and the matching values are weighted by their number of occurrences,
+        so the cost depends on the number of unique values rather than the number of rows.
+
+        --------------------
+        Parameters
+        --------------------
+        -> predicate (callable): Function taking a pd.Series of distinct values and returning a boolean serie (or array) of the same length
+
+        --------------------
+        Returns
+        --------------------
+        -> (int): Number of non-missing values matching the predicate
+
+        """
+        if self.n_unique == 0:
+            return 0
+        matched = np.asarray(predicate(pd.Series(self.values)), dtype="bool")
+        return int(self.counts[matched].sum())
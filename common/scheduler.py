@@ -0,0 +1,92 @@
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+# Number of worker threads computing tab profiles in the background
+DEFAULT_PROFILE_WORKERS = int(os.environ.get("CSV_EXPLORER_PROFILE_WORKERS", 4))
+
+
+class ProfileScheduler:
+    """
+    --------------------
+    Description
+    --------------------
+    -> ProfileScheduler (class): Class that computes the profiles of the tabs (dataset information, numeric, text and datetime columns) of a dataframe on a pool of worker threads,
+    so that they are all computed at the same time right after the file is loaded instead of one after another when each tab is displayed.
+    Each profile is submitted once per dataframe and the futures are kept as long as the dataframe object is alive.
+    Threads are used rather than processes so that the dataframe doesn't have to be copied to the workers, NumPy and Pandas releasing the GIL during most of the computations.
+
+    --------------------
+    Attributes
+    --------------------
+    -> max_workers (int): Number of worker threads (default set to DEFAULT_PROFILE_WORKERS)
+    -> executor (ThreadPoolExecutor): Pool of worker threads, created on first use (default set to None)
+    -> futures (dict): Future of each profile keyed by id of the dataframe and name of the profile (default set to empty dict)
+    -> lock (threading.Lock): Lock protecting self.futures and self.executor
+
+    """
+    def __init__(self, max_workers=DEFAULT_PROFILE_WORKERS):
+        self.max_workers = max_workers
+        self.executor = None
+        self.futures = {}
+        self.lock = threading.Lock()
+
+    def submit(self, df, name, compute):
+        """
+        --------------------
+        Description
+        --------------------
+        -> submit (method): Class method that starts computing a profile of a dataframe on the worker threads if it hasn't been submitted before, and returns its future
+
+        --------------------
+        Parameters
+        --------------------
+        -> df (pd.DataFrame): Dataframe the profile is computed from
+        -> name (str): Name of the profile (e.g. "text_columns")
+        -> compute (callable): Function without parameters computing the profile
+
+        --------------------
+        Returns
+        --------------------
+        -> (concurrent.futures.Future): Future of the profile
+
+        """
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="profile")
+
+            df_id = id(df)
+            if df_id not in self.futures:
+                self.futures[df_id] = {}
+                weakref.finalize(df, self.forget, df_id)
+
+            futures = self.futures[df_id]
+            if name not in futures:
+                futures[name] = self.executor.submit(compute)
+            return futures[name]
+
+    def forget(self, df_id):
+        """
+        --------------------
+        Description
+        --------------------
+        -> forget (method): Class method that drops the futures of a dataframe once it has been garbage collected
+
+        --------------------
+        Parameters
+        --------------------
+        -> df_id (int): Id of the dataframe
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        with self.lock:
+            self.futures.pop(df_id, None)
+
+
+# Process-wide scheduler shared by all Streamlit sessions
+profile_scheduler = ProfileScheduler()
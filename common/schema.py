@@ -0,0 +1,243 @@
+import threading
+
+import pandas as pd
+
+from common.frequency import get_column_result
+from tab_date.parsing import estimate_date_ratio
+
+# Fraction of values parsed as dates from which a text column is classified as datetime (and excluded from the text columns)
+DATE_KIND_RATIO = 0.8
+# Fraction of values parsed as dates from which a text column is offered as datetime column when the dataset has no column of datetime data type
+DATE_CANDIDATE_RATIO = 0.3
+
+
+def get_storage(dtype):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_storage (function): Function that maps the data type of a column to the kind of data it stores, the same way as select_dtypes() was used by the tabs
+
+    --------------------
+    Parameters
+    --------------------
+    -> dtype (np.dtype or ExtensionDtype): Data type of the column
+
+    --------------------
+    Returns
+    --------------------
+    -> (str): "number", "datetime", "text" (object, string and category data types) or "other" (booleans, durations, ...)
+
+    """
+    if pd.api.types.is_bool_dtype(dtype):
+        return "other"
+    if pd.api.types.is_numeric_dtype(dtype) and not isinstance(dtype, pd.CategoricalDtype):
+        return "number"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "datetime"
+    if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype):
+        return "text"
+    return "other"
+
+
+class ColumnSchema:
+    """
+    --------------------
+    Description
+    --------------------
+    -> ColumnSchema (class): Class that classifies the columns of a dataframe once for all the tabs.
+    Columns are first classified from their data type. Columns stored as text are then tested as dates only once, when a tab first needs it, with tab_date.parsing.estimate_date_ratio()
+    against both thresholds (DATE_CANDIDATE_RATIO and DATE_KIND_RATIO) at the same time, so the text and datetime tabs read the same parse statistics.
+    The schema doesn't keep a reference to the dataframe so that it can be cached with it (see get_schema()).
+
+    --------------------
+    Attributes
+    --------------------
+    -> columns (dict): Information of each column keyed by column name: data type, storage (see get_storage()), kind ("number", "datetime", "text" or "other"),
+    confidence (fraction of tested values supporting the kind, None until tested), date_ratio (estimated fraction of dates, None if not tested) and n_tested (number of values parsed as dates)
+    -> max_sample (int): Maximum number of values parsed as datetime per column (default set to 1000)
+    -> dates_sniffed (bool): Flag stating if the text columns have been tested as dates (default set to False)
+    -> lock (threading.Lock): Lock making sure the text columns are only tested once when several threads need them
+
+    """
+    def __init__(self, dtypes, max_sample=1000):
+        self.columns = {}
+        for col, dtype in dtypes.items():
+            storage = get_storage(dtype)
+            self.columns[col] = {
+                "dtype": str(dtype),
+                "storage": storage,
+                "kind": storage,
+                "confidence": None if storage == "text" else 1.0,
+                "date_ratio": None,
+                "n_tested": 0,
+            }
+        self.max_sample = max_sample
+        self.dates_sniffed = False
+        self.lock = threading.Lock()
+
+    def sniff_dates(self, df):
+        """
+        --------------------
+        Description
+        --------------------
+        -> sniff_dates (method): Class method that estimates the fraction of dates of each column stored as text, on a random sample of at most self.max_sample values stopping as soon as
+        the fraction is clearly above or below both thresholds, and classifies the column as datetime if it is at least DATE_KIND_RATIO. It does nothing if the columns have already been tested.
+
+        --------------------
+        Parameters
+        --------------------
+        -> df (pd.DataFrame): Dataframe the schema has been built from
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        with self.lock:
+            if self.dates_sniffed:
+                return
+            for col, info in self.columns.items():
+                if info["storage"] != "text" or col not in df.columns:
+                    continue
+                try:
+                    date_ratio, n_tested = estimate_date_ratio(df[col], threshold=(DATE_CANDIDATE_RATIO, DATE_KIND_RATIO), max_sample=self.max_sample)
+                except (ValueError, TypeError):
+                    # If conversion fails completely, definitely a text column
+                    date_ratio, n_tested = 0.0, 0
+                info["date_ratio"] = date_ratio
+                info["n_tested"] = n_tested
+                info["kind"] = "datetime" if date_ratio >= DATE_KIND_RATIO else "text"
+                info["confidence"] = date_ratio if info["kind"] == "datetime" else 1.0 - date_ratio
+            self.dates_sniffed = True
+
+    def get_storage_cols(self, storage):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_storage_cols (method): Class method that lists the columns storing a kind of data, without testing text columns as dates
+
+        --------------------
+        Parameters
+        --------------------
+        -> storage (str): Kind of data stored ("number", "datetime", "text" or "other")
+
+        --------------------
+        Returns
+        --------------------
+        -> (list): Names of the columns
+
+        """
+        return [col for col, info in self.columns.items() if info["storage"] == storage]
+
+    def get_numeric_cols(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_numeric_cols (method): Class method that lists the columns of numeric data type (booleans excluded)
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (list): Names of the numeric columns
+
+        """
+        return self.get_storage_cols("number")
+
+    def get_text_cols(self, df):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_text_cols (method): Class method that lists the columns stored as text where less than DATE_KIND_RATIO of the values look like dates, testing the text columns first if needed
+
+        --------------------
+        Parameters
+        --------------------
+        -> df (pd.DataFrame): Dataframe the schema has been built from
+
+        --------------------
+        Returns
+        --------------------
+        -> (list): Names of the text columns
+
+        """
+        self.sniff_dates(df)
+        return [col for col, info in self.columns.items() if info["storage"] == "text" and info["kind"] == "text"]
+
+    def get_date_cols(self, df):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_date_cols (method): Class method that lists the columns of datetime data type or, if there are none, the columns stored as text where at least DATE_CANDIDATE_RATIO of the values look like dates.
+        Text columns are only tested as dates if there is no column of datetime data type.
+
+        --------------------
+        Parameters
+        --------------------
+        -> df (pd.DataFrame): Dataframe the schema has been built from
+
+        --------------------
+        Returns
+        --------------------
+        -> (list): Names of the datetime columns
+
+        """
+        date_cols = self.get_storage_cols("datetime")
+        if date_cols:
+            return date_cols
+
+        self.sniff_dates(df)
+        return [col for col, info in self.columns.items() if info["storage"] == "text" and info["date_ratio"] >= DATE_CANDIDATE_RATIO]
+
+    def to_frame(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> to_frame (method): Class method that formats the schema as a dataframe with one row per column
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (pd.DataFrame): Dataframe with the columns column, dtype, storage, kind, confidence, date_ratio and n_tested
+
+        """
+        return pd.DataFrame([{"column": col, **info} for col, info in self.columns.items()])
+
+
+def get_schema(df, max_sample=1000):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_schema (function): Function that returns the schema of a dataframe, building it only the first time it is requested.
+    The schema is cached with the dataframe (see common.frequency.get_column_result()), so it is shared by all tabs, sessions and worker threads.
+
+    --------------------
+    Parameters
+    --------------------
+    -> df (pd.DataFrame): Dataframe to be classified
+    -> max_sample (int): Maximum number of values parsed as datetime per column, used when the schema is built
+
+    --------------------
+    Returns
+    --------------------
+    -> (ColumnSchema): Schema of the dataframe
+
+    """
+    return get_column_result(df, tuple(df.columns), "schema", lambda: ColumnSchema(df.dtypes, max_sample=max_sample))
@@ -0,0 +1,486 @@
+import os
+import math
+
+import numpy as np
+import pandas as pd
+
+# Number of rows above which column statistics switch to approximate sketches, can be overridden with an environment variable
+APPROX_MIN_ROWS = int(os.environ.get("CSV_EXPLORER_APPROX_ROWS", 10_000_000))
+
+# Default relative standard error of the approximate distinct counts
+DEFAULT_DISTINCT_ERROR = 0.01
+
+# Number of rows added at a time when building a sketch from an in-memory serie
+CHUNK_ROWS = 1_000_000
+
+
+def hash_values(values):
+    """
+    --------------------
+    Description
+    --------------------
+    -> hash_values (function): Function that hashes values to 64-bit unsigned integers with pd.util.hash_pandas_object(), so that equal values always get the same hash.
+    Numbers are hashed as float64, as a column read as int in a chunk and as float in another one (because of a missing value) would otherwise give two hashes for the same value.
+
+    --------------------
+    Parameters
+    --------------------
+    -> values (pd.Series or array-like): Values to be hashed
+
+    --------------------
+    Returns
+    --------------------
+    -> (np.ndarray): Hashes as uint64
+
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        values = values.astype("float64")
+    return pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+
+def bit_length(values):
+    """
+    --------------------
+    Description
+    --------------------
+    -> bit_length (function): Function that computes the number of bits needed to write each unsigned integer of an array (0 for 0), in a vectorized way.
+    The exponent given by np.frexp() can be one too high when the conversion to float64 rounds up, so it is corrected with an exact integer comparison.
+
+    --------------------
+    Parameters
+    --------------------
+    -> values (np.ndarray): Unsigned integers (uint64)
+
+    --------------------
+    Returns
+    --------------------
+    -> (np.ndarray): Bit length of each value as int64
+
+    """
+    lengths = np.minimum(np.frexp(values.astype("float64"))[1], 64).astype("int64")
+    # Values rounded up to the next power of two have one bit less
+    rounded_up = lengths > 0
+    rounded_up[rounded_up] = (np.uint64(1) << (lengths[rounded_up] - 1).astype("uint64")) > values[rounded_up]
+    lengths[rounded_up] -= 1
+    return lengths
+
+
+class HyperLogLog:
+    """
+    --------------------
+    Description
+    --------------------
+    -> HyperLogLog (class): Class that estimates the number of distinct values of a stream of values in constant memory (2^precision registers of one byte).
+    Values can be added chunk by chunk and sketches built on different chunks or processes can be merged, as long as they have the same precision.
+
+    --------------------
+    Attributes
+    --------------------
+    -> error (float): Targeted relative standard error of the estimate (default set to 1%)
+    -> precision (int): Number of hash bits used to pick a register, derived from the error
+    -> registers (np.ndarray): Highest rank observed by each register
+    -> block_size (int): Number of values hashed at a time, to bound the memory used by update()
+
+    """
+    def __init__(self, error=DEFAULT_DISTINCT_ERROR, block_size=1_000_000):
+        self.error = error
+        # The standard error of HyperLogLog is about 1.04 / sqrt(number of registers)
+        self.precision = min(18, max(4, math.ceil(math.log2((1.04 / error) ** 2))))
+        self.registers = np.zeros(2 ** self.precision, dtype="uint8")
+        self.block_size = block_size
+
+    def update(self, values):
+        """
+        --------------------
+        Description
+        --------------------
+        -> update (method): Class method that adds values to the sketch, ignoring missing values
+
+        --------------------
+        Parameters
+        --------------------
+        -> values (pd.Series or array-like): Values to be added
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        values = pd.Series(values).dropna()
+        n_bits = 64 - self.precision
+        for start in range(0, len(values), self.block_size):
+            hashes = hash_values(values.iloc[start:start + self.block_size])
+            # The first bits pick the register, the rank is the position of the first 1 bit in the others
+            indexes = (hashes >> np.uint64(n_bits)).astype("int64")
+            remainders = hashes & np.uint64((1 << n_bits) - 1)
+            ranks = (n_bits - bit_length(remainders) + 1).astype("uint8")
+            np.maximum.at(self.registers, indexes, ranks)
+
+    def merge(self, other):
+        """
+        --------------------
+        Description
+        --------------------
+        -> merge (method): Class method that merges another sketch into this one, the result being the sketch of both streams of values
+
+        --------------------
+        Parameters
+        --------------------
+        -> other (HyperLogLog): Sketch with the same precision
+
+        --------------------
+        Returns
+        --------------------
+        -> (HyperLogLog): This sketch
+
+        """
+        if other.precision != self.precision:
+            raise ValueError("Can't merge HyperLogLog sketches with different precisions")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> count (method): Class method that estimates the number of distinct values added to the sketch.
+        Linear counting is used for small cardinalities, where it is more accurate than the raw HyperLogLog estimate.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (int): Estimated number of distinct values
+
+        """
+        n_registers = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / n_registers)
+        estimate = alpha * n_registers ** 2 / np.sum(np.ldexp(1.0, -self.registers.astype("int64")))
+
+        n_zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * n_registers and n_zeros > 0:
+            estimate = n_registers * math.log(n_registers / n_zeros)
+        return int(round(estimate))
+
+
+class HeavyHitters:
+    """
+    --------------------
+    Description
+    --------------------
+    -> HeavyHitters (class): Class that finds the most frequent values of a stream of values in bounded memory with the Misra-Gries algorithm (at most `capacity` counters are kept).
+    Each chunk of values is counted exactly, merged with the current counters and, if there are more than `capacity` of them, the (capacity + 1)-th largest counter is subtracted from all counters
+    and the ones that are no longer positive are dropped. Sketches built on different chunks or processes can be merged in the same way.
+    Counters never overestimate: the true number of occurrences of a value is between its counter and its counter plus get_error(), which is at most the number of values divided by (capacity + 1).
+
+    --------------------
+    Attributes
+    --------------------
+    -> capacity (int): Maximum number of counters kept (default set to 1000)
+    -> counts (pd.Series): Counter of each tracked value, indexed by value
+    -> n_total (int): Number of non-missing values added to the sketch
+
+    """
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype="int64")
+        self.n_total = 0
+
+    def update(self, values):
+        """
+        --------------------
+        Description
+        --------------------
+        -> update (method): Class method that adds a chunk of values to the sketch, ignoring missing values
+
+        --------------------
+        Parameters
+        --------------------
+        -> values (pd.Series or array-like): Values to be added
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        values = pd.Series(values).dropna()
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(values.cat.categories.dtype)
+        self.n_total += len(values)
+        self.merge_counts(values.value_counts(sort=False))
+
+    def merge(self, other):
+        """
+        --------------------
+        Description
+        --------------------
+        -> merge (method): Class method that merges another sketch into this one, the result being the sketch of both streams of values
+
+        --------------------
+        Parameters
+        --------------------
+        -> other (HeavyHitters): Sketch to be merged
+
+        --------------------
+        Returns
+        --------------------
+        -> (HeavyHitters): This sketch
+
+        """
+        self.n_total += other.n_total
+        self.merge_counts(other.counts)
+        return self
+
+    def merge_counts(self, counts):
+        """
+        --------------------
+        Description
+        --------------------
+        -> merge_counts (method): Class method that adds counters to the current ones and reduces them back to at most self.capacity counters
+
+        --------------------
+        Parameters
+        --------------------
+        -> counts (pd.Series): Counters indexed by value
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        counts = counts[counts > 0]
+        if self.counts.empty:
+            combined = counts.astype("int64")
+        else:
+            combined = self.counts.add(counts, fill_value=0).astype("int64")
+
+        if len(combined) > self.capacity:
+            # Subtract the (capacity + 1)-th largest counter from all counters
+            threshold = np.partition(combined.to_numpy(), len(combined) - self.capacity - 1)[len(combined) - self.capacity - 1]
+            combined = combined - threshold
+            combined = combined[combined > 0]
+        self.counts = combined
+
+    def get_error(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_error (method): Class method that computes the maximum number of occurrences a counter can miss
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (int): Maximum difference between the true number of occurrences of a value and its counter
+
+        """
+        return int((self.n_total - int(self.counts.sum())) // (self.capacity + 1))
+
+    def get_top(self, end=20):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_top (method): Class method that computes the Dataframe containing the most frequent values with their estimated number of occurrences and percentage of non-missing values.
+        The occurrence_error and percentage_error columns give the maximum amount by which each occurrence and percentage may be underestimated.
+
+        --------------------
+        Parameters
+        --------------------
+        -> end (int): Maximum number of values to be returned
+
+        --------------------
+        Returns
+        --------------------
+        -> (pd.DataFrame): Dataframe with the columns value, occurrence, percentage, occurrence_error and percentage_error
+
+        """
+        counts = self.counts
+        try:
+            # Sort by value first so that ties keep a deterministic order
+            counts = counts.sort_index(kind="stable")
+        except TypeError:
+            pass
+        counts = counts.iloc[np.argsort(-counts.to_numpy(), kind="stable")[:end]]
+
+        error = self.get_error()
+        n_total = self.n_total or 1
+        return pd.DataFrame({
+            'value': counts.index,
+            'occurrence': counts.to_numpy(),
+            'percentage': (counts.to_numpy() / n_total * 100).round(2),
+            'occurrence_error': error,
+            'percentage_error': round(error / n_total * 100, 2)
+        })
+
+
+class QuantileSketch:
+    """
+    --------------------
+    Description
+    --------------------
+    -> QuantileSketch (class): Class that estimates the quantiles of a stream of numbers in bounded memory with a KLL sketch.
+    Values are kept in a hierarchy of compactors, where each value at level h stands for 2^h values of the stream. When a compactor gets full, it is sorted and every other value
+    (starting at a random offset) is promoted to the next level. The capacity of the compactors decreases geometrically with their depth, so the size of the sketch only grows with the logarithm of the number of values.
+    Sketches built on different chunks or processes can be merged level by level.
+
+    --------------------
+    Attributes
+    --------------------
+    -> k (int): Capacity of the top level compactor, controlling the accuracy (rank error of about 1.7 / k, default set to 400)
+    -> compactors (list): Values kept at each level as np.ndarray
+    -> n_total (int): Number of non-missing values added to the sketch
+    -> rng (np.random.Generator): Random generator used to pick the compaction offsets
+
+    """
+    def __init__(self, k=400, random_state=0):
+        self.k = k
+        self.compactors = [np.empty(0, dtype="float64")]
+        self.n_total = 0
+        self.rng = np.random.default_rng(random_state)
+
+    def get_capacity(self, level):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_capacity (method): Class method that computes the capacity of the compactor at a level, which is k at the top level and shrinks by 2/3 for each level below it
+
+        --------------------
+        Parameters
+        --------------------
+        -> level (int): Level of the compactor
+
+        --------------------
+        Returns
+        --------------------
+        -> (int): Maximum number of values kept by the compactor
+
+        """
+        depth = len(self.compactors) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values):
+        """
+        --------------------
+        Description
+        --------------------
+        -> update (method): Class method that adds values to the sketch, ignoring missing and infinite values
+
+        --------------------
+        Parameters
+        --------------------
+        -> values (pd.Series or array-like): Numbers to be added
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        values = pd.Series(values).to_numpy(dtype="float64", na_value=np.nan)
+        values = values[np.isfinite(values)]
+        self.n_total += len(values)
+        self.compactors[0] = np.concatenate((self.compactors[0], values))
+        self.compress()
+
+    def merge(self, other):
+        """
+        --------------------
+        Description
+        --------------------
+        -> merge (method): Class method that merges another sketch into this one, the result being the sketch of both streams of values
+
+        --------------------
+        Parameters
+        --------------------
+        -> other (QuantileSketch): Sketch to be merged
+
+        --------------------
+        Returns
+        --------------------
+        -> (QuantileSketch): This sketch
+
+        """
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.empty(0, dtype="float64"))
+        for level, values in enumerate(other.compactors):
+            self.compactors[level] = np.concatenate((self.compactors[level], values))
+        self.n_total += other.n_total
+        self.compress()
+        return self
+
+    def compress(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> compress (method): Class method that compacts the full compactors, from the bottom level up, until each of them fits into its capacity
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        level = 0
+        while level < len(self.compactors):
+            values = self.compactors[level]
+            if len(values) > self.get_capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0, dtype="float64"))
+                values = np.sort(values)
+                # Keep one value at this level if their number is odd, promote every other value of the rest
+                kept = values[:len(values) % 2]
+                promoted = values[len(kept):][self.rng.integers(2)::2]
+                self.compactors[level] = kept
+                self.compactors[level + 1] = np.concatenate((self.compactors[level + 1], promoted))
+            level += 1
+
+    def get_quantiles(self, quantiles):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_quantiles (method): Class method that estimates quantiles from the values kept in the sketch weighted by 2^level
+
+        --------------------
+        Parameters
+        --------------------
+        -> quantiles (list): Quantiles to be estimated, between 0 and 1
+
+        --------------------
+        Returns
+        --------------------
+        -> (list): Estimated value of each quantile (NaN if the sketch is empty)
+
+        """
+        if self.n_total == 0:
+            return [np.nan for _ in quantiles]
+        values = np.concatenate(self.compactors)
+        weights = np.concatenate([np.full(len(values), 2 ** level, dtype="float64") for level, values in enumerate(self.compactors)])
+        order = np.argsort(values, kind="stable")
+        values = values[order]
+        cumulated = np.cumsum(weights[order])
+        # Value of the smallest rank covering each quantile
+        positions = np.searchsorted(cumulated, np.asarray(quantiles, dtype="float64") * cumulated[-1], side="left")
+        return [float(value) for value in values[np.minimum(positions, len(values) - 1)]]
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+# Granularities of the date barchart from the finest to the coarsest, with the NumPy unit used to truncate dates and the approximate length of a bucket
+GRANULARITIES = [
+    ("minute", "m", np.timedelta64(1, "m")),
+    ("hour", "h", np.timedelta64(1, "h")),
+    ("day", "D", np.timedelta64(1, "D")),
+    ("week", "W", np.timedelta64(7, "D")),
+    ("month", "M", np.timedelta64(30, "D")),
+    ("year", "Y", np.timedelta64(365, "D")),
+]
+
+
+def choose_granularity(col_min, col_max, max_buckets=200):
+    """
+    --------------------
+    Description
+    --------------------
+    -> choose_granularity (function): Function that chooses the finest granularity (minute, hour, day, week, month or year) giving at most max_buckets buckets between two dates
+
+    --------------------
+    Parameters
+    --------------------
+    -> col_min (np.datetime64): Minimum date
+    -> col_max (np.datetime64): Maximum date
+    -> max_buckets (int): Maximum number of buckets
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Name and NumPy unit of the granularity
+
+    """
+    span = np.datetime64(col_max, "ns") - np.datetime64(col_min, "ns")
+    for name, unit, length in GRANULARITIES:
+        if span / length < max_buckets:
+            return name, unit
+    return GRANULARITIES[-1][:2]
+
+
+def truncate_dates(values, unit):
+    """
+    --------------------
+    Description
+    --------------------
+    -> truncate_dates (function): Function that truncates dates to the start of their bucket, weeks starting on Monday
+
+    --------------------
+    Parameters
+    --------------------
+    -> values (np.ndarray): Dates as datetime64[ns] without missing values
+    -> unit (str): NumPy unit of the buckets ("m", "h", "D", "W", "M" or "Y")
+
+    --------------------
+    Returns
+    --------------------
+    -> (np.ndarray): Start of the bucket of each date as int64 in the bucket unit (days for weeks)
+
+    """
+    if unit == "W":
+        days = values.astype("datetime64[D]").astype("int64")
+        # 1970-01-01 was a Thursday, shift each day back to the Monday of its week
+        return days - (days + 3) % 7
+    return values.astype(f"datetime64[{unit}]").astype("int64")
+
+
+def aggregate_dates(serie, max_buckets=200):
+    """
+    --------------------
+    Description
+    --------------------
+    -> aggregate_dates (function): Function that counts the dates of a serie per bucket, the granularity being chosen from the range of the serie with choose_granularity().
+    Dates are truncated with NumPy unit conversions and counted with np.bincount(), so the cost is linear in the number of rows and the result has at most about max_buckets rows.
+    Timezone-aware dates are counted on their local time.
+
+    --------------------
+    Parameters
+    --------------------
+    -> serie (pd.Series): Serie of datetime data type
+    -> max_buckets (int): Maximum number of buckets
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Dataframe with the columns bucket (start of the bucket) and count (only non-empty buckets), and name of the granularity
+
+    """
+    if serie.dt.tz is not None:
+        serie = serie.dt.tz_localize(None)
+    values = serie.dropna().to_numpy(dtype="datetime64[ns]")
+    if values.size == 0:
+        return pd.DataFrame(columns=["bucket", "count"]), None
+
+    name, unit = choose_granularity(values.min(), values.max(), max_buckets=max_buckets)
+    buckets = truncate_dates(values, unit)
+    first = buckets.min()
+    counts = np.bincount(buckets - first)
+
+    # Keep the non-empty buckets and convert their start back to dates
+    present = np.flatnonzero(counts)
+    starts = (first + present).astype(f"datetime64[{'D' if unit == 'W' else unit}]").astype("datetime64[ns]")
+    return pd.DataFrame({"bucket": starts, "count": counts[present]}), name
@@ -2,8 +2,14 @@ import warnings
 warnings.filterwarnings("ignore", category=UserWarning, module="pandas")
 
 import pandas as pd
-import altair as alt
-import dateparser
+
+from tab_df.formats import is_columnar_file, read_columnar, read_schema
+from tab_date.parsing import convert_to_datetime
+from tab_date.binning import aggregate_dates
+from common.frequency import FrequencyIndex, get_column_result
+from common.schema import get_schema
+from common.sketches import HyperLogLog, HeavyHitters, APPROX_MIN_ROWS, DEFAULT_DISTINCT_ERROR, CHUNK_ROWS
+from common.files import open_file, close_file
 
 class DateColumn:
     """
@@ -15,7 +21,7 @@ class DateColumn:
     --------------------
     Attributes
     --------------------
-    -> file_path (str): Path to the uploaded CSV file (optional)
+    -> file_path (str): Path to the uploaded CSV, Parquet, Feather or Arrow IPC file, local paths being opened with common.files.open_file() (optional)
     -> df (pd.Dataframe): Pandas dataframe (optional)
     -> cols_list (list): List of columns names of dataset that are text type (default set to empty list)
     -> serie (pd.Series): Pandas serie where the content of a column has been loaded (default set to None)
@@ -29,12 +35,20 @@ class DateColumn:
     -> n_empty_1900 (int): Number of times a serie has dates equal to '1900-01-01' (optional)
     -> n_empty_1970 (int): Number of times a serie has dates equal to '1970-01-01' (optional)
     -> barchart (int): Altair barchart displaying the count for each value of a serie (optional)
+    -> granularity (str): Granularity of the buckets of the barchart: minute, hour, day, week, month or year (optional)
     -> frequent (int): Dataframe containing the most frequest value of a serie (optional)
+    -> frequency (common.frequency.FrequencyIndex): Unique values of a serie with their number of occurrences (optional)
+    -> approx_min_rows (int): Number of rows above which statistics are estimated with sketches (default set to common.sketches.APPROX_MIN_ROWS)
+    -> approx_error (float): Relative standard error of the approximate number of unique values (default set to 1%)
+    -> approx_unique (bool): Flag stating if self.n_unique is an approximation (default set to False)
 
     """
-    def __init__(self, file_path=None, df=None):
-        self.file_path = file_path
+    def __init__(self, file_path=None, df=None, approx_min_rows=APPROX_MIN_ROWS, approx_error=DEFAULT_DISTINCT_ERROR):
+        self.file_path = open_file(file_path)
         self.df = df
+        self.approx_min_rows = approx_min_rows
+        self.approx_error = approx_error
+        self.approx_unique = False
         self.cols_list = []
         self.serie = None
         self.n_unique = None
@@ -46,8 +60,10 @@ class DateColumn:
         self.n_future = None
         self.n_empty_1900 = None
         self.n_empty_1970 = None
-        self.barchart = alt.Chart()
+        self.barchart = None
+        self.granularity = None
         self.frequent = pd.DataFrame(columns=['value', 'occurrence', 'percentage'])
+        self.frequency = None
     
     def find_date_cols(self):
         """
@@ -55,7 +71,8 @@ class DateColumn:
         Description
         --------------------
         -> find_date_cols (method): Class method that will load the uploaded CSV file as Pandas DataFrame and store it as attribute (self.df) if it hasn't been provided before.
-        Then it will find all columns of datetime data type. If it can't find any datetime then it will look for all columns of text time. Then it will store the results in the relevant attribute (self.cols_list).
+        Then it will find all columns of datetime data type. If it can't find any datetime then it will look for all columns of text time where at least 30% of values look like dates. Then it will store the results in the relevant attribute (self.cols_list).
+        Columns are classified only once per dataframe for all tabs by common.schema.ColumnSchema, text columns being tested as dates on a random sample of values.
 
         --------------------
         Parameters
@@ -68,35 +85,19 @@ class DateColumn:
         -> None
 
         """
-        # Load dataframe if not provided
-        if self.df is None and self.file_path is not None:
+        # Load dataframe if not provided (only the text and datetime columns of columnar files)
+        if self.df is None and self.file_path is not None and is_columnar_file(self.file_path):
+            cols = [col for col, kind in read_schema(self.file_path).items() if kind in ("text", "datetime")]
+            self.df = read_columnar(self.file_path, columns=cols)
+        elif self.df is None and self.file_path is not None:
             self.df = pd.read_csv(self.file_path)
         
-        # Find datetime columns
+        # Find datetime columns from the schema shared by all tabs
         if self.df is not None:
-            # Find columns with datetime data type
-            self.cols_list = self.df.select_dtypes(include=['datetime64[ns]', 'datetime64[ns, UTC]']).columns.tolist()
-
-            # If no datetime columns found, look for text columns that can be converted to datetime
-            if not self.cols_list:
-                for col in self.df.select_dtypes(include=['object']).columns:
-                    try: 
-                        # Safe parse function
-                        def safe_parse(x):
-                            if pd.isna(x) or str(x).strip() == "":
-                                return pd.NaT  # Keep nulls as NaT
-                            return dateparser.parse(str(x))
-                        parsed = self.df[col].apply(safe_parse)
-                        # Fraction of parsable dates
-                        date_ratio = parsed.notna().mean()
-                        if date_ratio >= 0.3:
-                            self.cols_list.append(col)
-                    except (ValueError, TypeError):
-                        continue
-            
+            self.cols_list = get_schema(self.df).get_date_cols(self.df)
 
 
-    def set_data(self, col_name):
+    def set_data(self, col_name, charts=True):
         """
         --------------------
         Description
@@ -110,6 +111,7 @@ class DateColumn:
         Parameters
         --------------------
         -> col_name (str): Name of the text column to be analysed
+        -> charts (bool): Flag stating if the Altair barchart is built, set to False when only the statistics are needed (e.g. app.report.build_report())
 
         --------------------
         Returns
@@ -123,6 +125,10 @@ class DateColumn:
             # Convert serie to datetime
             self.convert_serie_to_date()
 
+            # Count each distinct date once, shared by unique and frequent (not kept for very large series)
+            if not self.is_approximate():
+                self.set_frequency()
+
             # Compute all requested information
             self.set_unique()
             self.set_missing()
@@ -133,7 +139,8 @@ class DateColumn:
             self.set_future()
             self.set_empty_1900()
             self.set_empty_1970()
-            self.set_barchart()
+            if charts:
+                self.set_barchart()
             self.set_frequent()
         
 
@@ -143,6 +150,8 @@ class DateColumn:
         Description
         --------------------
         -> convert_serie_to_date (method): Class method that convert a Pandas Series to datetime data type and store the results in the relevant attribute (self.serie).
+        The bulk of the serie is parsed with the dominant format(s) inferred from a sample and only the leftover values are parsed with dateparser (see tab_date.parsing.convert_to_datetime()).
+        The converted serie is cached with the dataframe so that it is shared by all sessions exploring the same column.
 
         --------------------
         Parameters
@@ -157,26 +166,33 @@ class DateColumn:
         """
 
         if not self.is_serie_none():
-            # Convert serie to datetime
-          
-            # Safe parse function
-            def safe_parse(x, dayfirst = True):
-                if pd.isna(x) or str(x).strip() == "":
-                    return pd.NaT  # Keep nulls as NaT
-                settings = {
-                    'DATE_ORDER': 'DMY' if dayfirst else 'MDY',
-                    'PREFER_DAY_OF_MONTH': 'first',
-                    'RETURN_AS_TIMEZONE_AWARE': False
-                }
-                return dateparser.parse(str(x), settings=settings)
-            
-            # Apply parsing
-            parsed = self.serie.apply(safe_parse)
-            
-            # Convert to pandas datetime (ensures consistent dtype)
-            self.serie = pd.to_datetime(parsed, dayfirst=True, errors='coerce')
+            # Convert serie to datetime, days are expected before months
+            serie = self.serie
+            self.serie = get_column_result(self.df, serie.name, "date_serie", lambda: convert_to_datetime(serie, dayfirst=True))
         
 
+    def close_file(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> close_file (method): Class method that closes the file opened from a local path (see common.files.close_file()) once the data has been loaded, so that profiling many files doesn't leak file descriptors.
+        Columns of columnar files can't be read from the file anymore afterwards.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        close_file(self.file_path)
+
+
     def is_serie_none(self):
         """
         --------------------
@@ -199,12 +215,131 @@ class DateColumn:
         return self.serie is None or self.serie.empty
         
 
+    def is_approximate(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> is_approximate (method): Class method that checks if the serie is large enough (at least self.approx_min_rows rows) for statistics to be estimated with sketches
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (bool): Flag stating if approximate statistics are used or not
+
+        """
+        return not self.is_serie_none() and len(self.serie) >= self.approx_min_rows
+
+
+    def build_distinct_sketch(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> build_distinct_sketch (method): Class method that builds the HyperLogLog sketch of the non-missing values of the serie, with the relative error self.approx_error
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (common.sketches.HyperLogLog): Sketch of the serie
+
+        """
+        sketch = HyperLogLog(error=self.approx_error)
+        sketch.update(self.serie)
+        return sketch
+
+
+    def get_heavy_hitters(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_heavy_hitters (method): Class method that returns the bounded-memory sketch of the most frequent values of the serie, building it chunk by chunk the first time it is requested
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (common.sketches.HeavyHitters): Sketch of the most frequent values of the serie
+
+        """
+        def build_sketch():
+            sketch = HeavyHitters()
+            for start in range(0, len(self.serie), CHUNK_ROWS):
+                sketch.update(self.serie.iloc[start:start + CHUNK_ROWS])
+            return sketch
+
+        return get_column_result(self.df, self.serie.name, "date_heavy_hitters", build_sketch)
+
+
+    def set_frequency(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_frequency (method): Class method that computes the unique values of a serie with their number of occurrences and store the results in the relevant attribute(self.frequency).
+        The index is cached while the dataframe stays the same, so the column is only converted and counted once.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        if not self.is_serie_none():
+            # Compute the frequency index only once per column
+            self.frequency = get_column_result(self.df, self.serie.name, "date_frequency", lambda: FrequencyIndex.from_serie(self.serie))
+
+
+    def get_frequency(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_frequency (method): Class method that returns the frequency index of the serie, computing it first if needed
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (common.frequency.FrequencyIndex): Frequency index of the serie
+
+        """
+        if self.frequency is None:
+            self.set_frequency()
+        return self.frequency
+
+
     def set_unique(self):
         """
         --------------------
         Description
         --------------------
         -> set_unique (method): Class method that computes the number of unique value of a serie and store the results in the relevant attribute(self.n_unique).
+        For series of at least self.approx_min_rows rows, the number is estimated with a HyperLogLog sketch instead of a hash table of all values.
 
         --------------------
         Parameters
@@ -218,8 +353,15 @@ class DateColumn:
 
         """
         if not self.is_serie_none():
-            # Compute number of unique values
-            self.n_unique = self.serie.nunique()
+            if self.is_approximate():
+                # Estimate number of unique values with a HyperLogLog sketch
+                sketch = get_column_result(self.df, self.serie.name, f"date_distinct_sketch_{self.approx_error}", lambda: self.build_distinct_sketch())
+                self.n_unique = sketch.count()
+                self.approx_unique = True
+            else:
+                # Compute number of unique values
+                self.n_unique = self.get_frequency().n_unique
+                self.approx_unique = False
 
     def set_missing(self):
         """
@@ -420,7 +562,9 @@ class DateColumn:
         --------------------
         Description
         --------------------
-        -> set_barchart (method): Class method that computes the Altair barchart displaying the count for each value of a serie and store the results in the relevant attribute(self.barchart).
+        -> set_barchart (method): Class method that computes the Altair barchart displaying the count for each value of a serie and store the results in the relevant attributes (self.barchart, self.granularity).
+        Dates are counted per bucket before building the chart, the granularity (minute, hour, day, week, month or year) being chosen from the range of the serie with tab_date.binning.aggregate_dates(),
+        so only the aggregated buckets are embedded in the chart whatever the number of rows.
 
         --------------------
         Parameters
@@ -433,11 +577,18 @@ class DateColumn:
         -> None
 
         """
+        # Imported here as altair is only needed to build the chart, which keeps it out of the startup of the command-line tools
+        import altair as alt
+
         if not self.is_serie_none():
+            # Count dates per bucket of adaptive granularity
+            data, self.granularity = aggregate_dates(self.serie)
+
             # Compute barchart
-            self.barchart = alt.Chart(pd.DataFrame({'value': self.serie.dropna()})).mark_bar().encode(
-                alt.X('value:T', title = self.serie.name),
-                alt.Y('count()', title='Count of Records')
+            self.barchart = alt.Chart(data).mark_bar().encode(
+                alt.X('bucket:T', title = f"{self.serie.name} (per {self.granularity})"),
+                alt.Y('count:Q', title='Count of Records'),
+                tooltip=[alt.Tooltip('bucket:T', title='From'), 'count']
             ).properties(
                 title='Barchart of Date Serie'
             )
@@ -449,6 +600,7 @@ class DateColumn:
         Description
         --------------------
         -> set_frequent (method): Class method that computes the Dataframe containing the most frequest value of a serie and store the results in the relevant attribute(self.frequent).
+        For series of at least self.approx_min_rows rows, they are estimated with a Misra-Gries sketch (common.sketches.HeavyHitters) and error bounds are added on the occurrences and percentages.
 
         --------------------
         Parameters
@@ -463,16 +615,12 @@ class DateColumn:
 
         """
         if not self.is_serie_none():
-            # Compute frequent values
-            freq_series = self.serie.value_counts(dropna=True).head(end)
-            # Compute total count for percentage calculation
-            total_count = len(self.serie.dropna())
-            # Create dataframe for frequent values
-            self.frequent = pd.DataFrame({
-                'value': freq_series.index,
-                'occurrence': freq_series.values,
-                'percentage': (freq_series.values / total_count * 100).round(2)
-            })
+            if self.is_approximate():
+                # Estimate frequent values with bounded memory
+                self.frequent = self.get_heavy_hitters().get_top(end)
+            else:
+                # Compute frequent values
+                self.frequent = self.get_frequency().get_top(end)
 
         
 
@@ -509,7 +657,7 @@ class DateColumn:
                     'Maximum Value'
                 ],
                 'Value': [
-                    f"{int(self.n_unique)}",
+                    f"{int(self.n_unique)} (approx.)" if self.approx_unique else f"{int(self.n_unique)}",
                     f"{int(self.n_missing)}",
                     f"{int(self.n_weekend)}",
                     f"{int(self.n_weekday)}",
@@ -0,0 +1,287 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+# Settings used by dateparser when converting a serie, days are expected before months
+DMY_SETTINGS = {
+    'DATE_ORDER': 'DMY',
+    'PREFER_DAY_OF_MONTH': 'first',
+    'RETURN_AS_TIMEZONE_AWARE': False
+}
+
+# Candidate formats tried on a sample of values before falling back to dateparser
+ISO_FORMATS = [
+    "%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M",
+    "%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S.%f", "%Y/%m/%d", "%Y/%m/%d %H:%M:%S",
+]
+DAY_FIRST_FORMATS = [
+    "%d/%m/%Y", "%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%d-%m-%Y", "%d-%m-%Y %H:%M:%S", "%d.%m.%Y", "%d/%m/%y",
+    "%d %b %Y", "%d %B %Y", "%d-%b-%Y", "%d %b %Y %H:%M:%S",
+]
+MONTH_FIRST_FORMATS = [
+    "%m/%d/%Y", "%m/%d/%Y %H:%M:%S", "%m/%d/%Y %H:%M", "%m-%d-%Y", "%m-%d-%Y %H:%M:%S", "%m.%d.%Y", "%m/%d/%y",
+    "%b %d %Y", "%B %d %Y", "%b %d, %Y", "%B %d, %Y",
+]
+
+
+def safe_parse(x, settings=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> safe_parse (function): Function that parses a single value as datetime with dateparser, keeping missing and blank values as NaT
+
+    --------------------
+    Parameters
+    --------------------
+    -> x (object): Value to be parsed
+    -> settings (dict): Settings passed to dateparser.parse (optional)
+
+    --------------------
+    Returns
+    --------------------
+    -> (datetime): Parsed datetime or None/NaT if the value can't be parsed
+
+    """
+    # Imported here as dateparser (with its locale and timezone data) is only needed for values that don't match the candidate formats
+    import dateparser
+
+    if pd.isna(x) or str(x).strip() == "":
+        return pd.NaT  # Keep nulls as NaT
+    return dateparser.parse(str(x), settings=settings)
+
+
+def parse_unique(serie, settings=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> parse_unique (function): Function that parses a serie as datetime with dateparser, parsing each distinct value only once.
+    The serie is factorized, its unique values are parsed with safe_parse() and the results are mapped back to the rows through the integer codes,
+    so the cost depends on the number of distinct values instead of the number of rows.
+
+    --------------------
+    Parameters
+    --------------------
+    -> serie (pd.Series): Serie to be parsed
+    -> settings (dict): Settings passed to dateparser.parse (optional)
+
+    --------------------
+    Returns
+    --------------------
+    -> (pd.Series): Parsed values (None/NaT for missing, blank and unparsable values) with the same index as the serie
+
+    """
+    codes, uniques = pd.factorize(serie)
+    parsed = [safe_parse(value, settings=settings) for value in uniques]
+    # Missing values have the code -1 which picks the NaT appended at the end
+    parsed = np.array(parsed + [pd.NaT], dtype=object)
+    return pd.Series(parsed[codes], index=serie.index, name=serie.name)
+
+
+def wilson_interval(n_success, n_total, z=3.0):
+    """
+    --------------------
+    Description
+    --------------------
+    -> wilson_interval (function): Function that computes the Wilson score confidence interval of a proportion
+
+    --------------------
+    Parameters
+    --------------------
+    -> n_success (int): Number of successes
+    -> n_total (int): Number of trials
+    -> z (float): Number of standard deviations of the interval (3.0 is about 99.7% confidence)
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Lower and upper bounds of the interval
+
+    """
+    if n_total == 0:
+        return 0.0, 1.0
+    p = n_success / n_total
+    denominator = 1 + z ** 2 / n_total
+    center = (p + z ** 2 / (2 * n_total)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / n_total + z ** 2 / (4 * n_total ** 2)) / denominator
+    return center - half_width, center + half_width
+
+
+def estimate_date_ratio(serie, threshold, batch_size=50, max_sample=1000, z=3.0, random_state=0):
+    """
+    --------------------
+    Description
+    --------------------
+    -> estimate_date_ratio (function): Function that estimates the fraction of values of a serie that can be parsed as datetime by testing a bounded random sample of values.
+    Values are parsed batch by batch and the test stops as soon as the confidence interval of the fraction is entirely above or below the threshold (each of the thresholds if several are provided).
+    Missing and blank values count as non-dates, as when the whole serie is parsed.
+
+    --------------------
+    Parameters
+    --------------------
+    -> serie (pd.Series): Serie to be tested
+    -> threshold (float or tuple): Fraction(s) of dates the decision is made against
+    -> batch_size (int): Number of values parsed between two checks of the confidence interval
+    -> max_sample (int): Maximum number of values parsed
+    -> z (float): Number of standard deviations of the confidence interval
+    -> random_state (int): Seed of the random sample
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Estimated fraction of dates and number of values parsed
+
+    """
+    if serie.empty:
+        return 0.0, 0
+
+    # Random order of the rows to be tested
+    rng = np.random.default_rng(random_state)
+    positions = rng.permutation(len(serie))[:max_sample]
+
+    n_dates = 0
+    n_tested = 0
+    for start in range(0, len(positions), batch_size):
+        batch = serie.iloc[positions[start:start + batch_size]]
+        n_dates += int(parse_unique(batch).notna().sum())
+        n_tested += len(batch)
+
+        lower, upper = wilson_interval(n_dates, n_tested, z)
+        if all(lower > value or upper < value for value in np.atleast_1d(threshold)):
+            break
+
+    return n_dates / n_tested, n_tested
+
+
+def parse_with_format(strings, fmt):
+    """
+    --------------------
+    Description
+    --------------------
+    -> parse_with_format (function): Function that parses a serie of strings with a single datetime format in a vectorized way.
+    pyarrow.compute.strptime is used as it is much faster than pd.to_datetime(format=...) for non-ISO formats, with pd.to_datetime as fallback if pyarrow can't handle the format or the values.
+
+    --------------------
+    Parameters
+    --------------------
+    -> strings (pd.Series): Values to be parsed as strings
+    -> fmt (str): strftime-like datetime format
+
+    --------------------
+    Returns
+    --------------------
+    -> (np.ndarray): Parsed values as datetime64[ns], values not matching the format are set to NaT
+
+    """
+    try:
+        # Imported here as pyarrow is an optional speed-up
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        parsed = pc.strptime(pa.array(strings, type=pa.string()), format=fmt, unit="ns", error_is_null=True)
+        return parsed.to_numpy(zero_copy_only=False).astype("datetime64[ns]")
+    except Exception:
+        return pd.to_datetime(strings, format=fmt, errors='coerce').to_numpy()
+
+
+def infer_formats(strings, dayfirst=True, max_formats=3, min_share=0.05):
+    """
+    --------------------
+    Description
+    --------------------
+    -> infer_formats (function): Function that finds the dominant datetime format(s) of a sample of strings.
+    Formats are picked greedily (the one matching most of the remaining values first) until the remaining values are fewer than min_share of the sample.
+    Only day-first formats (and ISO formats) are tried when dayfirst is set, so ambiguous values such as '01/02/2020' are read day first.
+
+    --------------------
+    Parameters
+    --------------------
+    -> strings (pd.Series): Sample of non-missing values as strings
+    -> dayfirst (bool): Flag stating if days are expected before months
+    -> max_formats (int): Maximum number of formats returned
+    -> min_share (float): Minimum fraction of the sample a format must match to be returned
+
+    --------------------
+    Returns
+    --------------------
+    -> (list): Selected formats in the order they should be applied
+
+    """
+    candidates = ISO_FORMATS + (DAY_FIRST_FORMATS if dayfirst else MONTH_FIRST_FORMATS)
+    remaining = strings
+    formats = []
+    while len(formats) < max_formats and len(remaining) > min_share * len(strings):
+        best_format, best_matched = None, None
+        for fmt in candidates:
+            if fmt in formats:
+                continue
+            matched = ~np.isnat(parse_with_format(remaining, fmt))
+            if best_matched is None or matched.sum() > best_matched.sum():
+                best_format, best_matched = fmt, matched
+        if best_matched is None or best_matched.sum() < min_share * len(strings):
+            break
+        formats.append(best_format)
+        remaining = remaining[~best_matched]
+    return formats
+
+
+def convert_to_datetime(serie, dayfirst=True, sample_size=1000, random_state=0):
+    """
+    --------------------
+    Description
+    --------------------
+    -> convert_to_datetime (function): Function that converts a serie to datetime data type.
+    The dominant format(s) are inferred from a random sample of values and the bulk of the serie is parsed in a vectorized way with parse_with_format().
+    Only values matching none of these formats are parsed one by one with dateparser (days before months when dayfirst is set).
+    Each distinct value is only parsed once, so the cost depends on the number of distinct values rather than the number of rows.
+    Series that already have a datetime data type are returned unchanged.
+
+    --------------------
+    Parameters
+    --------------------
+    -> serie (pd.Series): Serie to be converted
+    -> dayfirst (bool): Flag stating if days are expected before months
+    -> sample_size (int): Number of values used to infer the formats
+    -> random_state (int): Seed of the random sample
+
+    --------------------
+    Returns
+    --------------------
+    -> (pd.Series): Converted serie, values that can't be parsed are set to NaT
+
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie
+
+    # Keep missing and blank values as NaT (rows are identified by position)
+    strings = serie.reset_index(drop=True).dropna().astype(str).str.strip()
+    strings = strings[strings != ""]
+
+    values = np.full(len(serie), np.datetime64("NaT"), dtype="datetime64[ns]")
+    if not strings.empty:
+        # Only parse each distinct value once
+        codes, uniques = pd.factorize(strings)
+        unique_strings = pd.Series(uniques, dtype=object)
+        unique_values = np.full(len(unique_strings), np.datetime64("NaT"), dtype="datetime64[ns]")
+
+        # Parse the bulk of the distinct values with the dominant formats (inferred on rows, not on distinct values)
+        sample = strings.sample(min(sample_size, len(strings)), random_state=random_state)
+        remaining = unique_strings
+        for fmt in infer_formats(sample, dayfirst=dayfirst):
+            parsed = parse_with_format(remaining, fmt)
+            matched = ~np.isnat(parsed)
+            unique_values[remaining.index[matched]] = parsed[matched]
+            remaining = remaining[~matched]
+
+        # Parse the leftover distinct values with dateparser
+        if not remaining.empty:
+            settings = dict(DMY_SETTINGS, DATE_ORDER='DMY' if dayfirst else 'MDY')
+            leftovers = pd.to_datetime(remaining.apply(safe_parse, settings=settings), errors='coerce')
+            unique_values[remaining.index] = leftovers.to_numpy()
+
+        # Map parsed distinct values back to the rows
+        values[strings.index] = unique_values[codes]
+
+    return pd.Series(values, index=serie.index, name=serie.name)
@@ -1,13 +1,68 @@
 import streamlit as st
 
 from tab_df.logics import Dataset
+from common.scheduler import profile_scheduler
 
-def display_tab_df_content(file_path):
+def load_dataset(file_path, compact=False):
     """
     --------------------
     Description
     --------------------
-    -> display_overall_df (function): Function that will instantiate tab_df.logics.Dataset class, save it into Streamlit session state and call its tab_df.logics.Dataset.set_data() method in order to compute all information to be displayed.
+    -> load_dataset (function): Function that will instantiate tab_df.logics.Dataset class, call its tab_df.logics.Dataset.set_df() method in order to load the dataframe and save it into Streamlit session state.
+    The dataset of the previous rerun is kept if it has been loaded from the same upload with the same compact option, so that the other tabs can use its dataframe without the DataFrame tab being displayed.
+
+    --------------------
+    Parameters
+    --------------------
+    -> file_path (str): File path to uploaded CSV, Parquet, Feather or Arrow IPC file
+    -> compact (bool): Flag stating if the data types of the dataframe are compacted after loading it
+
+    --------------------
+    Returns
+    --------------------
+    -> (Dataset): Loaded dataset
+
+    """
+    # Uploads are identified by their id, name and size
+    upload_key = [getattr(file_path, attr, None) for attr in ("id", "name", "size")]
+    dataset = st.session_state.get("dataset")
+    same_upload = dataset is not None and [getattr(dataset.file_path, attr, None) for attr in ("id", "name", "size")] == upload_key and dataset.compact == compact
+    if not same_upload:
+        # Instantiate Dataset class and set it into Streamlit session state
+        st.session_state["dataset"] = Dataset(file_path=file_path, compact=compact)
+
+        # Call set_df() method to load the dataframe
+        st.session_state.dataset.set_df()
+    return st.session_state.dataset
+
+
+def schedule_tab_df_content(dataset):
+    """
+    --------------------
+    Description
+    --------------------
+    -> schedule_tab_df_content (function): Function that submits to common.scheduler.profile_scheduler the call to the tab_df.logics.Dataset.set_data() method of a loaded dataset, so that it runs on a worker thread
+
+    --------------------
+    Parameters
+    --------------------
+    -> dataset (Dataset): Dataset loaded by load_dataset()
+
+    --------------------
+    Returns
+    --------------------
+    -> (concurrent.futures.Future): Future of the computation
+
+    """
+    return profile_scheduler.submit(dataset.df, "dataset_data", dataset.set_data)
+
+
+def display_tab_df_content(dataset):
+    """
+    --------------------
+    Description
+    --------------------
+    -> display_overall_df (function): Function that will wait for the tab_df.logics.Dataset.set_data() method of the dataset loaded by load_dataset(), run on a worker thread by schedule_tab_df_content(), to compute all information to be displayed.
     Then it will display a Streamlit Expander container with the following contents:
     1. the results of tab_df.logics.Dataset.get_summary() as a Streamlit Table
     2. the results of tab_df.logics.Dataset.table using Streamlit.write()
@@ -17,7 +72,7 @@ def display_tab_df_content(file_path):
     --------------------
     Parameters
     --------------------
-    -> file_path (str): File path to uploaded CSV file
+    -> dataset (Dataset): Dataset loaded by load_dataset()
 
     --------------------
     Returns
@@ -25,29 +80,30 @@ def display_tab_df_content(file_path):
     -> None
     
     """
-    
-    # Instantiate Dataset class and set it into Streamlit session state
-    st.session_state["dataset"] = Dataset(file_path=file_path)
 
-    # Call set_df() method to load the dataframe
-    st.session_state.dataset.set_df()
-
-    if st.session_state.dataset.df is None:
-        st.warning("No valid CSV loaded. Please upload a CSV file to see analysis.")
+    if dataset is None or dataset.df is None:
+        st.warning("No valid file loaded. Please upload a CSV, Parquet, Feather or Arrow IPC file to see analysis.")
         return
     
-    # Call set_data() method to compute all information
-    st.session_state.dataset.set_data()
+    # Wait for the information computed on a worker thread
+    future = schedule_tab_df_content(dataset)
+    if not future.done():
+        with st.spinner("Computing dataset information..."):
+            future.result()
+
+    # Restore the information from the cache if it has been computed for another instance of the same dataset
+    if dataset.table is None:
+        dataset.set_data()
 
     with st.expander("DataFrame Overview", expanded=True):
         # Display summary information as a table
         st.subheader("Summary Information")
-        summary_df = st.session_state.dataset.get_summary()
+        summary_df = dataset.get_summary()
         st.table(summary_df)
 
         # Display column information
         st.subheader("Columns Information")
-        st.table(st.session_state.dataset.table)
+        st.table(dataset.table)
     
     with st.expander("Explore Dataframe", expanded=True):
         
@@ -59,10 +115,10 @@ def display_tab_df_content(file_path):
 
         if method == "Head":
             # st.write("Top Rows from the Dataframe")
-            st.dataframe(st.session_state.dataset.get_head(n_rows), use_container_width=True)
+            st.dataframe(dataset.get_head(n_rows), use_container_width=True)
         elif method == "Tail":
             # st.write("Bottom Rows from the Dataframe")
-            st.dataframe(st.session_state.dataset.get_tail(n_rows), use_container_width=True)
+            st.dataframe(dataset.get_tail(n_rows), use_container_width=True)
         elif method == "Sample":
             # st.write("Random Sample of Rows from the Dataframe")
-            st.dataframe(st.session_state.dataset.get_sample(n_rows), use_container_width=True)
+            st.dataframe(dataset.get_sample(n_rows), use_container_width=True)
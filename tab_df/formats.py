@@ -0,0 +1,144 @@
+# Columnar file formats supported in addition to CSV, keyed by file extension
+COLUMNAR_EXTENSIONS = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "ipc",
+    ".ipc": "ipc",
+}
+
+# Columnar file formats keyed by MIME type
+COLUMNAR_TYPES = {
+    "application/vnd.apache.parquet": "parquet",
+    "application/x-parquet": "parquet",
+    "application/vnd.apache.arrow.file": "ipc",
+}
+
+
+def get_file_format(file):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_file_format (function): Function that finds the format of an uploaded file from its name or MIME type
+
+    --------------------
+    Parameters
+    --------------------
+    -> file (UploadedFile): Uploaded file
+
+    --------------------
+    Returns
+    --------------------
+    -> (str): Format of the file ("csv", "parquet", "feather" or "ipc") or None if it is not supported
+
+    """
+    name = str(getattr(file, "name", "")).lower()
+    file_type = getattr(file, "type", None)
+    if name.endswith(".csv") or file_type == "text/csv":
+        return "csv"
+    for extension, file_format in COLUMNAR_EXTENSIONS.items():
+        if name.endswith(extension):
+            return file_format
+    return COLUMNAR_TYPES.get(file_type)
+
+
+def is_columnar_file(file):
+    """
+    --------------------
+    Description
+    --------------------
+    -> is_columnar_file (function): Function that checks if an uploaded file is in a columnar format (Parquet, Feather or Arrow IPC)
+
+    --------------------
+    Parameters
+    --------------------
+    -> file (UploadedFile): Uploaded file
+
+    --------------------
+    Returns
+    --------------------
+    -> (bool): Flag stating if the file is in a columnar format or not
+
+    """
+    return get_file_format(file) in ("parquet", "feather", "ipc")
+
+
+def read_columnar(file, columns=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> read_columnar (function): Function that loads a Parquet, Feather or Arrow IPC file as Pandas DataFrame.
+    When a list of columns is provided, only these columns are read from the file (column projection).
+
+    --------------------
+    Parameters
+    --------------------
+    -> file (UploadedFile): Uploaded file
+    -> columns (list): Names of the columns to be read (default set to None to read all columns)
+
+    --------------------
+    Returns
+    --------------------
+    -> (pd.DataFrame): Loaded dataframe
+
+    """
+    # Imported here as pyarrow is only needed for columnar formats
+    import pyarrow.parquet as pq
+    import pyarrow.feather as feather
+
+    file.seek(0)
+    if get_file_format(file) == "parquet":
+        table = pq.read_table(file, columns=columns)
+    else:
+        # Feather V2 files are Arrow IPC files
+        table = feather.read_table(file, columns=columns)
+    file.seek(0)
+    return table.to_pandas()
+
+
+def read_schema(file):
+    """
+    --------------------
+    Description
+    --------------------
+    -> read_schema (function): Function that reads the schema of a Parquet, Feather or Arrow IPC file without loading its data and maps each column to a kind of data
+
+    --------------------
+    Parameters
+    --------------------
+    -> file (UploadedFile): Uploaded file
+
+    --------------------
+    Returns
+    --------------------
+    -> (dict): Kind of each column ("number", "text", "datetime" or "other") keyed by column name
+
+    """
+    # Imported here as pyarrow is only needed for columnar formats
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    file.seek(0)
+    if get_file_format(file) == "parquet":
+        schema = pq.read_schema(file)
+    else:
+        schema = pa.ipc.open_file(file).schema
+    file.seek(0)
+
+    kinds = {}
+    for field in schema:
+        field_type = field.type
+        if pa.types.is_dictionary(field_type):
+            field_type = field_type.value_type
+        if pa.types.is_integer(field_type) or pa.types.is_floating(field_type) or pa.types.is_decimal(field_type):
+            kinds[field.name] = "number"
+        elif pa.types.is_string(field_type) or pa.types.is_large_string(field_type):
+            kinds[field.name] = "text"
+        elif pa.types.is_timestamp(field_type) or pa.types.is_date(field_type):
+            kinds[field.name] = "datetime"
+        else:
+            kinds[field.name] = "other"
+    return kinds
+
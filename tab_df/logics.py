@@ -1,6 +1,15 @@
+import os
 import pandas as pd
+import numpy as np
 import csv
 
+from common.cache import parse_cache, make_key
+from tab_df.parallel import read_csv_parallel, PARALLEL_MIN_BYTES
+from tab_df.formats import get_file_format, read_columnar
+from common.sketches import HyperLogLog, HeavyHitters, QuantileSketch
+from common.schema import get_schema, get_storage
+from common.files import open_file, close_file
+
 class Dataset:
     """
     --------------------
@@ -11,7 +20,7 @@ class Dataset:
     --------------------
     Attributes
     --------------------
-    -> file_path (str): Path to the uploaded CSV file (mandatory)
+    -> file_path (str): Path to the uploaded CSV, Parquet, Feather or Arrow IPC file, local paths being opened with common.files.open_file() (mandatory)
     -> df (pd.Dataframe): Pandas dataframe (default set to None)
     -> cols_list (list): List of columns names of dataset (default set to empty list)
     -> n_rows (int): Number of rows of dataset (default set to 0)
@@ -21,9 +30,25 @@ class Dataset:
     -> n_num_cols (int): Number of columns that are numeric type (default set to 0)
     -> n_text_cols (int): Number of columns that are text type (default set to 0)
     -> table (pd.Series): Pandas DataFrame containing the list of columns, their data types and memory usage from dataframe (default set to None)
+    -> cache (common.cache.ParseCache): Cache holding parsed dataframes and computed information between Streamlit reruns (default set to the process-wide cache)
+    -> cache_key (tuple): Key of the uploaded file in the cache, built from its content hash and detected dialect (default set to None)
+    -> n_workers (int): Number of CPU cores used to parse files bigger than tab_df.parallel.PARALLEL_MIN_BYTES (default set to the number of CPU cores)
+    -> chunked (bool): Flag stating if information has been computed by reading the file chunk by chunk with set_data_chunked() instead of loading self.df (default set to False)
+    -> preview_head (pd.DataFrame): First rows of dataset kept when reading the file chunk by chunk (default set to None)
+    -> preview_tail (pd.DataFrame): Last rows of dataset kept when reading the file chunk by chunk (default set to None)
+    -> preview_sample (pd.DataFrame): Random sample of rows of dataset kept when reading the file chunk by chunk (default set to None)
+    -> compact (bool): Flag stating if data types of self.df are compacted right after loading it (default set to False)
+    -> max_cardinality (float): Maximum ratio of unique values over non-missing values for a text column to be converted to category type during compaction (default set to 0.5)
+    -> memory_before (dict): Memory usage of each column before compaction (default set to None)
+    -> column_sketches (dict): Distinct count (common.sketches.HyperLogLog), most frequent values (common.sketches.HeavyHitters) and, for numeric columns, quantiles (common.sketches.QuantileSketch) sketches of each column, fed chunk by chunk by set_data_chunked() (default set to None)
     """
-    def __init__(self, file_path):
-        self.file_path = file_path
+    # Attributes computed by set_data() that are kept in the cache
+    data_attributes = ["cols_list", "n_rows", "n_cols", "n_duplicates", "n_missing", "n_num_cols", "n_text_cols", "table", "memory_before"]
+    # Previews and column sketches kept in the cache when reading the file chunk by chunk
+    preview_attributes = ["preview_head", "preview_tail", "preview_sample", "chunked", "column_sketches"]
+
+    def __init__(self, file_path, cache=parse_cache, n_workers=None, compact=False, max_cardinality=0.5):
+        self.file_path = open_file(file_path)
         self.df = None
         self.cols_list = []
         self.n_rows = 0
@@ -33,13 +58,25 @@ class Dataset:
         self.n_num_cols = 0
         self.n_text_cols = 0
         self.table = None
+        self.cache = cache
+        self.cache_key = None
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.chunked = False
+        self.preview_head = None
+        self.preview_tail = None
+        self.preview_sample = None
+        self.compact = compact
+        self.max_cardinality = max_cardinality
+        self.memory_before = None
+        self.column_sketches = None
 
     def set_data(self):
         """
         --------------------
         Description
         --------------------
-        -> set_data (method): Class method that computes all requested information from self.df to be displayed in the Dataframe tab of Streamlit app 
+        -> set_data (method): Class method that computes all requested information from self.df to be displayed in the Dataframe tab of Streamlit app.
+        If these information have already been computed for the same file, they are restored from the cache instead.
 
         --------------------
         Parameters
@@ -52,6 +89,13 @@ class Dataset:
         -> None
         """
         if not self.is_df_none():
+            # Restore computed information from the cache if available
+            entry = self.cache.get(self.cache_key) if self.cache_key is not None else None
+            if entry is not None and entry["data"] is not None:
+                for attr, value in entry["data"].items():
+                    setattr(self, attr, value)
+                return
+
             self.set_columns()
             self.set_dimensions()
             self.set_duplicates()
@@ -59,13 +103,20 @@ class Dataset:
             self.set_numeric()
             self.set_text()
             self.set_table()
-        
+
+            # Save computed information into the cache
+            if entry is not None:
+                entry["data"] = {attr: getattr(self, attr) for attr in self.data_attributes}
+
     def set_df(self):
         """
         --------------------
         Description
         --------------------
-        -> set_df (method): Class method that will load the uploaded CSV file as Pandas DataFrame and store it as attribute (self.df) if it hasn't been provided before.
+        -> set_df (method): Class method that will load the uploaded CSV, Parquet, Feather or Arrow IPC file as Pandas DataFrame and store it as attribute (self.df) if it hasn't been provided before.
+        The parsed dataframe is looked up in the cache first (using the content hash of the file and the detected delimiter or format) so that the file is only parsed once.
+        Files bigger than tab_df.parallel.PARALLEL_MIN_BYTES are parsed on self.n_workers CPU cores with tab_df.parallel.read_csv_parallel().
+        If self.compact is set, the data types of the loaded dataframe are then compacted with compact_df().
 
         --------------------
         Parameters
@@ -80,32 +131,270 @@ class Dataset:
         """
 
         # Check file type
-        if not (self.file_path.name.endswith('.csv') or self.file_path.type == 'text/csv'):
-            self.df = None
-            return
-    
-
-        # Check file type
-        if not (self.file_path.name.endswith('.csv') or self.file_path.type == 'text/csv'):
+        file_format = get_file_format(self.file_path)
+        if file_format is None:
             self.df = None
             return
     
         if self.df is None:
-            # Try to automatically detect the delimiter
-            sample = self.file_path.read(2048).decode("utf-8")
-            # Reset file pointer to the beginning
-            self.file_path.seek(0)
-
-            try:
-                # Sniff the dialect
-                dialect = csv.Sniffer().sniff(sample, delimiters=[",", ";", "\t", "|"])
-                sep = dialect.delimiter
-            except Exception:
-                sep = ","  # fallback default
-
-            self.df = pd.read_csv(self.file_path, sep=sep)
+            if file_format == "csv":
+                # Try to automatically detect the delimiter
+                sep = self.sniff_delimiter()
+                dialect = (sep,)
+            else:
+                dialect = (file_format,)
+            if self.compact:
+                dialect += ("compact", self.max_cardinality)
+
+            # Look for the parsed dataframe in the cache
+            self.cache_key = make_key(self.cache.get_file_hash(self.file_path), dialect)
+            entry = self.cache.get(self.cache_key)
+            if entry is not None:
+                self.df = entry["df"]
+                print("Dataframe loaded from cache.")
+                return
+
+            # Parse big files on several CPU cores
+            file_size = getattr(self.file_path, "size", 0)
+            if file_format != "csv":
+                self.df = read_columnar(self.file_path)
+            elif self.n_workers > 1 and file_size >= PARALLEL_MIN_BYTES:
+                self.df = read_csv_parallel(self.file_path, sep=sep, n_workers=self.n_workers)
+            else:
+                self.df = pd.read_csv(self.file_path, sep=sep)
             print("Dataframe loaded successfully.")
 
+            # Reduce memory usage of the loaded dataframe
+            if self.compact:
+                self.compact_df()
+
+            # Save the parsed dataframe into the cache
+            self.cache.put(self.cache_key, {"df": self.df, "data": None}, int(self.df.memory_usage(deep=True).sum()))
+
+    def compact_df(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> compact_df (method): Class method that reduces the memory usage of self.df and stores the memory usage of each column before compaction in the relevant attribute (self.memory_before) if self.df is not empty nor None.
+        Integer columns are downcast to the smallest integer type holding their values, float columns are downcast to float32 only when no value changes,
+        text columns with a ratio of unique values below self.max_cardinality are converted to category type and the other text columns are converted to Arrow-backed strings.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        if not self.is_df_none():
+            self.memory_before = {col: int(self.df[col].memory_usage(deep=True)) for col in self.df.columns}
+
+            compacted = self.df.copy(deep=False)
+            for col in self.df.columns:
+                serie = self.df[col]
+                if pd.api.types.is_integer_dtype(serie):
+                    compacted[col] = pd.to_numeric(serie, downcast="integer")
+                elif pd.api.types.is_float_dtype(serie):
+                    downcast = serie.astype("float32")
+                    # Only keep float32 if it is lossless
+                    if np.array_equal(downcast.to_numpy(dtype="float64"), serie.to_numpy(dtype="float64"), equal_nan=True):
+                        compacted[col] = downcast
+                elif pd.api.types.is_object_dtype(serie):
+                    n_values = serie.notna().sum()
+                    if n_values > 0 and serie.nunique() <= self.max_cardinality * n_values:
+                        compacted[col] = serie.astype("category")
+                    elif pd.api.types.infer_dtype(serie, skipna=True) == "string":
+                        compacted[col] = serie.astype("string[pyarrow]")
+            self.df = compacted
+
+    def is_csv_file(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> is_csv_file (method): Class method that checks if the uploaded file is a CSV file
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (bool): Flag stating if the uploaded file is a CSV file or not
+
+        """
+        return get_file_format(self.file_path) == "csv"
+
+    def sniff_delimiter(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> sniff_delimiter (method): Class method that detects the delimiter of the uploaded CSV file from its first bytes using csv.Sniffer (defaults to ",")
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (str): Detected delimiter
+
+        """
+        sample = self.file_path.read(2048).decode("utf-8")
+        # Reset file pointer to the beginning
+        self.file_path.seek(0)
+
+        try:
+            # Sniff the dialect
+            dialect = csv.Sniffer().sniff(sample, delimiters=[",", ";", "\t", "|"])
+            sep = dialect.delimiter
+        except Exception:
+            sep = ","  # fallback default
+        return sep
+
+    def set_data_chunked(self, chunksize=100000, preview_rows=50):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_data_chunked (method): Class method that computes all requested information to be displayed in the Dataframe tab of Streamlit app by reading the uploaded CSV file chunk by chunk, without ever loading it entirely as self.df.
+        Row counts, rows with missing values and per-column data types and memory usage are aggregated over the chunks while duplicated rows are found with a set of 64-bit row hashes.
+        Only the first, last and a random sample of rows are kept in memory to be returned by get_head(), get_tail() and get_sample().
+        The distinct count and most frequent values sketches of each column are fed with every chunk, so get_frequent() works on files that don't fit in memory.
+
+        --------------------
+        Parameters
+        --------------------
+        -> chunksize (int): Number of rows read at a time
+        -> preview_rows (int): Number of rows kept for the head, tail and sample previews
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        if not self.is_csv_file():
+            return
+
+        sep = self.sniff_delimiter()
+
+        # Restore computed information from the cache if available
+        self.cache_key = make_key(self.cache.get_file_hash(self.file_path), (sep, "chunked"))
+        entry = self.cache.get(self.cache_key)
+        if entry is not None:
+            for attr, value in entry["data"].items():
+                setattr(self, attr, value)
+            return
+
+        n_rows = 0
+        n_missing = 0
+        n_duplicates = 0
+        dtypes = {}
+        memory = {}
+        sketches = {}
+        seen_hashes = set()
+        head = tail = sample = None
+
+        for chunk in pd.read_csv(self.file_path, sep=sep, chunksize=chunksize):
+            n_rows += len(chunk)
+            n_missing += int(chunk.isnull().any(axis=1).sum())
+
+            # Hash rows with numeric values as float so that a column read as int in a chunk and as float in another one gives the same hashes
+            hashed = chunk.copy()
+            num_cols = hashed.select_dtypes(include=['number']).columns
+            hashed[num_cols] = hashed[num_cols].astype("float64")
+            chunk_hashes = pd.util.hash_pandas_object(hashed, index=False).tolist()
+            unique_hashes = set(chunk_hashes)
+            # Rows repeated inside the chunk and rows already seen in previous chunks
+            n_duplicates += len(chunk_hashes) - len(unique_hashes) + len(unique_hashes & seen_hashes)
+            seen_hashes |= unique_hashes
+
+            # Merge data types and memory usage of each column
+            for col in chunk.columns:
+                dtype = chunk[col].dtype
+                if col not in dtypes:
+                    dtypes[col] = dtype
+                elif dtypes[col] != dtype:
+                    both_numeric = pd.api.types.is_numeric_dtype(dtypes[col]) and pd.api.types.is_numeric_dtype(dtype)
+                    dtypes[col] = np.result_type(dtypes[col], dtype) if both_numeric else np.dtype("object")
+                memory[col] = memory.get(col, 0) + int(chunk[col].memory_usage(index=False, deep=True))
+
+                # Feed the sketches of the column
+                if col not in sketches:
+                    sketches[col] = {"distinct": HyperLogLog(), "frequent": HeavyHitters()}
+                sketches[col]["distinct"].update(chunk[col])
+                sketches[col]["frequent"].update(chunk[col])
+                if pd.api.types.is_numeric_dtype(dtype):
+                    sketches[col].setdefault("quantiles", QuantileSketch()).update(chunk[col])
+
+            # Keep the first rows, the last rows and a uniform random sample of rows (rows with the smallest random keys)
+            if head is None or len(head) < preview_rows:
+                head = pd.concat([head, chunk]).head(preview_rows)
+            tail = pd.concat([tail, chunk]).tail(preview_rows)
+            keyed = chunk.assign(_sample_key=np.random.random_sample(len(chunk)))
+            sample = pd.concat([sample, keyed]).nsmallest(preview_rows, "_sample_key")
+
+        if n_rows == 0:
+            return
+
+        self.cols_list = list(dtypes.keys())
+        self.n_rows = n_rows
+        self.n_cols = len(self.cols_list)
+        self.n_duplicates = n_duplicates
+        self.n_missing = n_missing
+        # Columns are counted with the same data type rule as the schema used for loaded dataframes (booleans aren't numeric), text columns can't be tested as dates without the dataframe
+        storages = [get_storage(dtype) for dtype in dtypes.values()]
+        self.n_num_cols = storages.count("number")
+        self.n_text_cols = storages.count("text")
+        self.table = pd.DataFrame({
+            "Column": self.cols_list,
+            "Data Type": [str(dtype) for dtype in dtypes.values()],
+            "Memory Usage": list(memory.values())
+        })
+        self.preview_head = head
+        self.preview_tail = tail
+        self.preview_sample = sample.drop(columns="_sample_key").sort_index()
+        self.column_sketches = sketches
+        self.chunked = True
+
+        # Save computed information into the cache
+        data = {attr: getattr(self, attr) for attr in self.data_attributes + self.preview_attributes}
+        n_bytes = sum(int(preview.memory_usage(deep=True).sum()) for preview in [head, tail, sample])
+        self.cache.put(self.cache_key, {"df": None, "data": data}, n_bytes)
+
+    def close_file(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> close_file (method): Class method that closes the file opened from a local path (see common.files.close_file()) once the data has been loaded, so that profiling many files doesn't leak file descriptors.
+        The cached data remains available, but set_df(), set_data() and set_data_chunked() can't read the file again.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        close_file(self.file_path)
+
+
     def is_df_none(self):
         """
         --------------------
@@ -222,7 +511,7 @@ class Dataset:
         --------------------
         Description
         --------------------
-        -> set_numeric (method): Class method that computes the number of columns that are numeric type and store the results in the relevant attribute (self.n_num_cols) if self.df is not empty nor None 
+        -> set_numeric (method): Class method that computes the number of columns that are numeric type, read from the schema shared by all tabs (see common.schema.get_schema()), and store the results in the relevant attribute (self.n_num_cols) if self.df is not empty nor None 
         
         --------------------
         Parameters
@@ -236,7 +525,7 @@ class Dataset:
 
         """
         if not self.is_df_none():
-            self.n_num_cols = self.df.select_dtypes(include = ['number']).shape[1]
+            self.n_num_cols = len(get_schema(self.df).get_numeric_cols())
         
 
     def set_text(self):
@@ -244,7 +533,7 @@ class Dataset:
         --------------------
         Description
         --------------------
-        -> set_text (method): Class method that computes the number of columns that are text type and store the results in the relevant attribute (self.n_text_cols) if self.df is not empty nor None 
+        -> set_text (method): Class method that computes the number of columns that are text type, read from the schema shared by all tabs (see common.schema.get_schema()), and store the results in the relevant attribute (self.n_text_cols) if self.df is not empty nor None 
         
         --------------------
         Parameters
@@ -258,9 +547,56 @@ class Dataset:
 
         """
         if not self.is_df_none():
-            self.n_text_cols = self.df.select_dtypes(include = ['object', 'string']).shape[1]
+            self.n_text_cols = len(get_schema(self.df).get_storage_cols("text"))
         
 
+    def get_frequent(self, col_name, end=20):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_frequent (method): Class method that computes the Dataframe containing the most frequent values of a column from the sketches fed by set_data_chunked(), with error bounds on the occurrences and percentages
+
+        --------------------
+        Parameters
+        --------------------
+        -> col_name (str): Name of the column
+        -> end (int): Maximum number of values to be returned
+
+        --------------------
+        Returns
+        --------------------
+        -> (pd.DataFrame): Dataframe with the columns value, occurrence, percentage, occurrence_error and percentage_error (None if the column has no sketch)
+
+        """
+        if self.column_sketches is not None and col_name in self.column_sketches:
+            return self.column_sketches[col_name]["frequent"].get_top(end)
+
+
+    def get_quantiles(self, col_name, quantiles=(0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_quantiles (method): Class method that estimates quantiles of a numeric column from the sketches fed by set_data_chunked()
+
+        --------------------
+        Parameters
+        --------------------
+        -> col_name (str): Name of the column
+        -> quantiles (tuple): Quantiles to be estimated, between 0 and 1
+
+        --------------------
+        Returns
+        --------------------
+        -> (dict): Estimated value of each quantile keyed by quantile (None if the column has no quantile sketch)
+
+        """
+        if self.column_sketches is not None and "quantiles" in self.column_sketches.get(col_name, {}):
+            values = self.column_sketches[col_name]["quantiles"].get_quantiles(list(quantiles))
+            return dict(zip(quantiles, values))
+
+
     def get_head(self, n=5):
         """
         --------------------
@@ -281,6 +617,8 @@ class Dataset:
         """
         if not self.is_df_none():
             return self.df.head(n)
+        elif self.chunked:
+            return self.preview_head.head(n)
         
 
     def get_tail(self, n=5):
@@ -303,6 +641,8 @@ class Dataset:
         """
         if not self.is_df_none():
             return self.df.tail(n)
+        elif self.chunked:
+            return self.preview_tail.tail(n)
         
 
     def get_sample(self, n=5):
@@ -325,6 +665,8 @@ class Dataset:
         """
         if not self.is_df_none():
             return self.df.sample(n)
+        elif self.chunked:
+            return self.preview_sample.sample(min(n, len(self.preview_sample)))
         
 
 
@@ -333,7 +675,7 @@ class Dataset:
         --------------------
         Description
         --------------------
-        -> set_table (method): Class method that computes the Dataframe containing the list of columns with their data types and memory usage and store the results in the relevant attribute (self.table) if self.df is not empty nor None
+        -> set_table (method): Class method that computes the Dataframe containing the list of columns with their data types and memory usage (before and after compaction if compact_df() has been called) and store the results in the relevant attribute (self.table) if self.df is not empty nor None
 
         --------------------
         Parameters
@@ -352,6 +694,9 @@ class Dataset:
                 "Data Type": [str(dtype) for dtype in self.df.dtypes],
                 "Memory Usage": [self.df[col].memory_usage(deep=True) for col in self.df.columns]
             }
+            # Add memory usage before compaction if data types have been compacted
+            if self.memory_before is not None:
+                info["Memory Usage Before Compaction"] = [self.memory_before[col] for col in self.df.columns]
             self.table = pd.DataFrame(info)
 
 
@@ -368,7 +713,7 @@ class Dataset:
         -> (pd.DataFrame): Formatted dataframe to be displayed on the Streamlit app
 
         """
-        if not self.is_df_none():
+        if not self.is_df_none() or self.chunked:
             summary_dict = {
                 "Description": [
                     "Number of Rows",
@@ -0,0 +1,244 @@
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+# Files smaller than this size (in bytes) are parsed on a single core as the process pool overhead is not worth it
+PARALLEL_MIN_BYTES = 64 * 1024 ** 2
+
+# Content of the file being parsed, set in each worker process by init_worker()
+_data = None
+
+
+def init_worker(data):
+    """
+    --------------------
+    Description
+    --------------------
+    -> init_worker (function): Function that stores the content of the file being parsed in each worker process of the pool.
+    With the fork start method the content is inherited from the parent process instead of being copied for each byte range.
+
+    --------------------
+    Parameters
+    --------------------
+    -> data (bytes): Content of the CSV file
+
+    --------------------
+    Returns
+    --------------------
+    -> None
+
+    """
+    global _data
+    _data = data
+
+
+def find_record_end(data, start, n_quotes, quotechar=b'"'):
+    """
+    --------------------
+    Description
+    --------------------
+    -> find_record_end (function): Function that finds the end of the first record finishing at or after the start position, i.e. the first newline that is not inside a quoted field.
+    A newline is outside of quoted fields when an even number of quote characters has been seen since the beginning of the file (escaped quotes are doubled so they don't change the parity).
+
+    --------------------
+    Parameters
+    --------------------
+    -> data (bytes): Content of the CSV file
+    -> start (int): Position from which the newline is searched
+    -> n_quotes (int): Number of quote characters found before the start position
+    -> quotechar (bytes): Quote character of the CSV dialect
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Position right after the newline (or the size of the file if there is none) and number of quote characters found before that position
+
+    """
+    position = start
+    while True:
+        newline = data.find(b"\n", position)
+        if newline == -1:
+            return len(data), n_quotes + data.count(quotechar, position)
+        n_quotes += data.count(quotechar, position, newline)
+        position = newline + 1
+        if n_quotes % 2 == 0:
+            return position, n_quotes
+
+
+def find_byte_ranges(data, n_parts, quotechar=b'"'):
+    """
+    --------------------
+    Description
+    --------------------
+    -> find_byte_ranges (function): Function that splits the content of a CSV file into byte ranges of similar size that start and end on record boundaries, so that quoted fields spanning several lines are never cut in two.
+    The first range starts right after the header line.
+
+    --------------------
+    Parameters
+    --------------------
+    -> data (bytes): Content of the CSV file
+    -> n_parts (int): Number of byte ranges wanted
+    -> quotechar (bytes): Quote character of the CSV dialect
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): End position of the header and list of (start, end) byte ranges
+
+    """
+    header_end, n_quotes = find_record_end(data, 0, 0, quotechar)
+    body_size = len(data) - header_end
+    bounds = [header_end]
+    position = header_end
+
+    for i in range(1, n_parts):
+        target = header_end + i * body_size // n_parts
+        if target <= position:
+            continue
+        # Count quotes up to the target then move to the next record boundary
+        n_quotes += data.count(quotechar, position, target)
+        position, n_quotes = find_record_end(data, target, n_quotes, quotechar)
+        if position >= len(data):
+            break
+        bounds.append(position)
+
+    bounds.append(len(data))
+    ranges = [(start, end) for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+    return header_end, ranges
+
+
+def parse_byte_range(start, end, sep, names, quotechar, usecols=None, dtype=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> parse_byte_range (function): Function run by the worker processes that parses a byte range of the CSV file as a Pandas DataFrame
+
+    --------------------
+    Parameters
+    --------------------
+    -> start (int): Start position of the byte range
+    -> end (int): End position of the byte range
+    -> sep (str): Delimiter of the CSV file
+    -> names (list): Columns names read from the header
+    -> quotechar (str): Quote character of the CSV dialect
+    -> usecols (list): Names of the columns to be parsed (default set to None for all columns)
+    -> dtype (type): Data type of the parsed columns (default set to None to infer it)
+
+    --------------------
+    Returns
+    --------------------
+    -> (pd.DataFrame): Parsed rows of the byte range
+
+    """
+    return pd.read_csv(io.BytesIO(_data[start:end]), sep=sep, header=None, names=names, quotechar=quotechar, usecols=usecols, dtype=dtype)
+
+
+def get_value_kind(serie):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_value_kind (function): Function that tells which kind of values pd.read_csv() inferred for a column of a byte range
+
+    --------------------
+    Parameters
+    --------------------
+    -> serie (pd.Series): Column parsed from a byte range
+
+    --------------------
+    Returns
+    --------------------
+    -> (str): "empty" (only missing values), "number" (integers and floats), "boolean" or "text"
+
+    """
+    if serie.isna().all():
+        return "empty"
+    if pd.api.types.is_bool_dtype(serie) or pd.api.types.infer_dtype(serie, skipna=True) == "boolean":
+        return "boolean"
+    if pd.api.types.is_numeric_dtype(serie):
+        return "number"
+    return "text"
+
+
+def find_mixed_columns(chunks):
+    """
+    --------------------
+    Description
+    --------------------
+    -> find_mixed_columns (function): Function that lists the columns whose values were inferred as different kinds in different byte ranges.
+    pd.concat gives the same result as a single pd.read_csv for the other columns (integers and floats are upcast to floats, missing values fit any kind),
+    whereas a single pd.read_csv would keep the raw strings of all the values of the mixed columns (e.g. "000" instead of 0 when another range contains text).
+
+    --------------------
+    Parameters
+    --------------------
+    -> chunks (list): Dataframes parsed from the byte ranges
+
+    --------------------
+    Returns
+    --------------------
+    -> (list): Names of the mixed columns
+
+    """
+    mixed = []
+    for col in chunks[0].columns:
+        kinds = {get_value_kind(chunk[col]) for chunk in chunks} - {"empty"}
+        if len(kinds) > 1:
+            mixed.append(col)
+    return mixed
+
+
+def read_csv_parallel(file, sep=",", n_workers=None, quotechar='"'):
+    """
+    --------------------
+    Description
+    --------------------
+    -> read_csv_parallel (function): Function that loads a CSV file as Pandas DataFrame using several CPU cores.
+    The file is split into record-aligned byte ranges that are parsed in a process pool and then concatenated in order.
+    Columns whose values are inferred as different kinds in different ranges (see find_mixed_columns()) are parsed again as strings in every range, so the dataframe is the same as with a single pd.read_csv.
+
+    --------------------
+    Parameters
+    --------------------
+    -> file (file-like): Binary file-like object of the CSV file (e.g. Streamlit UploadedFile)
+    -> sep (str): Delimiter of the CSV file (as detected by csv.Sniffer)
+    -> n_workers (int): Number of worker processes (default set to the number of CPU cores)
+    -> quotechar (str): Quote character of the CSV dialect
+
+    --------------------
+    Returns
+    --------------------
+    -> (pd.DataFrame): Loaded dataframe
+
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    if hasattr(file, "getvalue"):
+        data = file.getvalue()
+    else:
+        file.seek(0)
+        data = file.read()
+        file.seek(0)
+
+    header_end, ranges = find_byte_ranges(data, n_workers, quotechar.encode())
+    header = pd.read_csv(io.BytesIO(data[:header_end]), sep=sep, quotechar=quotechar, nrows=0)
+    names = header.columns.tolist()
+    if len(ranges) <= 1:
+        return pd.read_csv(io.BytesIO(data), sep=sep, quotechar=quotechar)
+
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=init_worker, initargs=(data,)) as executor:
+        futures = [executor.submit(parse_byte_range, start, end, sep, names, quotechar) for start, end in ranges]
+        chunks = [future.result() for future in futures]
+
+        # Parse again the mixed columns as strings, as a single pd.read_csv falls back to the raw strings for them
+        mixed = find_mixed_columns(chunks)
+        if mixed:
+            futures = [executor.submit(parse_byte_range, start, end, sep, names, quotechar, mixed, str) for start, end in ranges]
+            for chunk, future in zip(chunks, futures):
+                text = future.result()
+                for col in mixed:
+                    chunk[col] = text[col]
+
+    return pd.concat(chunks, ignore_index=True)
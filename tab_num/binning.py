@@ -0,0 +1,88 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+
+def nice_bins(col_min, col_max, maxbins=30, base=10, divide=(5, 2)):
+    """
+    --------------------
+    Description
+    --------------------
+    -> nice_bins (function): Function that computes the start, stop and step of histogram bins with the same algorithm as Vega (used by Altair for alt.Bin(maxbins=...)),
+    so that pre-binned histograms look the same as the ones binned in the browser.
+
+    --------------------
+    Parameters
+    --------------------
+    -> col_min (float): Minimum value of the data
+    -> col_max (float): Maximum value of the data
+    -> maxbins (int): Maximum number of bins
+    -> base (int): Number base used to choose the step
+    -> divide (tuple): Scale factors used to decrease the step
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Start, stop and step of the bins
+
+    """
+    log_base = math.log(base)
+    span = (col_max - col_min) or abs(col_min) or 1
+
+    # Largest power of the base giving less than maxbins bins, then refined with the scale factors
+    level = math.ceil(math.log(maxbins) / log_base)
+    step = max(0, base ** (round(math.log(span) / log_base) - level))
+    while math.ceil(span / step) > maxbins:
+        step *= base
+    for factor in divide:
+        value = step / factor
+        if span / value <= maxbins:
+            step = value
+
+    # Round start and stop to the step
+    value = math.log(step)
+    precision = 0 if value >= 0 else int(-value / log_base) + 1
+    eps = base ** (-precision - 1)
+    value = math.floor(col_min / step + eps) * step
+    start = value - step if col_min < value else value
+    stop = math.ceil(col_max / step) * step
+    if stop == start:
+        stop = start + step
+    return start, stop, step
+
+
+def compute_histogram(serie, maxbins=30):
+    """
+    --------------------
+    Description
+    --------------------
+    -> compute_histogram (function): Function that counts the values of a numeric serie in each bin, using the bins computed by nice_bins().
+    Missing and infinite values are ignored.
+
+    --------------------
+    Parameters
+    --------------------
+    -> serie (pd.Series): Numeric serie
+    -> maxbins (int): Maximum number of bins
+
+    --------------------
+    Returns
+    --------------------
+    -> (pd.DataFrame): Dataframe with one row per bin and the columns bin_start, bin_end and count
+
+    """
+    values = serie.to_numpy(dtype="float64", na_value=np.nan)
+    values = values[np.isfinite(values)]
+    if values.size == 0:
+        return pd.DataFrame(columns=["bin_start", "bin_end", "count"])
+
+    start, stop, step = nice_bins(values.min(), values.max(), maxbins=maxbins)
+    n_bins = max(1, int(round((stop - start) / step)))
+
+    # Values equal to the stop fall into the last bin, as in Vega
+    positions = np.floor((values - start) / step + 1e-14).astype("int64")
+    counts = np.bincount(np.clip(positions, 0, n_bins - 1), minlength=n_bins)
+
+    edges = start + step * np.arange(n_bins + 1)
+    return pd.DataFrame({"bin_start": edges[:-1], "bin_end": edges[1:], "count": counts})
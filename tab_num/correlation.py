@@ -0,0 +1,271 @@
+import numpy as np
+import pandas as pd
+
+from common.frequency import get_column_result
+
+
+def pairwise_pearson(left, right, min_periods=2):
+    """
+    --------------------
+    Description
+    --------------------
+    -> pairwise_pearson (function): Function that computes the Pearson correlation between every column of two 2-D float arrays, using for each pair only the rows where both values are present.
+    The counts, sums, sums of squares and cross products over the pairwise complete rows are all obtained with matrix products between the values (missing values set to 0) and the masks of present values.
+
+    --------------------
+    Parameters
+    --------------------
+    -> left (np.ndarray): Values of a block of columns (rows x columns, missing values as NaN)
+    -> right (np.ndarray): Values of another block of columns with the same rows
+    -> min_periods (int): Minimum number of pairwise complete rows, correlations with fewer rows are set to NaN
+
+    --------------------
+    Returns
+    --------------------
+    -> (np.ndarray): Correlations with one row per column of left and one column per column of right
+
+    """
+    left_mask = ~np.isnan(left)
+    right_mask = ~np.isnan(right)
+    left_values = np.where(left_mask, left, 0.0)
+    right_values = np.where(right_mask, right, 0.0)
+    left_mask = left_mask.astype("float64")
+    right_mask = right_mask.astype("float64")
+
+    # Statistics of each pair of columns over their pairwise complete rows
+    n_pairs = left_mask.T @ right_mask
+    left_sums = left_values.T @ right_mask
+    right_sums = left_mask.T @ right_values
+    left_squares = (left_values * left_values).T @ right_mask
+    right_squares = left_mask.T @ (right_values * right_values)
+    products = left_values.T @ right_values
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        covariances = products - left_sums * right_sums / n_pairs
+        left_variances = left_squares - left_sums * left_sums / n_pairs
+        right_variances = right_squares - right_sums * right_sums / n_pairs
+        correlations = covariances / np.sqrt(left_variances * right_variances)
+
+    # Rounding errors can give values slightly outside [-1, 1]
+    correlations = np.clip(correlations, -1.0, 1.0)
+    correlations[n_pairs < min_periods] = np.nan
+    return correlations
+
+
+def compute_correlation(df, method="pearson", block_size=64, sample_rows=None, random_state=0, min_periods=2, columns=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> compute_correlation (function): Function that computes the correlation matrix of the numeric columns of a dataframe, block of columns by block of columns, with pairwise handling of missing values.
+    Only blocks on and above the diagonal are computed and the matrix is filled by symmetry, so memory is bounded by the size of two blocks of columns.
+    Values are centered on their column mean first to limit rounding errors. Spearman correlation is the Pearson correlation of the ranks of each column
+    (ranks are computed once per column on its non-missing values, rather than once per pair as df.corr(method="spearman") does).
+
+    --------------------
+    Parameters
+    --------------------
+    -> df (pd.DataFrame): Dataframe with numeric columns only, unless columns is provided
+    -> method (str): Correlation method ("pearson" or "spearman")
+    -> block_size (int): Number of columns processed at a time
+    -> sample_rows (int): Maximum number of rows used, taken at random (default set to None to use all rows)
+    -> random_state (int): Seed of the random sample of rows
+    -> min_periods (int): Minimum number of pairwise complete rows for a correlation to be computed
+    -> columns (list): Names of the numeric columns to be correlated, selected after sampling the rows so that they aren't copied at full length (default set to None to use all columns of df)
+
+    --------------------
+    Returns
+    --------------------
+    -> (pd.DataFrame): Correlation matrix with the correlated columns as index and columns
+
+    """
+    if method not in ("pearson", "spearman"):
+        raise ValueError(f"Unknown correlation method: {method}")
+
+    columns = df.columns if columns is None else pd.Index(columns)
+    if sample_rows is not None and len(df) > sample_rows:
+        # Take the sampled rows and the columns at once, the same rows as df.sample(sample_rows, random_state=random_state)
+        rows = np.random.RandomState(random_state).choice(len(df), size=sample_rows, replace=False)
+        df = df.iloc[np.sort(rows), df.columns.get_indexer(columns)]
+    else:
+        df = df[columns]
+    if method == "spearman":
+        df = df.rank(method="average")
+
+    values = df.to_numpy(dtype="float64", na_value=np.nan)
+    with np.errstate(invalid="ignore"):
+        values = values - np.nanmean(values, axis=0) if len(values) else values
+
+    n_cols = values.shape[1]
+    matrix = np.full((n_cols, n_cols), np.nan)
+    for start in range(0, n_cols, block_size):
+        left = values[:, start:start + block_size]
+        for other_start in range(start, n_cols, block_size):
+            right = values[:, other_start:other_start + block_size]
+            block = pairwise_pearson(left, right, min_periods=min_periods)
+            matrix[start:start + left.shape[1], other_start:other_start + right.shape[1]] = block
+            matrix[other_start:other_start + right.shape[1], start:start + left.shape[1]] = block.T
+    return pd.DataFrame(matrix, index=df.columns, columns=df.columns)
+
+
+def get_top_pairs(matrix, n_pairs=20):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_top_pairs (function): Function that finds the pairs of distinct columns with the highest absolute correlation
+
+    --------------------
+    Parameters
+    --------------------
+    -> matrix (pd.DataFrame): Correlation matrix
+    -> n_pairs (int): Maximum number of pairs returned
+
+    --------------------
+    Returns
+    --------------------
+    -> (pd.DataFrame): Dataframe with the columns column_1, column_2 and correlation, sorted by decreasing absolute correlation
+
+    """
+    rows, cols = np.triu_indices(len(matrix), k=1)
+    correlations = matrix.to_numpy()[rows, cols]
+    present = ~np.isnan(correlations)
+    rows, cols, correlations = rows[present], cols[present], correlations[present]
+
+    order = np.argsort(-np.abs(correlations), kind="stable")[:n_pairs]
+    return pd.DataFrame({
+        'column_1': matrix.index[rows[order]],
+        'column_2': matrix.columns[cols[order]],
+        'correlation': correlations[order].round(4)
+    })
+
+
+class NumericCorrelation:
+    """
+    --------------------
+    Description
+    --------------------
+    -> NumericCorrelation (class): Class that manages the correlations between the numeric columns of a dataframe
+
+    --------------------
+    Attributes
+    --------------------
+    -> df (pd.Dataframe): Pandas dataframe (mandatory)
+    -> cols_list (list): List of numeric columns names to be correlated (mandatory)
+    -> method (str): Correlation method, "pearson" or "spearman" (default set to "pearson")
+    -> sample_rows (int): Maximum number of rows used to compute the correlations (default set to 100000)
+    -> block_size (int): Number of columns processed at a time (default set to 64)
+    -> matrix (pd.DataFrame): Correlation matrix (default set to None)
+    -> top_pairs (pd.DataFrame): Pairs of columns with the highest absolute correlation (default set to empty)
+    -> heatmap (alt.Chart): Altair heatmap displaying the correlation of the top pairs (default set to None)
+
+    """
+    def __init__(self, df, cols_list, method="pearson", sample_rows=100000, block_size=64):
+        self.df = df
+        self.cols_list = cols_list
+        self.method = method
+        self.sample_rows = sample_rows
+        self.block_size = block_size
+        self.matrix = None
+        self.top_pairs = pd.DataFrame(columns=['column_1', 'column_2', 'correlation'])
+        self.heatmap = None
+
+    def set_data(self, n_pairs=20):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_data (method): Class method that computes the correlation matrix, the top pairs and the heatmap to be displayed in the Numeric section of Streamlit app
+
+        --------------------
+        Parameters
+        --------------------
+        -> n_pairs (int): Number of pairs displayed on the heatmap
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        if self.df is not None and len(self.cols_list) > 1:
+            self.set_matrix()
+            self.set_top_pairs(n_pairs)
+            self.set_heatmap()
+
+    def set_matrix(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_matrix (method): Class method that computes the correlation matrix with compute_correlation() and store the results in the relevant attribute (self.matrix).
+        The matrix is cached while the dataframe stays the same.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        self.matrix = get_column_result(
+            self.df, tuple(self.cols_list), f"correlation_{self.method}_{self.sample_rows}",
+            lambda: compute_correlation(self.df, method=self.method, block_size=self.block_size, sample_rows=self.sample_rows, columns=self.cols_list)
+        )
+
+    def set_top_pairs(self, n_pairs=20):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_top_pairs (method): Class method that finds the pairs of columns with the highest absolute correlation and store the results in the relevant attribute (self.top_pairs)
+
+        --------------------
+        Parameters
+        --------------------
+        -> n_pairs (int): Maximum number of pairs kept
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        if self.matrix is not None:
+            self.top_pairs = get_top_pairs(self.matrix, n_pairs=n_pairs)
+
+    def set_heatmap(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_heatmap (method): Class method that computes the Altair heatmap displaying the correlation of the top pairs only and store the results in the relevant attribute (self.heatmap).
+        Only the top pairs are embedded in the chart, so its size doesn't depend on the number of columns.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        # Imported here as altair is only needed to build the chart, which keeps it out of the startup of the command-line tools
+        import altair as alt
+
+        if not self.top_pairs.empty:
+            self.heatmap = alt.Chart(self.top_pairs).mark_rect().encode(
+                alt.X('column_1:N', title=None),
+                alt.Y('column_2:N', title=None),
+                alt.Color('correlation:Q', scale=alt.Scale(scheme='redblue', domain=[-1, 1])),
+                tooltip=['column_1', 'column_2', 'correlation']
+            ).properties(
+                title=f'Top {len(self.top_pairs)} Correlated Pairs ({self.method.capitalize()})'
+            )
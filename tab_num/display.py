@@ -1,19 +1,56 @@
+import copy
+
 import streamlit as st
 
 from tab_num.logics import NumericColumn
+from common.scheduler import profile_scheduler
+from tab_num.correlation import NumericCorrelation
+
+def schedule_tab_num_content(file_path=None, df=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> schedule_tab_num_content (function): Function that submits to common.scheduler.profile_scheduler the instantiation of tab_num.logics.NumericColumn class and the calls to its tab_num.logics.NumericColumn.find_num_cols() and tab_num.logics.NumericColumn.set_all_stats() methods, so that they run on a worker thread.
+    The instance is returned without its dataframe so that the scheduler doesn't keep the dataframe alive.
+
+    --------------------
+    Parameters
+    --------------------
+    -> file_path (str): File path to uploaded CSV file (optional)
+    -> df (pd.DataFrame): Loaded dataframe (optional)
+
+    --------------------
+    Returns
+    --------------------
+    -> (concurrent.futures.Future): Future of the NumericColumn instance
+
+    """
+    def build():
+        column = NumericColumn(file_path=file_path, df=df)
+        column.find_num_cols()
+        column.set_all_stats()
+        column.df = None
+        return column
+
+    return profile_scheduler.submit(df, "num_column", build)
+
 
 def display_tab_num_content(file_path=None, df=None):
     """
     --------------------
     Description
     --------------------
-    -> display_tab_num_content (function): Function that will instantiate tab_num.logics.NumericColumn class, save it into Streamlit session state and call its tab_num.logics.NumericColumn.find_num_cols() method in order to find all numeric columns.
+    -> display_tab_num_content (function): Function that will wait for the tab_num.logics.NumericColumn instance computed by schedule_tab_num_content() on a worker thread, with a spinner if it isn't ready yet, and save a copy of it into Streamlit session state. Its tab_num.logics.NumericColumn.find_num_cols() method has found all numeric columns.
     Then it will display a Streamlit select box with the list of numeric columns found.
-    Once the user select a numeric column from the select box, it will call the tab_num.logics.NumericColumn.set_data() method in order to compute all the information to be displayed.
+    The statistics of all numeric columns, computed at once with tab_num.logics.NumericColumn.set_all_stats() on the worker thread, are displayed in a Streamlit Expander container.
+    Once the user select a numeric column from the select box, it will call the tab_num.logics.NumericColumn.set_data() method in order to look up or compute all the information to be displayed.
     Then it will display a Streamlit Expander container with the following contents:
     - the results of tab_num.logics.NumericColumn.get_summary() as a Streamlit Table
     - the graph from tab_num.logics.NumericColumn.histogram using Streamlit.altair_chart()
     - the results of tab_num.logics.NumericColumn.frequent using Streamlit.write
+    Finally it will display a Streamlit Expander container with the correlations between numeric columns computed by tab_num.correlation.NumericCorrelation, only once the user ticks its checkbox:
+    a radio button to select the method (Pearson, Spearman), a slider to select the number of top pairs, their heatmap using Streamlit.altair_chart() and their table using Streamlit.dataframe
  
     --------------------
     Parameters
@@ -32,16 +69,22 @@ def display_tab_num_content(file_path=None, df=None):
         st.warning("No valid CSV loaded. Please upload a CSV file to see analysis.")
         return
 
-    # Instantiate NumericColumn class and set it into Streamlit session state
-    st.session_state["num_column"] = NumericColumn(file_path=file_path, df=df)
-
-    # Call find_num_cols() method to find all numeric columns
-    st.session_state.num_column.find_num_cols()
+    # Wait for the columns found on the worker threads and set a copy of the NumericColumn class into Streamlit session state, it is kept between reruns while the dataframe stays the same
+    if st.session_state.get("num_column") is None or st.session_state.num_column.df is not df:
+        future = schedule_tab_num_content(file_path=file_path, df=df)
+        if not future.done():
+            with st.spinner("Computing the statistics of the numeric columns..."):
+                future.result()
+        st.session_state["num_column"] = copy.copy(future.result())
+        st.session_state.num_column.df = df
 
     # If no numeric columns found, show message
     if not st.session_state.num_column.cols_list:
         st.warning("No numeric columns found in the dataset.")
         return
+
+    with st.expander("All Numeric Columns Overview", expanded=False):
+        st.dataframe(st.session_state.num_column.get_overview(), use_container_width=True)
     
     # Select box to choose numeric column
     selected_col = st.selectbox(
@@ -54,7 +97,10 @@ def display_tab_num_content(file_path=None, df=None):
     
     
     if st.session_state.selected_num_col:
-        st.session_state.num_column.set_data(st.session_state.selected_num_col)
+        # Only compute the information of the selected column if it hasn't been computed at the previous rerun
+        serie = st.session_state.num_column.serie
+        if serie is None or serie.name != st.session_state.selected_num_col:
+            st.session_state.num_column.set_data(st.session_state.selected_num_col)
 
         with st.expander("Numeric Column Overview", expanded=True):
 
@@ -66,7 +112,8 @@ def display_tab_num_content(file_path=None, df=None):
 
             st.subheader("Feature Distribution")
              # Display histogram using altair_chart
-            st.altair_chart(st.session_state.num_column.histogram, use_container_width = True)
+            if st.session_state.num_column.histogram is not None:
+                st.altair_chart(st.session_state.num_column.histogram, use_container_width = True)
 
             st.subheader("Most Frequent Values")
             # Display frequent values
@@ -80,4 +127,20 @@ def display_tab_num_content(file_path=None, df=None):
 
 
 
-    
\ No newline at end of file
+    
+
+    if len(st.session_state.num_column.cols_list) > 1:
+        with st.expander("Correlations", expanded=False):
+            # The body of a collapsed expander is still run, so the correlations are only computed once requested
+            if st.checkbox(label="Compute correlations between numeric columns", value=False):
+                # Radio button to select the method and slider to select the number of pairs
+                method = st.radio(label="Correlation Method", options=["Pearson", "Spearman"], horizontal=True)
+                n_pairs = st.slider(label="Select the number of most correlated pairs to display", min_value=5, max_value=50, value=20)
+
+                # Compute correlations in blocks of columns on a sample of rows
+                correlation = NumericCorrelation(df=df, cols_list=st.session_state.num_column.cols_list, method=method.lower())
+                correlation.set_data(n_pairs=n_pairs)
+
+                if correlation.heatmap is not None:
+                    st.altair_chart(correlation.heatmap, use_container_width=True)
+                st.dataframe(correlation.top_pairs, use_container_width=True)
@@ -1,5 +1,12 @@
 import pandas as pd
-import altair as alt
+
+from tab_df.formats import is_columnar_file, read_columnar, read_schema
+from tab_num.binning import compute_histogram
+from tab_num.stats import compute_numeric_stats, compute_batch_numeric_stats, StreamingNumericStats, PERCENTILES
+from common.frequency import get_column_result
+from common.schema import get_schema
+from common.sketches import HyperLogLog, HeavyHitters, APPROX_MIN_ROWS, DEFAULT_DISTINCT_ERROR, CHUNK_ROWS
+from common.files import open_file, close_file
 
 
 class NumericColumn:
@@ -12,7 +19,7 @@ class NumericColumn:
     --------------------
     Attributes
     --------------------
-    -> file_path (str): Path to the uploaded CSV file (optional)
+    -> file_path (str): Path to the uploaded CSV, Parquet, Feather or Arrow IPC file, local paths being opened with common.files.open_file() (optional)
     -> df (pd.Dataframe): Pandas dataframe (optional)
     -> cols_list (list): List of columns names of dataset that are numeric type (default set to empty list)
     -> serie (pd.Series): Pandas serie where the content of a column has been loaded (default set to None)
@@ -23,15 +30,27 @@ class NumericColumn:
     -> col_min (int): Minimum value of a serie (default set to None)
     -> col_max (int): Maximum value of a serie (default set to None)
     -> col_median (int): Median value of a serie (default set to None)
+    -> percentiles (dict): Percentiles (1, 5, 25, 75, 95 and 99) of a serie keyed by percentile (default set to None)
     -> n_zeros (int): Number of times a serie has values equal to 0 (default set to None)
     -> n_negatives (int): Number of times a serie has negative values (default set to None)
-    -> histogram (alt.Chart): Altair histogram displaying the count for each bin value of a serie (default set to empty)
+    -> histogram (alt.Chart): Altair histogram displaying the count for each bin value of a serie (default set to None)
     -> frequent (pd.DataFrame): Datframe containing the most frequest value of a serie (default set to empty)
+    -> frequency (common.frequency.FrequencyIndex): Unique values of a serie with their number of occurrences (default set to None)
+    -> approx_min_rows (int): Number of rows above which statistics are estimated with sketches (default set to common.sketches.APPROX_MIN_ROWS)
+    -> approx_error (float): Relative standard error of the approximate number of unique values (default set to 1%)
+    -> approx_unique (bool): Flag stating if self.n_unique is an approximation (default set to False)
+    -> approx_quantiles (bool): Flag stating if self.col_median and self.percentiles are approximations (default set to False)
+    -> all_stats (pd.DataFrame): Summary statistics of all numeric columns with one row per column and a flag stating if they are approximate, computed by set_all_stats() (default set to None)
+    -> all_frequent (dict): Most frequent values of each numeric column, computed by set_all_stats() (default set to None)
 
     """
-    def __init__(self, file_path=None, df=None):
-        self.file_path = file_path
+    def __init__(self, file_path=None, df=None, approx_min_rows=APPROX_MIN_ROWS, approx_error=DEFAULT_DISTINCT_ERROR):
+        self.file_path = open_file(file_path)
         self.df = df
+        self.approx_min_rows = approx_min_rows
+        self.approx_error = approx_error
+        self.approx_unique = False
+        self.approx_quantiles = False
         self.cols_list = []
         self.serie = None
         self.n_unique = None
@@ -41,10 +60,14 @@ class NumericColumn:
         self.col_min = None
         self.col_max = None
         self.col_median = None
+        self.percentiles = None
         self.n_zeros = None
         self.n_negatives = None
-        self.histogram = alt.Chart()
+        self.histogram = None
         self.frequent = pd.DataFrame(columns=['value', 'occurrence', 'percentage'])
+        self.frequency = None
+        self.all_stats = None
+        self.all_frequent = None
 
     def find_num_cols(self):
         """
@@ -52,7 +75,8 @@ class NumericColumn:
         Description
         --------------------
         -> find_num_cols (method): Class method that will load the uploaded CSV file as Pandas DataFrame and store it as attribute (self.df) if it hasn't been provided before.
-        Then it will find all columns of numeric data type and store the results in the relevant attribute (self.cols_list).
+        Then it will find all columns of numeric data type, read from the schema shared by all tabs (see common.schema.get_schema()), and store the results in the relevant attribute (self.cols_list).
+        For columnar files (Parquet, Feather, Arrow IPC), only the schema is read and columns are loaded one at a time by set_data().
 
         --------------------
         Parameters
@@ -65,27 +89,36 @@ class NumericColumn:
         -> None
 
         """
+        # Only read the schema of columnar files
+        if self.df is None and self.file_path is not None and is_columnar_file(self.file_path):
+            self.cols_list = [col for col, kind in read_schema(self.file_path).items() if kind == "number"]
+            print("Numeric Columns Found: ", self.cols_list)
+            return
+
         # Load dataframe if not provided
         if self.df is None and self.file_path is not None:
             self.df = pd.read_csv(self.file_path)
         
-        # Find numeric columns
+        # Find numeric columns from the schema shared by all tabs
         if self.df is not None:
-            self.cols_list = self.df.select_dtypes(include = ['number']).columns.tolist()
+            self.cols_list = get_schema(self.df).get_numeric_cols()
             print("Numeric Columns Found: ", self.cols_list)
         
 
-    def set_data(self, col_name):
+    def set_data(self, col_name, charts=True):
         """
         --------------------
         Description
         --------------------
-        -> set_data (method): Class method that sets the self.serie attribute with the relevant column from the dataframe and then computes all requested information from self.serie to be displayed in the Numeric section of Streamlit app 
+        -> set_data (method): Class method that sets the self.serie attribute with the relevant column from the dataframe and then computes all requested information from self.serie to be displayed in the Numeric section of Streamlit app.
+        If no dataframe has been provided for a columnar file, only the relevant column is read from the file.
+        If the statistics of all columns have already been computed with set_all_stats(), they are looked up instead of being computed again and only the histogram is computed.
 
         --------------------
         Parameters
         --------------------
         -> col_name (str): Name of the numeric column to be analysed
+        -> charts (bool): Flag stating if the Altair histogram is built, set to False when only the statistics are needed (e.g. app.report.build_report())
 
         --------------------
         Returns
@@ -93,25 +126,23 @@ class NumericColumn:
         -> None
 
         """
-        if self.df is not None and col_name in self.df.columns:
+        # Read only the relevant column of columnar files
+        if self.df is None and self.file_path is not None and is_columnar_file(self.file_path) and col_name in self.cols_list:
+            self.serie = read_columnar(self.file_path, columns=[col_name])[col_name]
+        elif self.df is not None and col_name in self.df.columns:
             # Set serie attribute
             self.serie = self.df[col_name]
+        else:
+            return
+
+        # Convert serie to numeric
+        self.convert_serie_to_num()
 
-            # Convert serie to numeric
-            self.convert_serie_to_num()
-
-            # Compute all requested information
-            self.set_unique()
-            self.set_missing()
-            self.set_zeros()
-            self.set_negatives()
-            self.set_mean()
-            self.set_std()
-            self.set_min()
-            self.set_max()
-            self.set_median()
+        # Look up summary statistics and frequent values if computed for all columns, otherwise compute them in a single kernel
+        if not self.lookup_stats(col_name):
+            self.set_stats()
+        if charts:
             self.set_histogram()
-            self.set_frequent()
 
 
     def convert_serie_to_num(self):
@@ -137,6 +168,28 @@ class NumericColumn:
             self.serie = pd.to_numeric(self.serie, errors='coerce')
         
 
+    def close_file(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> close_file (method): Class method that closes the file opened from a local path (see common.files.close_file()) once the data has been loaded, so that profiling many files doesn't leak file descriptors.
+        Columns of columnar files can't be read from the file anymore afterwards.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        close_file(self.file_path)
+
+
     def is_serie_none(self):
         """
         --------------------
@@ -159,12 +212,323 @@ class NumericColumn:
         return self.serie is None or self.serie.empty
         
 
+    def is_approximate(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> is_approximate (method): Class method that checks if the serie is large enough (at least self.approx_min_rows rows) for statistics to be estimated with sketches
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (bool): Flag stating if approximate statistics are used or not
+
+        """
+        return not self.is_serie_none() and len(self.serie) >= self.approx_min_rows
+
+
+    def build_distinct_sketch(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> build_distinct_sketch (method): Class method that builds the HyperLogLog sketch of the non-missing values of the serie, with the relative error self.approx_error
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (common.sketches.HyperLogLog): Sketch of the serie
+
+        """
+        sketch = HyperLogLog(error=self.approx_error)
+        sketch.update(self.serie)
+        return sketch
+
+
+    def get_heavy_hitters(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_heavy_hitters (method): Class method that returns the bounded-memory sketch of the most frequent values of the serie, building it chunk by chunk the first time it is requested
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (common.sketches.HeavyHitters): Sketch of the most frequent values of the serie
+
+        """
+        def build_sketch():
+            sketch = HeavyHitters()
+            for start in range(0, len(self.serie), CHUNK_ROWS):
+                sketch.update(self.serie.iloc[start:start + CHUNK_ROWS])
+            return sketch
+
+        return get_column_result(self.df, self.serie.name, "numeric_heavy_hitters", build_sketch)
+
+
+    def get_streaming_stats(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_streaming_stats (method): Class method that returns the statistics of the serie computed chunk by chunk in bounded memory with tab_num.stats.StreamingNumericStats, computing them the first time they are requested
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (tab_num.stats.StreamingNumericStats): Streaming statistics of the serie
+
+        """
+        return self.build_streaming_stats(self.serie)
+
+
+    def build_streaming_stats(self, serie):
+        """
+        --------------------
+        Description
+        --------------------
+        -> build_streaming_stats (method): Class method that computes the statistics of a numeric serie chunk by chunk in bounded memory with tab_num.stats.StreamingNumericStats.
+        Results are cached while the dataframe stays the same, so set_all_stats() and set_stats() share them.
+
+        --------------------
+        Parameters
+        --------------------
+        -> serie (pd.Series): Numeric serie (column of self.df or read from self.file_path)
+
+        --------------------
+        Returns
+        --------------------
+        -> (tab_num.stats.StreamingNumericStats): Streaming statistics of the serie
+
+        """
+        def build_stats():
+            stats = StreamingNumericStats(distinct_error=self.approx_error)
+            for start in range(0, len(serie), CHUNK_ROWS):
+                stats.update(serie.iloc[start:start + CHUNK_ROWS])
+            return stats
+
+        if self.df is None:
+            return build_stats()
+        return get_column_result(self.df, serie.name, f"streaming_stats_{self.approx_error}", build_stats)
+
+
+    def set_stats(self, end=20):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_stats (method): Class method that computes all summary statistics and the most frequent values of a serie at once with tab_num.stats.compute_numeric_stats()
+        and store the results in the relevant attributes (self.n_unique, self.n_missing, self.n_zeros, self.n_negatives, self.col_mean, self.col_std, self.col_min, self.col_max, self.col_median, self.percentiles, self.frequency, self.frequent) if self.serie is not empty nor None.
+        The number of unique values and the most frequent values are both derived from the frequency index of the serie. Results are cached while the dataframe stays the same.
+        For series of at least self.approx_min_rows rows, the serie isn't sorted: statistics are computed chunk by chunk with get_streaming_stats(), the number of unique values,
+        most frequent values, median and percentiles being estimated with sketches.
+        It gives the same results as calling set_unique(), set_missing(), set_zeros(), set_negatives(), set_mean(), set_std(), set_min(), set_max(), set_median() and set_frequent() one after the other, with far fewer passes over the data.
+
+        --------------------
+        Parameters
+        --------------------
+        -> end (int):
+            Parameter indicating the maximum number of frequent values to be displayed
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        if not self.is_serie_none():
+            if self.is_approximate():
+                # Estimate statistics in bounded memory
+                stats = self.get_streaming_stats().get_stats(end=end)
+            else:
+                # Statistics are only computed once per column of a given dataframe
+                stats = get_column_result(self.df, self.serie.name, f"numeric_stats_{end}", lambda: compute_numeric_stats(self.serie, end=end))
+            for attr, value in stats.items():
+                setattr(self, attr, value)
+            self.approx_unique = self.approx_quantiles = self.is_approximate()
+        
+
+    def set_all_stats(self, end=20, max_block_bytes=256 * 1024 ** 2):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_all_stats (method): Class method that computes the summary statistics and most frequent values of all numeric columns (self.cols_list) at once with tab_num.stats.compute_batch_numeric_stats()
+        and store the results in the relevant attributes (self.all_stats, self.all_frequent). Columns are processed in blocks converted to a 2-D float array of at most max_block_bytes,
+        columnar files being read block by block when no dataframe has been provided. Results are cached while the dataframe stays the same.
+        Blocks of at least self.approx_min_rows rows aren't sorted: each column is summarized chunk by chunk with build_streaming_stats(), as in set_stats(), and flagged as approximate.
+
+        --------------------
+        Parameters
+        --------------------
+        -> end (int): Maximum number of frequent values kept per column
+        -> max_block_bytes (int): Maximum size in bytes of the float array of a block of columns
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        if not self.cols_list or (self.df is None and self.file_path is None):
+            return
+
+        def build_stats():
+            tables = []
+            frequent = {}
+            # The first block has a single column and is used to size the next ones
+            start, block_size = 0, 1
+            while start < len(self.cols_list):
+                block_cols = self.cols_list[start:start + block_size]
+                block = read_columnar(self.file_path, columns=block_cols) if self.df is None else self.df[block_cols]
+                if len(block) >= self.approx_min_rows:
+                    # Estimate statistics in bounded memory instead of sorting the columns
+                    table, block_frequent = self.get_streaming_table(block, end=end)
+                else:
+                    table, block_frequent = compute_batch_numeric_stats(block, end=end)
+                    table["approximate"] = False
+                tables.append(table)
+                frequent.update(block_frequent)
+                start += len(block_cols)
+                block_size = max(1, max_block_bytes // max(8 * len(block), 1))
+            return pd.concat(tables), frequent
+
+        self.all_stats, self.all_frequent = get_column_result(self.df, tuple(self.cols_list), f"batch_numeric_stats_{end}_{self.approx_min_rows}_{self.approx_error}", build_stats)
+
+
+    def get_streaming_table(self, block, end=20):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_streaming_table (method): Class method that summarizes the columns of a block with build_streaming_stats(), in the same format as tab_num.stats.compute_batch_numeric_stats()
+
+        --------------------
+        Parameters
+        --------------------
+        -> block (pd.DataFrame): Dataframe with numeric columns only
+        -> end (int): Maximum number of frequent values kept per column
+
+        --------------------
+        Returns
+        --------------------
+        -> (tuple): Wide dataframe with one row per column (flagged as approximate) and dict of the most frequent values dataframe of each column
+
+        """
+        rows = {}
+        frequent = {}
+        for col in block.columns:
+            stats = self.build_streaming_stats(block[col]).get_stats(end=end)
+            frequent[col] = stats["frequent"]
+            rows[col] = {
+                "n_unique": int(round(stats["n_unique"])),
+                **{attr: stats[attr] for attr in ["n_missing", "n_zeros", "n_negatives", "col_mean", "col_std", "col_min", "col_max", "col_median"]},
+                **{f"p{percentile}": value for percentile, value in stats["percentiles"].items()},
+                "approximate": True,
+            }
+        table = pd.DataFrame.from_dict(rows, orient="index")
+        table.index.name = "column"
+        return table, frequent
+
+
+    def lookup_stats(self, col_name):
+        """
+        --------------------
+        Description
+        --------------------
+        -> lookup_stats (method): Class method that sets the summary statistics and most frequent values of a column from the results of set_all_stats()
+
+        --------------------
+        Parameters
+        --------------------
+        -> col_name (str): Name of the numeric column
+
+        --------------------
+        Returns
+        --------------------
+        -> (bool): Flag stating if the statistics of the column were found or not
+
+        """
+        if self.all_stats is None or col_name not in self.all_stats.index:
+            return False
+
+        row = self.all_stats.loc[col_name]
+        for attr in ["n_unique", "n_missing", "n_zeros", "n_negatives"]:
+            setattr(self, attr, int(row[attr]))
+        for attr in ["col_mean", "col_std", "col_min", "col_max", "col_median"]:
+            setattr(self, attr, row[attr])
+        self.percentiles = {percentile: row[f"p{percentile}"] for percentile in PERCENTILES}
+        self.frequent = self.all_frequent[col_name]
+        self.frequency = None
+        self.approx_unique = self.approx_quantiles = bool(row["approximate"])
+        return True
+
+
+    def get_overview(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_overview (method): Class method that formats the summary statistics of all numeric columns computed by set_all_stats() to be displayed in the Numeric section of Streamlit app
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (pd.DataFrame): Formatted dataframe with one row per numeric column (None if set_all_stats() hasn't been called)
+
+        """
+        if self.all_stats is not None:
+            overview = self.all_stats.rename(columns={
+                "n_unique": "Unique",
+                "n_missing": "Missing",
+                "n_zeros": "Zeros",
+                "n_negatives": "Negatives",
+                "col_mean": "Mean",
+                "col_std": "Std",
+                "col_min": "Min",
+                "col_max": "Max",
+                "col_median": "Median",
+                **{f"p{percentile}": f"P{percentile}" for percentile in PERCENTILES},
+                "approximate": "Approximate",
+            })
+            overview.index.name = "Column"
+            return overview
+
+
     def set_unique(self):
         """
         --------------------
         Description
         --------------------
         -> set_unique (method): Class method that computes the number of unique value of a column and store the results in the relevant attribute (self.n_unique) if self.serie is not empty nor None
+        For series of at least self.approx_min_rows rows, the number is estimated with a HyperLogLog sketch instead of a hash table of all values.
 
         --------------------
         Parameters
@@ -178,8 +542,15 @@ class NumericColumn:
 
         """
         if not self.is_serie_none():
-            # Compute number of unique values
-            self.n_unique = self.serie.nunique()
+            if self.is_approximate():
+                # Estimate number of unique values with a HyperLogLog sketch
+                sketch = get_column_result(self.df, self.serie.name, f"numeric_distinct_sketch_{self.approx_error}", lambda: self.build_distinct_sketch())
+                self.n_unique = sketch.count()
+                self.approx_unique = True
+            else:
+                # Compute number of unique values
+                self.n_unique = self.serie.nunique()
+                self.approx_unique = False
         
 
     def set_missing(self):
@@ -348,6 +719,7 @@ class NumericColumn:
         Description
         --------------------
         -> set_median (method): Class method that computes the median value of a serie and store the results in the relevant attribute (self.col_median) if self.serie is not empty nor None
+        For series of at least self.approx_min_rows rows, the median is estimated with a mergeable quantile sketch (common.sketches.QuantileSketch) instead of sorting the serie.
 
         --------------------
         Parameters
@@ -360,9 +732,14 @@ class NumericColumn:
         -> None
 
         """
-        if not self.is_serie_none():
+        if self.is_approximate():
+            # Estimate median value
+            self.col_median = self.get_streaming_stats().quantiles.get_quantiles([0.5])[0]
+            self.approx_quantiles = True
+        elif not self.is_serie_none():
             # Compute median value
             self.col_median = self.serie.median()
+            self.approx_quantiles = False
         
 
     def set_histogram(self):
@@ -370,7 +747,8 @@ class NumericColumn:
         --------------------
         Description
         --------------------
-        -> set_histogram (method): Class method that computes the Altair histogram displaying the count for each bin value of a serie and store the results in the relevant attribute (self.histogram) if self.serie is not empty nor None
+        -> set_histogram (method): Class method that computes the Altair histogram displaying the count for each bin value of a serie and store the results in the relevant attribute (self.histogram) if self.serie is not empty nor None.
+        Bins are computed with NumPy (see tab_num.binning.compute_histogram()) using the same bins as alt.Bin(maxbins=30), so the chart only embeds the bins and not every row of the serie.
 
         --------------------
         Parameters
@@ -383,11 +761,16 @@ class NumericColumn:
         -> None
 
         """
+        # Imported here as altair is only needed to build the chart, which keeps it out of the startup of the command-line tools
+        import altair as alt
+
         if not self.is_serie_none():
-            # Compute histogram
-            self.histogram = alt.Chart(pd.DataFrame({ 'value': self.serie })).mark_bar().encode(
-                alt.X('value', bin=alt.Bin(maxbins=30), title = self.serie.name),
-                alt.Y('count()', title='Count of Records')
+            # Compute histogram bins and counts on the server so that only the bins are sent to the chart
+            bins_df = compute_histogram(self.serie, maxbins=30)
+            self.histogram = alt.Chart(bins_df).mark_bar().encode(
+                alt.X('bin_start:Q', bin='binned', title = self.serie.name),
+                alt.X2('bin_end:Q'),
+                alt.Y('count:Q', title='Count of Records')
             ).properties(
                 title='Histogram'
             )
@@ -399,6 +782,7 @@ class NumericColumn:
         Description
         --------------------
         -> set_frequent (method): Class method that computes the Dataframe containing the most frequest value of a serie and store the results in the relevant attribute (self.frequent) if self.serie is not empty nor None
+        For series of at least self.approx_min_rows rows, they are estimated with a Misra-Gries sketch (common.sketches.HeavyHitters) and error bounds are added on the occurrences and percentages.
 
         --------------------
         Parameters
@@ -412,7 +796,10 @@ class NumericColumn:
         -> None
 
         """
-        if not self.is_serie_none():
+        if self.is_approximate():
+            # Estimate frequent values with bounded memory
+            self.frequent = self.get_heavy_hitters().get_top(end)
+        elif not self.is_serie_none():
             # Compute frequent values
             freq_series = self.serie.value_counts(dropna=True).head(end)
             # Compute total count for percentage calculation
@@ -430,6 +817,7 @@ class NumericColumn:
         Description
         --------------------
         -> get_summary_df (method): Class method that formats all requested information from self.serie to be displayed in the Overall section of Streamlit app as a Pandas dataframe with 2 columns: Description and Value
+        Approximate values are marked with "(approx.)" and the percentiles are only added once computed by set_stats().
 
         --------------------
         Parameters
@@ -456,7 +844,7 @@ class NumericColumn:
                     'Median Value'
                 ],
                 'Value': [
-                    f"{int(self.n_unique)}",
+                    f"{int(self.n_unique)} (approx.)" if self.approx_unique else f"{int(self.n_unique)}",
                     f"{int(self.n_missing)}",
                     f"{int(self.n_zeros)}",
                     f"{int(self.n_negatives)}",
@@ -464,8 +852,15 @@ class NumericColumn:
                     f"{self.col_std:,.2f}",
                     f"{self.col_min:,.2f}",
                     f"{self.col_max:,.2f}",
-                    f"{self.col_median:,.2f}"
+                    f"{self.col_median:,.2f} (approx.)" if self.approx_quantiles else f"{self.col_median:,.2f}"
                 ]
             }
+
+            # Add percentiles if they have been computed
+            if self.percentiles is not None:
+                for percentile in PERCENTILES:
+                    data['Description'].append(f"Percentile {percentile} (P{percentile}) Value")
+                    value = f"{self.percentiles[percentile]:,.2f}"
+                    data['Value'].append(f"{value} (approx.)" if self.approx_quantiles else value)
             return pd.DataFrame(data)
         
@@ -0,0 +1,375 @@
+import numpy as np
+import pandas as pd
+
+from common.frequency import FrequencyIndex
+from common.sketches import HyperLogLog, HeavyHitters, QuantileSketch, DEFAULT_DISTINCT_ERROR
+
+# Percentiles displayed in the summary of numeric columns
+PERCENTILES = [1, 5, 25, 75, 95, 99]
+
+
+def get_sorted_percentiles(sorted_values, percentiles=PERCENTILES):
+    """
+    --------------------
+    Description
+    --------------------
+    -> get_sorted_percentiles (function): Function that computes percentiles of already sorted values with linear interpolation (as np.percentile())
+
+    --------------------
+    Parameters
+    --------------------
+    -> sorted_values (np.ndarray): Sorted non-missing values
+    -> percentiles (list): Percentiles to be computed, between 0 and 100
+
+    --------------------
+    Returns
+    --------------------
+    -> (dict): Value of each percentile keyed by percentile
+
+    """
+    if len(sorted_values) == 0:
+        return {percentile: np.nan for percentile in percentiles}
+    positions = np.asarray(percentiles, dtype="float64") / 100 * (len(sorted_values) - 1)
+    lower = np.floor(positions).astype("int64")
+    upper = np.minimum(lower + 1, len(sorted_values) - 1)
+    fractions = positions - lower
+    values = sorted_values[lower].astype("float64") * (1 - fractions) + sorted_values[upper].astype("float64") * fractions
+    return dict(zip(percentiles, values.tolist()))
+
+
+def compute_numeric_stats(serie, end=20):
+    """
+    --------------------
+    Description
+    --------------------
+    -> compute_numeric_stats (function): Function that computes all summary statistics of a numeric serie from its underlying NumPy buffer with a single sort.
+    Once the values are sorted (missing values last), the minimum, maximum and median are read at fixed positions, the numbers of zeros and negatives are found by binary search
+    and the unique values with their counts are given by the boundaries between runs of equal values. Only the mean and standard deviation need another pass over the values.
+
+    --------------------
+    Parameters
+    --------------------
+    -> serie (pd.Series): Numeric serie
+    -> end (int): Maximum number of most frequent values returned
+
+    --------------------
+    Returns
+    --------------------
+    -> (dict): Statistics keyed by the name of the matching NumericColumn attribute (n_unique, n_missing, n_zeros, n_negatives, col_mean, col_std, col_min, col_max, col_median, percentiles, frequency, frequent)
+
+    """
+    # Integer columns are kept as integers so that frequent values keep their type
+    if pd.api.types.is_integer_dtype(serie) and isinstance(serie.dtype, np.dtype):
+        values = serie.to_numpy()
+    else:
+        values = serie.to_numpy(dtype="float64", na_value=np.nan)
+
+    sorted_values = np.sort(values)
+    # Missing values are sorted last
+    n_valid = int(np.searchsorted(sorted_values, np.nan)) if values.dtype.kind == "f" else len(sorted_values)
+    valid = sorted_values[:n_valid]
+
+    stats = {
+        "n_missing": len(values) - n_valid,
+        "n_unique": 0,
+        "n_zeros": 0,
+        "n_negatives": 0,
+        "col_mean": np.nan,
+        "col_std": np.nan,
+        "col_min": np.nan,
+        "col_max": np.nan,
+        "col_median": np.nan,
+        "percentiles": get_sorted_percentiles(values[:0]),
+        "frequent": pd.DataFrame(columns=['value', 'occurrence', 'percentage']),
+        "frequency": FrequencyIndex(values=[], counts=[], n_missing=len(values) - n_valid),
+    }
+    if n_valid == 0:
+        return stats
+
+    # Order statistics
+    stats["col_min"] = valid[0]
+    stats["col_max"] = valid[-1]
+    middle = n_valid // 2
+    stats["col_median"] = float(valid[middle]) if n_valid % 2 else (float(valid[middle - 1]) + float(valid[middle])) / 2
+    stats["percentiles"] = get_sorted_percentiles(valid)
+
+    # Counts of zeros and negatives by binary search
+    first_zero = int(np.searchsorted(valid, 0, side="left"))
+    stats["n_negatives"] = first_zero
+    stats["n_zeros"] = int(np.searchsorted(valid, 0, side="right")) - first_zero
+
+    # Mean and sample standard deviation
+    mean = valid.sum(dtype="float64") / n_valid
+    stats["col_mean"] = mean
+    if n_valid > 1:
+        deviations = valid - mean
+        stats["col_std"] = np.sqrt(np.dot(deviations, deviations) / (n_valid - 1))
+
+    # Unique values and their counts from the runs of equal sorted values, ties are ordered by value
+    frequency = FrequencyIndex.from_sorted(valid, n_missing=stats["n_missing"])
+    stats["frequency"] = frequency
+    stats["n_unique"] = frequency.n_unique
+    stats["frequent"] = frequency.get_top(end)
+    return stats
+
+
+class StreamingNumericStats:
+    """
+    --------------------
+    Description
+    --------------------
+    -> StreamingNumericStats (class): Class that computes the summary statistics of a numeric serie chunk by chunk in bounded memory, without sorting the values.
+    Counts, minimum, maximum, mean and variance are aggregated exactly (means and variances of chunks are combined with Chan's formula), while the number of unique values,
+    the most frequent values and the median and percentiles are estimated with sketches (common.sketches.HyperLogLog, HeavyHitters and QuantileSketch).
+    Statistics built on different chunks, files or processes can be merged.
+
+    --------------------
+    Attributes
+    --------------------
+    -> n_missing (int): Number of missing values
+    -> n_valid (int): Number of non-missing values
+    -> n_zeros (int): Number of values equal to 0
+    -> n_negatives (int): Number of negative values
+    -> col_min (float): Minimum value
+    -> col_max (float): Maximum value
+    -> col_mean (float): Average value
+    -> sum_squares (float): Sum of squared deviations from the mean
+    -> distinct (common.sketches.HyperLogLog): Sketch of the number of unique values
+    -> heavy_hitters (common.sketches.HeavyHitters): Sketch of the most frequent values
+    -> quantiles (common.sketches.QuantileSketch): Sketch of the quantiles
+
+    """
+    def __init__(self, distinct_error=DEFAULT_DISTINCT_ERROR):
+        self.n_missing = 0
+        self.n_valid = 0
+        self.n_zeros = 0
+        self.n_negatives = 0
+        self.col_min = np.nan
+        self.col_max = np.nan
+        self.col_mean = 0.0
+        self.sum_squares = 0.0
+        self.distinct = HyperLogLog(error=distinct_error)
+        self.heavy_hitters = HeavyHitters()
+        self.quantiles = QuantileSketch()
+
+    def update(self, serie):
+        """
+        --------------------
+        Description
+        --------------------
+        -> update (method): Class method that adds a chunk of values to the statistics
+
+        --------------------
+        Parameters
+        --------------------
+        -> serie (pd.Series): Chunk of a numeric serie
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        values = serie.to_numpy(dtype="float64", na_value=np.nan)
+        valid = values[~np.isnan(values)]
+        self.n_missing += len(values) - len(valid)
+        if len(valid) == 0:
+            return
+
+        # Exact counts and extremes
+        self.n_zeros += int(np.count_nonzero(valid == 0))
+        self.n_negatives += int(np.count_nonzero(valid < 0))
+        self.col_min = np.fmin(self.col_min, valid.min())
+        self.col_max = np.fmax(self.col_max, valid.max())
+
+        # Mean and sum of squared deviations of the chunk, combined with the previous ones
+        mean = valid.mean()
+        deviations = valid - mean
+        self.combine_moments(len(valid), mean, float(np.dot(deviations, deviations)))
+
+        # Sketches (frequent values keep the original values so that integers stay integers)
+        self.distinct.update(valid)
+        self.heavy_hitters.update(serie.dropna())
+        self.quantiles.update(valid)
+
+    def combine_moments(self, n_valid, mean, sum_squares):
+        """
+        --------------------
+        Description
+        --------------------
+        -> combine_moments (method): Class method that combines the count, mean and sum of squared deviations of other values with the current ones (Chan's parallel algorithm)
+
+        --------------------
+        Parameters
+        --------------------
+        -> n_valid (int): Number of other non-missing values
+        -> mean (float): Mean of the other values
+        -> sum_squares (float): Sum of squared deviations of the other values from their mean
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        n_total = self.n_valid + n_valid
+        delta = mean - self.col_mean
+        self.col_mean += delta * n_valid / n_total
+        self.sum_squares += sum_squares + delta ** 2 * self.n_valid * n_valid / n_total
+        self.n_valid = n_total
+
+    def merge(self, other):
+        """
+        --------------------
+        Description
+        --------------------
+        -> merge (method): Class method that merges the statistics of other values into these ones
+
+        --------------------
+        Parameters
+        --------------------
+        -> other (StreamingNumericStats): Statistics to be merged
+
+        --------------------
+        Returns
+        --------------------
+        -> (StreamingNumericStats): These statistics
+
+        """
+        self.n_missing += other.n_missing
+        self.n_zeros += other.n_zeros
+        self.n_negatives += other.n_negatives
+        self.col_min = np.fmin(self.col_min, other.col_min)
+        self.col_max = np.fmax(self.col_max, other.col_max)
+        if other.n_valid:
+            self.combine_moments(other.n_valid, other.col_mean, other.sum_squares)
+        self.distinct.merge(other.distinct)
+        self.heavy_hitters.merge(other.heavy_hitters)
+        self.quantiles.merge(other.quantiles)
+        return self
+
+    def get_stats(self, end=20):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_stats (method): Class method that returns the statistics in the same format as compute_numeric_stats(), the frequency index being replaced by sketches
+
+        --------------------
+        Parameters
+        --------------------
+        -> end (int): Maximum number of most frequent values returned
+
+        --------------------
+        Returns
+        --------------------
+        -> (dict): Statistics keyed by the name of the matching NumericColumn attribute
+
+        """
+        median, *values = self.quantiles.get_quantiles([0.5] + [percentile / 100 for percentile in PERCENTILES])
+        return {
+            "n_missing": self.n_missing,
+            "n_unique": self.distinct.count(),
+            "n_zeros": self.n_zeros,
+            "n_negatives": self.n_negatives,
+            "col_mean": self.col_mean if self.n_valid else np.nan,
+            "col_std": np.sqrt(self.sum_squares / (self.n_valid - 1)) if self.n_valid > 1 else np.nan,
+            "col_min": self.col_min,
+            "col_max": self.col_max,
+            "col_median": median,
+            "percentiles": dict(zip(PERCENTILES, values)),
+            "frequent": self.heavy_hitters.get_top(end),
+            "frequency": None,
+        }
+
+
+def compute_batch_numeric_stats(df, end=20):
+    """
+    --------------------
+    Description
+    --------------------
+    -> compute_batch_numeric_stats (function): Function that computes the summary statistics of all columns of a numeric dataframe at once, as axis-wise NumPy reductions over a single 2-D float array.
+    The array is sorted once along the rows (missing values last), then the minimum, maximum, median and percentiles of every column are read at fixed positions,
+    the numbers of zeros, negatives and unique values are counted with vectorized comparisons and only the filling of missing values and the most frequent values need short loops over the columns.
+
+    --------------------
+    Parameters
+    --------------------
+    -> df (pd.DataFrame): Dataframe with numeric columns only
+    -> end (int): Maximum number of most frequent values kept per column
+
+    --------------------
+    Returns
+    --------------------
+    -> (tuple): Wide dataframe with one row per column and one column per statistic (named as the NumericColumn attributes, percentiles as p1, p5, ...),
+    and dict of the most frequent values dataframe of each column
+
+    """
+    columns = df.columns.tolist()
+    # Column-major array so that each column is contiguous for the sorts and reductions along the rows
+    values = np.asfortranarray(df.to_numpy(dtype="float64", na_value=np.nan))
+    n_rows = values.shape[0]
+
+    # Sort every column at once, missing values are sorted last
+    sorted_values = np.sort(values, axis=0)
+    n_valid = n_rows - np.isnan(values).sum(axis=0)
+    has_values = n_valid > 0
+    last = np.maximum(n_valid - 1, 0)
+
+    def take(positions):
+        # Value of each column at the given row position
+        if n_rows == 0:
+            return np.full(len(columns), np.nan)
+        taken = np.take_along_axis(sorted_values, positions[np.newaxis, :], axis=0)[0]
+        return np.where(has_values, taken, np.nan)
+
+    def quantile(fraction):
+        # Linear interpolation between the closest ranks, as np.percentile()
+        positions = fraction * last
+        lower = np.floor(positions).astype("int64")
+        upper = np.minimum(lower + 1, last)
+        weights = positions - lower
+        return take(lower) * (1 - weights) + take(upper) * weights
+
+    # Missing values are the last rows of each sorted column, they are filled so that they don't count in the reductions below
+    incomplete = np.flatnonzero(n_valid < n_rows)
+
+    def fill_missing(fill_values):
+        for position in incomplete:
+            sorted_values[n_valid[position]:, position] = fill_values[position]
+
+    # Mean and sample standard deviation (missing values filled with 0 for the sums and with the mean for the deviations)
+    fill_missing(np.zeros(len(columns)))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(has_values, sorted_values.sum(axis=0) / np.maximum(n_valid, 1), np.nan)
+        fill_missing(means)
+        deviations = sorted_values - means
+        stds = np.sqrt(np.einsum("ij,ij->j", deviations, deviations) / (n_valid - 1))
+    stds = np.where(n_valid > 1, stds, np.nan)
+
+    # Unique values are the starts of the runs of equal sorted values, without the run of filled missing values
+    changes = (sorted_values[1:] != sorted_values[:-1]).sum(axis=0)
+    filled_run = (n_valid < n_rows) & has_values & (take(last) != means)
+    n_unique = np.where(has_values, 1 + changes - filled_run, 0)
+
+    table = pd.DataFrame({
+        "n_unique": n_unique,
+        "n_missing": n_rows - n_valid,
+        "n_zeros": (values == 0).sum(axis=0),
+        "n_negatives": (values < 0).sum(axis=0),
+        "col_mean": means,
+        "col_std": stds,
+        "col_min": take(np.zeros(len(columns), dtype="int64")),
+        "col_max": take(last),
+        "col_median": quantile(0.5),
+        **{f"p{percentile}": quantile(percentile / 100) for percentile in PERCENTILES},
+    }, index=pd.Index(columns, name="column"))
+
+    # Most frequent values of each column from the lengths of its runs, ties are ordered by value
+    frequent = {}
+    for position, col in enumerate(columns):
+        valid = sorted_values[:n_valid[position], position]
+        if pd.api.types.is_integer_dtype(df[col].dtype) and isinstance(df[col].dtype, np.dtype):
+            valid = valid.astype(df[col].dtype)
+        frequent[col] = FrequencyIndex.from_sorted(valid, n_missing=n_rows - n_valid[position]).get_top(end)
+    return table, frequent
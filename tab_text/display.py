@@ -1,13 +1,45 @@
+import copy
+
 import streamlit as st
 
 from tab_text.logics import TextColumn
+from common.scheduler import profile_scheduler
+
+def schedule_tab_text_content(file_path=None, df=None):
+    """
+    --------------------
+    Description
+    --------------------
+    -> schedule_tab_text_content (function): Function that submits to common.scheduler.profile_scheduler the instantiation of tab_text.logics.TextColumn class and the call to its tab_text.logics.TextColumn.find_text_cols() method, so that it runs on a worker thread.
+    The instance is returned without its dataframe so that the scheduler doesn't keep the dataframe alive.
+
+    --------------------
+    Parameters
+    --------------------
+    -> file_path (str): File path to uploaded CSV file (optional)
+    -> df (pd.DataFrame): Loaded dataframe (optional)
+
+    --------------------
+    Returns
+    --------------------
+    -> (concurrent.futures.Future): Future of the TextColumn instance
+
+    """
+    def build():
+        column = TextColumn(file_path=file_path, df=df)
+        column.find_text_cols()
+        column.df = None
+        return column
+
+    return profile_scheduler.submit(df, "text_column", build)
+
 
 def display_tab_text_content(file_path=None, df=None):
     """
     --------------------
     Description
     --------------------
-    -> display_tab_text_content (function): Function that will instantiate tab_text.logics.TextColumn class, save it into Streamlit session state and call its tab_text.logics.TextColumn.find_text_cols() method in order to find all text columns.
+    -> display_tab_text_content (function): Function that will wait for the tab_text.logics.TextColumn instance computed by schedule_tab_text_content() on a worker thread, with a spinner if it isn't ready yet, and save a copy of it into Streamlit session state. Its tab_text.logics.TextColumn.find_text_cols() method has found all text columns.
     Then it will display a Streamlit select box with the list of text columns found.
     Once the user select a text column from the select box, it will call the tab_text.logics.TextColumn.set_data() method in order to compute all the information to be displayed.
     Then it will display a Streamlit Expander container with the following contents:
@@ -33,11 +65,14 @@ def display_tab_text_content(file_path=None, df=None):
         st.warning("No valid CSV loaded. Please upload a CSV file to see analysis.")
         return
     
-    # Instantiate TextColumn class and set it into Streamlit session state
-    st.session_state["text_column"] = TextColumn(file_path=file_path, df=df)
-
-    # Call find_text_cols() method to find all textual columns
-    st.session_state.text_column.find_text_cols()
+    # Wait for the columns found on the worker threads and set a copy of the TextColumn class into Streamlit session state, it is kept between reruns while the dataframe stays the same
+    if st.session_state.get("text_column") is None or st.session_state.text_column.df is not df:
+        future = schedule_tab_text_content(file_path=file_path, df=df)
+        if not future.done():
+            with st.spinner("Looking for textual columns..."):
+                future.result()
+        st.session_state["text_column"] = copy.copy(future.result())
+        st.session_state.text_column.df = df
 
     # If no textual columns found, show message
     if not st.session_state.text_column.cols_list:
@@ -54,7 +89,10 @@ def display_tab_text_content(file_path=None, df=None):
     st.session_state["selected_text_col"] = selected_col
 
     if st.session_state.selected_text_col:
-        st.session_state.text_column.set_data(st.session_state.selected_text_col)
+        # Only compute the information of the selected column if it hasn't been computed at the previous rerun
+        serie = st.session_state.text_column.serie
+        if serie is None or serie.name != st.session_state.selected_text_col:
+            st.session_state.text_column.set_data(st.session_state.selected_text_col)
 
         with st.expander("Textual Column Overview", expanded=True):
 
@@ -67,7 +105,8 @@ def display_tab_text_content(file_path=None, df=None):
 
             st.subheader("Value Distribution")
              # Display histogram using altair_chart
-            st.altair_chart(st.session_state.text_column.barchart, use_container_width = True)
+            if st.session_state.text_column.barchart is not None:
+                st.altair_chart(st.session_state.text_column.barchart, use_container_width = True)
 
             st.subheader("Most Frequent Values")
             # Display frequent values
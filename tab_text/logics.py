@@ -1,10 +1,13 @@
 import warnings
 warnings.filterwarnings("ignore", category=UserWarning)
 
-import dateparser
-
 import pandas as pd
-import altair as alt
+
+from tab_df.formats import is_columnar_file, read_columnar, read_schema
+from common.schema import get_schema
+from common.frequency import FrequencyIndex, get_column_result
+from common.sketches import HyperLogLog, HeavyHitters, APPROX_MIN_ROWS, DEFAULT_DISTINCT_ERROR, CHUNK_ROWS
+from common.files import open_file, close_file
 
 class TextColumn:
     """
@@ -16,7 +19,7 @@ class TextColumn:
     --------------------
     Attributes
     --------------------
-    -> file_path (str): Path to the uploaded CSV file (optional)
+    -> file_path (str): Path to the uploaded CSV, Parquet, Feather or Arrow IPC file, local paths being opened with common.files.open_file() (optional)
     -> df (pd.Dataframe): Pandas dataframe (optional)
     -> cols_list (list): List of columns names of dataset that are text type (default set to empty list)
     -> serie (pd.Series): Pandas serie where the content of a column has been loaded (default set to None)
@@ -29,13 +32,20 @@ class TextColumn:
     -> n_upper (int): Number of times a serie has only uppercase characters (default set to None)
     -> n_alpha (int): Number of times a serie has only alphabetical characters (default set to None)
     -> n_digit (int): Number of times a serie has only digit characters (default set to None)
-    -> barchart (alt.Chart): Altair barchart displaying the count for each value of a serie (default set to empty)
+    -> barchart (alt.Chart): Altair barchart displaying the count for each value of a serie (default set to None)
     -> frequent (pd.DataFrame): Datframe containing the most frequest value of a serie (default set to empty)
+    -> frequency (common.frequency.FrequencyIndex): Unique values of a serie with their number of occurrences (default set to None)
+    -> approx_min_rows (int): Number of rows above which statistics are estimated with sketches (default set to common.sketches.APPROX_MIN_ROWS)
+    -> approx_error (float): Relative standard error of the approximate number of unique values (default set to 1%)
+    -> approx_unique (bool): Flag stating if self.n_unique is an approximation (default set to False)
 
     """
-    def __init__(self, file_path=None, df=None):
-        self.file_path = file_path
+    def __init__(self, file_path=None, df=None, approx_min_rows=APPROX_MIN_ROWS, approx_error=DEFAULT_DISTINCT_ERROR):
+        self.file_path = open_file(file_path)
         self.df = df
+        self.approx_min_rows = approx_min_rows
+        self.approx_error = approx_error
+        self.approx_unique = False
         self.cols_list = []
         self.serie = None
         self.n_unique = None
@@ -47,21 +57,24 @@ class TextColumn:
         self.n_upper = None
         self.n_alpha = None
         self.n_digit = None
-        self.barchart = alt.Chart()
+        self.barchart = None
         self.frequent = pd.DataFrame(columns=['value', 'occurrence', 'percentage'])
+        self.frequency = None
     
-    def find_text_cols(self):
+    def find_text_cols(self, max_sample=1000):
         """
         --------------------
         Description
         --------------------
         -> find_text_cols (method): Class method that will load the uploaded CSV file as Pandas DataFrame and store it as attribute (self.df) if it hasn't been provided before.
         Then it will find all columns of text data type and store the results in the relevant attribute (self.cols_list).
+        Columns where at least 80% of values look like dates are excluded. This fraction is estimated only once per dataframe for all tabs by common.schema.ColumnSchema,
+        on a random sample of at most max_sample values per column (see tab_date.parsing.estimate_date_ratio()).
 
         --------------------
         Parameters
         --------------------
-        -> None
+        -> max_sample (int): Maximum number of values parsed as datetime per column (only used if the schema of the dataframe hasn't been built yet)
 
         --------------------
         Returns
@@ -69,41 +82,22 @@ class TextColumn:
         -> None
 
         """
-        # Load dataframe if not provided
-        if self.df is None and self.file_path is not None:
+        # Load dataframe if not provided (only the text columns of columnar files)
+        if self.df is None and self.file_path is not None and is_columnar_file(self.file_path):
+            cols = [col for col, kind in read_schema(self.file_path).items() if kind in ("text",)]
+            self.df = read_columnar(self.file_path, columns=cols)
+        elif self.df is None and self.file_path is not None:
             self.df = pd.read_csv(self.file_path)
         
-        # Find textual columns
+        # Find textual columns from the schema shared by all tabs, columns where most values look like dates are excluded
         if self.df is not None:
-            text_cols = self.df.select_dtypes(include=['object', 'string']).columns.tolist()
-            non_date_text_cols = []
-
-            # Filtering the textual columns to remove possible columns that could be datetime-type
-            for col in text_cols:
-                try:
-                    # Safe parse function
-                    def safe_parse(x):
-                        if pd.isna(x) or str(x).strip() == "":
-                            return pd.NaT  # Keep nulls as NaT
-                        return dateparser.parse(str(x))
-                    # Try to parse as datetime — if it succeeds for most values, skip it
-                    parsed = self.df[col].apply(safe_parse)
-                    date_ratio = parsed.notna().mean()  # fraction of valid datetimes
-                    
-                    # Keep the column only if less than 80% of values look like dates
-                    if date_ratio < 0.8:
-                        non_date_text_cols.append(col)
-                except (ValueError, TypeError):
-                    # If conversion fails completely, definitely a text column
-                    non_date_text_cols.append(col)
-
-            self.cols_list = non_date_text_cols
+            self.cols_list = get_schema(self.df, max_sample=max_sample).get_text_cols(self.df)
             print("Text Columns Found (excluding date-like): ", self.cols_list)
 
         
         
 
-    def set_data(self, col_name):
+    def set_data(self, col_name, charts=True):
         """
         --------------------
         Description
@@ -112,11 +106,13 @@ class TextColumn:
         Description
         --------------------
         -> set_data (method): Class method that sets the self.serie attribute with the relevant column from the dataframe and then computes all requested information from self.serie to be displayed in the Text section of Streamlit app 
+        Character predicates (empty, whitespace, lowercase, ...) are evaluated once per distinct value and weighted by its number of occurrences (see common.frequency.FrequencyIndex.count_matching()).
 
         --------------------
         Parameters
         --------------------
         -> col_name (str): Name of the text column to be analysed
+        -> charts (bool): Flag stating if the Altair barchart is built, set to False when only the statistics are needed (e.g. app.report.build_report())
 
         --------------------
         Returns
@@ -129,6 +125,10 @@ class TextColumn:
 
             # Convert serie to numeric
             self.convert_serie_to_text()
+
+            # Count each distinct value once, shared by unique, mode, barchart and frequent (not kept for very large series)
+            if not self.is_approximate():
+                self.set_frequency()
             
             # Compute all requested information
             self.set_unique()
@@ -140,7 +140,8 @@ class TextColumn:
             self.set_uppercase()
             self.set_alphabet()
             self.set_digit()
-            self.set_barchart()
+            if charts:
+                self.set_barchart()
             self.set_frequent()
         
 
@@ -150,6 +151,7 @@ class TextColumn:
         Description
         --------------------
         -> convert_serie_to_text (method): Class method that convert a Pandas Series to text data type and store the results in the relevant attribute (self.serie).
+        The converted serie is cached with the dataframe so that it is shared by all sessions exploring the same column.
 
         --------------------
         Parameters
@@ -164,9 +166,32 @@ class TextColumn:
         """
         if self.serie is not None:
             # Convert serie to string/text
-            self.serie = self.serie.astype("string")
+            serie = self.serie
+            self.serie = get_column_result(self.df, serie.name, "text_serie", lambda: serie.astype("string"))
         
 
+    def close_file(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> close_file (method): Class method that closes the file opened from a local path (see common.files.close_file()) once the data has been loaded, so that profiling many files doesn't leak file descriptors.
+        Columns of columnar files can't be read from the file anymore afterwards.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        close_file(self.file_path)
+
+
     def is_serie_none(self):
         """
         --------------------
@@ -189,12 +214,155 @@ class TextColumn:
         return self.serie is None or self.serie.empty
 
 
+    def is_approximate(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> is_approximate (method): Class method that checks if the serie is large enough (at least self.approx_min_rows rows) for statistics to be estimated with sketches
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (bool): Flag stating if approximate statistics are used or not
+
+        """
+        return not self.is_serie_none() and len(self.serie) >= self.approx_min_rows
+
+
+    def build_distinct_sketch(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> build_distinct_sketch (method): Class method that builds the HyperLogLog sketch of the non-missing values of the serie, with the relative error self.approx_error
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (common.sketches.HyperLogLog): Sketch of the serie
+
+        """
+        sketch = HyperLogLog(error=self.approx_error)
+        sketch.update(self.serie)
+        return sketch
+
+
+    def get_heavy_hitters(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_heavy_hitters (method): Class method that returns the bounded-memory sketch of the most frequent values of the serie, building it chunk by chunk the first time it is requested
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (common.sketches.HeavyHitters): Sketch of the most frequent values of the serie
+
+        """
+        def build_sketch():
+            sketch = HeavyHitters()
+            for start in range(0, len(self.serie), CHUNK_ROWS):
+                sketch.update(self.serie.iloc[start:start + CHUNK_ROWS])
+            return sketch
+
+        return get_column_result(self.df, self.serie.name, "text_heavy_hitters", build_sketch)
+
+
+    def set_frequency(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> set_frequency (method): Class method that computes the unique values of a serie with their number of occurrences and store the results in the relevant attribute(self.frequency).
+        The index is cached while the dataframe stays the same, so it is only computed once per column.
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> None
+
+        """
+        if not self.is_serie_none():
+            # Compute the frequency index only once per column
+            self.frequency = get_column_result(self.df, self.serie.name, "text_frequency", lambda: FrequencyIndex.from_serie(self.serie))
+
+
+    def get_frequency(self):
+        """
+        --------------------
+        Description
+        --------------------
+        -> get_frequency (method): Class method that returns the frequency index of the serie, computing it first if needed
+
+        --------------------
+        Parameters
+        --------------------
+        -> None
+
+        --------------------
+        Returns
+        --------------------
+        -> (common.frequency.FrequencyIndex): Frequency index of the serie
+
+        """
+        if self.frequency is None:
+            self.set_frequency()
+        return self.frequency
+
+
+    def count_matching(self, predicate):
+        """
+        --------------------
+        Description
+        --------------------
+        -> count_matching (method): Class method that counts the non-missing values of the serie matching a predicate.
+        The predicate is evaluated once per distinct value with the frequency index, except for series of at least self.approx_min_rows rows where it is evaluated on every value to keep memory bounded.
+
+        --------------------
+        Parameters
+        --------------------
+        -> predicate (callable): Function taking a pd.Series of values and returning a boolean serie of the same length
+
+        --------------------
+        Returns
+        --------------------
+        -> (int): Number of non-missing values matching the predicate
+
+        """
+        if self.is_approximate():
+            return int(predicate(self.serie.dropna()).sum())
+        return self.get_frequency().count_matching(predicate)
+
+
     def set_unique(self):
         """
         --------------------
         Description
         --------------------
         -> set_unique (method): Class method that computes the number of unique value of a serie and store the results in the relevant attribute(self.n_unique).
+        For series of at least self.approx_min_rows rows, the number is estimated with a HyperLogLog sketch instead of a hash table of all values.
 
         --------------------
         Parameters
@@ -208,8 +376,15 @@ class TextColumn:
 
         """
         if not self.is_serie_none():
-            # Compute number of unique values
-            self.n_unique = self.serie.dropna().nunique()
+            if self.is_approximate():
+                # Estimate number of unique values with a HyperLogLog sketch
+                sketch = get_column_result(self.df, self.serie.name, f"text_distinct_sketch_{self.approx_error}", lambda: self.build_distinct_sketch())
+                self.n_unique = sketch.count()
+                self.approx_unique = True
+            else:
+                # Compute number of unique values
+                self.n_unique = self.get_frequency().n_unique
+                self.approx_unique = False
         
 
     def set_missing(self):
@@ -255,7 +430,7 @@ class TextColumn:
         """
         if not self.is_serie_none():
             # Compute number of empty values
-            self.n_empty = (self.serie.dropna() == '').sum()
+            self.n_empty = self.count_matching(lambda values: values == '')
         
 
     def set_mode(self):
@@ -277,8 +452,13 @@ class TextColumn:
 
         """
         if not self.is_serie_none():
-            # Compute the mode value of the series
-            self.n_mode = self.serie.dropna().mode().iloc[0] if not self.serie.dropna().mode().empty else None
+            if self.is_approximate():
+                # Most frequent value of the sketch
+                top = self.get_heavy_hitters().get_top(1)
+                self.n_mode = top['value'].iloc[0] if not top.empty else None
+            else:
+                # Compute the mode value of the series
+                self.n_mode = self.get_frequency().get_mode()
 
         
 
@@ -302,7 +482,7 @@ class TextColumn:
         """
         if not self.is_serie_none():
             # Comopute number of spaces
-            self.n_space = (self.serie.dropna().str.strip() == '').sum()
+            self.n_space = self.count_matching(lambda values: values.str.strip() == '')
 
         
 
@@ -325,7 +505,8 @@ class TextColumn:
 
         """
         if not self.is_serie_none():
-            self.n_lower = self.serie.dropna().str.islower().sum()
+            # Compute number of lowercase values
+            self.n_lower = self.count_matching(lambda values: values.str.islower())
         
 
     def set_uppercase(self):
@@ -347,7 +528,8 @@ class TextColumn:
 
         """
         if not self.is_serie_none():
-            self.n_upper = self.serie.dropna().str.isupper().sum()
+            # Compute number of uppercase values
+            self.n_upper = self.count_matching(lambda values: values.str.isupper())
         
     
     def set_alphabet(self):
@@ -369,7 +551,8 @@ class TextColumn:
 
         """
         if not self.is_serie_none():
-            self.n_alpha = self.serie.dropna().str.isalpha().sum()
+            # Compute number of alphabetic values
+            self.n_alpha = self.count_matching(lambda values: values.str.isalpha())
         
 
     def set_digit(self):
@@ -391,7 +574,8 @@ class TextColumn:
 
         """
         if not self.is_serie_none():
-            self.n_digit = self.serie.dropna().str.isdigit().sum()
+            # Compute number of digit values
+            self.n_digit = self.count_matching(lambda values: values.str.isdigit())
         
 
     def set_barchart(self):  
@@ -412,10 +596,15 @@ class TextColumn:
         -> None
 
         """
-        # Compute top 30 frequent values
-        value_counts = self.serie.value_counts().reset_index()
-        value_counts.columns = ['value', 'count']
-        value_counts = value_counts.head(30)  # change to 40 if desired
+        # Imported here as altair is only needed to build the chart, which keeps it out of the startup of the command-line tools
+        import altair as alt
+
+        if self.is_serie_none():
+            return
+
+        # Compute top 30 frequent values (estimated with bounded memory for very large series)
+        value_counts = self.get_heavy_hitters().get_top(30) if self.is_approximate() else self.get_frequency().get_top(30)  # change to 40 if desired
+        value_counts = value_counts[['value', 'occurrence']].rename(columns={'occurrence': 'count'})
 
         # Create Altair bar chart
         self.barchart = (
@@ -441,6 +630,7 @@ class TextColumn:
         Description
         --------------------
         -> set_frequent (method): Class method that computes the Dataframe containing the most frequest value of a serie and store the results in the relevant attribute(self.frequent).
+        For series of at least self.approx_min_rows rows, they are estimated with a Misra-Gries sketch (common.sketches.HeavyHitters) and error bounds are added on the occurrences and percentages.
 
         --------------------
         Parameters
@@ -455,16 +645,13 @@ class TextColumn:
 
         """
         if not self.is_serie_none():
-            # Compute frequent values
-            freq_series = self.serie.value_counts(dropna=True).head(end)
-            # Compute total count for percentage calculation
-            total_count = len(self.serie.dropna())
-            # Create DataFrame for frequent values
-            self.frequent = pd.DataFrame({
-                'value': freq_series.index.astype(str),
-                'occurrence': freq_series.values,
-                'percentage': ((freq_series.values / total_count) * 100).round(2)
-            })
+            if self.is_approximate():
+                # Estimate frequent values with bounded memory
+                self.frequent = self.get_heavy_hitters().get_top(end)
+            else:
+                # Compute frequent values
+                self.frequent = self.get_frequency().get_top(end)
+            self.frequent['value'] = self.frequent['value'].astype(str)
         
 
     def get_summary(self):
@@ -499,7 +686,7 @@ class TextColumn:
                     'Mode Value'
                 ],
                 'Value': [
-                    self.n_unique,
+                    f"{self.n_unique} (approx.)" if self.approx_unique else self.n_unique,
                     self.n_missing,
                     self.n_empty,
                     self.n_space,